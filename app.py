@@ -1,7 +1,12 @@
-import os
-from typing import Any, Dict
-from fastapi import FastAPI, HTTPException, Header, Depends, Request
+import asyncio
+import math
+from typing import Any, Dict, Iterator, List, Optional
+from fastapi import FastAPI, HTTPException, Header, Depends, Request, Query
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from anyio import to_thread
+from starlette.concurrency import run_in_threadpool
 from pydantic import RootModel
 from contextlib import asynccontextmanager
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -9,41 +14,117 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from config import Config, ConfigError
+from services.api_keys import APIKey, KeyRegistry
+from services.backends import Backend, profile_from_config
+from services.bulk import iter_bulk_results
+from services.idempotency import IdempotencyStore
 from services.openai_service import OpenAIService, OpenAIServiceError
-from utils.logging_config import setup_logging, get_logger
+from services.readiness import UpstreamMonitor, WarmUp, readiness_problems
+from services.revision import revise_zoning
+from services.scheduler import Scheduler, lane_for, scheduling
+from services.results_store import (
+    ResultsStore, ResultsStoreError, build_record, iter_page_json, result_etag
+)
+from utils import codec
+from utils.codec import FastJSONResponse
+from utils.compression import CompressionMiddleware
+from utils.hashing import assessment_hash
+from utils.http_cache import etag_matches
+from utils.json_patch import JSONPatchError
+from utils.logging_config import setup_logging, get_logger, bind_log_context
+from utils.middleware import (
+    BodySizeLimitMiddleware, ProfilingMiddleware, RequestContextMiddleware, TracingMiddleware
+)
+from utils.ndjson import NDJSONStreamingResponse, aiter_lines, dumps_line
+from utils.profiler import ProfilerBusyError, RecentProfiles, SamplingProfiler
+from utils.singleflight import SingleFlight
+from utils.tracing import Tracer, span, traced, untraced
 
 # Initialize configuration and logging
 try:
     config = Config()
-    setup_logging(config.log_level)
+    setup_logging(config.log_level, config.log_format)
     logger = get_logger(__name__)
 except ConfigError as e:
     print(f"Configuration error: {e}")
     raise
 
+# Model server: the OpenAI API or a self-hosted OpenAI-compatible one
+backend = Backend(profile_from_config(config))
+
+# Upstream model calls share one concurrency budget, split into priority
+# lanes (never more than the backend itself accepts)
+scheduler = Scheduler(
+    max_concurrency=min(config.scheduler_concurrency,
+                        backend.profile.max_concurrency or config.scheduler_concurrency),
+    queue_timeout=config.scheduler_queue_timeout,
+    latency_tolerance=config.scheduler_latency_tolerance,
+    # Batch calls here always have an HTTP caller waiting on them
+    batch_queue_timeout=config.scheduler_batch_queue_timeout
+)
+
 # Initialize OpenAI service
-openai_service = OpenAIService(config)
+openai_service = OpenAIService(config, scheduler=scheduler, backend=backend)
+
+# Initialize results store (writes happen on a background thread)
+results_store = ResultsStore(
+    config.results_db_path,
+    batch_size=config.results_batch_size,
+    flush_interval=config.results_flush_interval
+)
+
+# Idempotency-Key claims and stored responses, shared by workers through the database
+idempotency_keys = IdempotencyStore(
+    config.results_db_path,
+    ttl=config.idempotency_ttl,
+    lease=config.idempotency_lease
+)
+
+# Concurrent identical submissions share one model call
+zone_flights = SingleFlight()
+
+# Request tracing (slow requests kept for /debug/trace)
+tracer = Tracer(
+    slow_threshold_ms=config.trace_slow_ms,
+    capacity=config.trace_buffer_size,
+    export_path=config.trace_export_path,
+    max_spans=config.trace_max_spans
+)
+
+# Upstream reachability, checked in the background for /readyz
+upstream_monitor = UpstreamMonitor(
+    openai_service.check_upstream,
+    interval=config.upstream_check_interval,
+    failure_threshold=config.upstream_failure_threshold
+)
+
+# Startup warm-up (SDK import, client, pooled connection); /readyz waits for it
+warm_up = WarmUp(lambda: openai_service.warm_up(completion=config.warmup == "completion"))
+
+# Per-request profiles captured via the X-Profile header
+request_profiles = RecentProfiles(config.profile_buffer_size)
+
+# Client API keys (hot-reloaded from API_KEYS_FILE, plus the legacy API_KEY)
+api_keys = KeyRegistry(config.api_keys_file)
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
 
 # API Key verification dependency
-def verify_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
+@traced("verify_api_key")
+def verify_api_key(x_api_key: str = Header(None, alias="X-API-Key")) -> APIKey:
     """Verify API key from request header
 
     Args:
         x_api_key: API key from X-API-Key header
 
     Returns:
-        The API key if valid
+        The registered APIKey (name, priority and limits)
 
     Raises:
-        HTTPException: 401 if API key is invalid or missing
+        HTTPException: 401 if API key is invalid or missing, 429 if the key's
+            own rate limit is exceeded
     """
-    expected_key = os.getenv("API_KEY")
-
-    if not expected_key:
-        logger.error("API_KEY environment variable not configured")
+    if not api_keys.configured:
+        logger.error("No API keys configured (set API_KEY or API_KEYS_FILE)")
         raise HTTPException(
             status_code=500,
             detail="Server configuration error"
@@ -56,14 +137,60 @@ def verify_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
             detail="Missing API key. Include X-API-Key header."
         )
 
-    if x_api_key != expected_key:
-        logger.warning(f"Invalid API key attempt: {x_api_key[:10]}...")
+    key = api_keys.authenticate(x_api_key)
+    if key is None:
+        logger.warning("Invalid API key attempt: %s...", x_api_key[:10])
         raise HTTPException(
             status_code=401,
             detail="Invalid API key"
         )
 
-    return x_api_key
+    retry_after = api_keys.allow_request(key)
+    if retry_after is not None:
+        logger.warning("Rate limit exceeded for API key %s", key.name)
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded for API key '{key.name}'",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+    bind_log_context(client=key.name)
+    return key
+
+
+def reserve_key_slot(api_key: APIKey = Depends(verify_api_key)) -> Iterator[APIKey]:
+    """Hold one of the key's concurrent slots for the request (model-calling endpoints)
+
+    Raises:
+        HTTPException: 429 if the key is at its concurrency cap or has spent
+            its daily token budget
+    """
+    if api_keys.budget_remaining(api_key) == 0:
+        raise HTTPException(status_code=429, detail=f"Daily token budget exhausted for API key '{api_key.name}'")
+    if not api_keys.acquire(api_key):
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many concurrent requests for API key '{api_key.name}' (limit {api_key.max_concurrent})"
+        )
+    try:
+        yield api_key
+    finally:
+        api_keys.release(api_key)
+
+
+def _is_valid_api_key(key: str) -> bool:
+    """Whether a presented key is registered (constant-time digest comparison)"""
+    return api_keys.authenticate(key) is not None
+
+
+def _rate_limit_key(request: Request) -> str:
+    """Per-route quotas are tracked per API key, falling back to the client IP"""
+    key = api_keys.authenticate(request.headers.get("x-api-key"))
+    return f"key:{key.name}" if key is not None else get_remote_address(request)
+
+
+# Initialize rate limiter
+limiter = Limiter(key_func=_rate_limit_key)
 
 
 @asynccontextmanager
@@ -71,28 +198,42 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     logger.info("Starting Brand Zoning API")
-    logger.info(f"OpenAI Model: {config.openai_model}")
-    logger.info(f"Rules file loaded: {config.rules_file_exists}")
+    logger.info("OpenAI Model: %s", config.openai_model)
+    logger.info("Rules file loaded: %s", config.rules_file_exists)
 
     if not config.rules_file_exists:
-        logger.warning(f"Rules file not found at {config.system_rules_path}")
+        logger.warning("Rules file not found at %s", config.system_rules_path)
+
+    # The OpenAI SDK is imported and the client built here rather than at
+    # import time, so the worker starts listening sooner
+    if config.warmup != "off":
+        warm_up.start()
+
+    if config.upstream_check_interval > 0:
+        upstream_monitor.start()
 
     yield
 
     # Shutdown
     logger.info("Shutting down Brand Zoning API")
+    upstream_monitor.stop()
+    results_store.close()
 
 
 app = FastAPI(
     title="Brand Zoning API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Add rate limiter state
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Request body limit (bulk uploads are limited per line instead)
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=config.max_request_bytes, exempt_paths={"/zone/bulk"})
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -102,12 +243,76 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip (or zstd/brotli when installed) for bodies above the threshold and for streams
+app.add_middleware(CompressionMiddleware, minimum_size=config.compression_min_size)
+
+# Whole-request profiling on demand (X-Profile: 1 with a valid API key)
+app.add_middleware(
+    ProfilingMiddleware,
+    store=request_profiles,
+    authorize=_is_valid_api_key,
+    interval=config.profile_interval
+)
+
+# Root tracing span per request (inside the request context, to know the request id)
+app.add_middleware(TracingMiddleware, tracer=tracer)
+
+# Request ids and per-request log context (outermost, so every log line is tagged)
+app.add_middleware(RequestContextMiddleware, sample_rate=config.log_sample_rate)
+
 
 class Assessment(RootModel[Dict[str, Any]]):
     """Brand architecture assessment data"""
     pass
 
 
+async def parse_assessment(request: Request) -> Assessment:
+    """Read and validate the assessment body inside a tracing span
+
+    Equivalent to declaring an Assessment body parameter, but makes JSON
+    decoding visible in traces and uses the fast codec. A decoded JSON object
+    always has string keys, so the generic Dict[str, Any] validation pass is
+    replaced by a type check.
+
+    Raises:
+        RequestValidationError: 422 if the body is missing, not JSON or not an object
+    """
+    with span("parse_body") as current:
+        body = await request.body()
+        current.set_attribute("body.bytes", len(body))
+        if not body:
+            raise RequestValidationError(
+                [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+            )
+        try:
+            data = codec.loads(body)
+        except codec.DECODE_ERRORS as e:
+            raise RequestValidationError(
+                [{"type": "json_invalid", "loc": ("body", 0), "msg": "JSON decode error",
+                  "input": {}, "ctx": {"error": str(e)}}]
+            )
+        if not isinstance(data, dict):
+            raise RequestValidationError(
+                [{"type": "dict_type", "loc": ("body",), "msg": "Input should be a valid dictionary",
+                  "input": data}]
+            )
+        return Assessment.model_construct(data)
+
+
+# Documents the JSON object body read by parse_assessment
+ASSESSMENT_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": Assessment.model_json_schema()}},
+    }
+}
+
+
+class JSONPatch(RootModel[List[Dict[str, Any]]]):
+    """RFC 6902 JSON Patch operations"""
+    pass
+
+
 @app.get("/")
 def root():
     """API information endpoint"""
@@ -117,7 +322,15 @@ def root():
         "description": "AI-powered brand architecture zone recommendations",
         "endpoints": {
             "POST /zone": "Generate zone recommendation from assessment",
-            "GET /health": "Health check endpoint"
+            "POST /zone/bulk": "Zone an NDJSON stream of assessments",
+            "POST /zone/{result_id}/revise": "Re-zone a stored assessment after a JSON Patch",
+            "GET /zonings": "List stored zone recommendations",
+            "GET /zonings/export": "Export stored zone recommendations as NDJSON",
+            "GET /zonings/{result_id}": "Fetch a stored zone recommendation",
+            "GET /health": "Health check endpoint",
+            "GET /livez": "Liveness probe",
+            "GET /readyz": "Readiness probe (503 when the worker should not receive traffic)",
+            "GET /metrics": "Operational counters (coalesced requests, store queue)"
         }
     }
 
@@ -128,14 +341,150 @@ def health():
     return {
         "status": "healthy",
         "openai": "configured" if config.openai_api_key else "missing",
+        "backend": backend.profile.name,
+        "backend_status": "configured" if backend.profile.base_url or backend.profile.api_key else "missing",
         "rules_loaded": config.rules_file_exists,
         "model": config.openai_model
     }
 
 
+# Constant liveness body
+LIVE = {"status": "alive"}
+
+
+@app.get("/livez")
+async def livez():
+    """Liveness probe: answers as long as the event loop is running"""
+    return LIVE
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness probe for load balancers
+
+    Built from in-memory counters and the cached upstream check, so it never
+    waits on I/O. Returns 503 with the reasons when the worker is saturated,
+    the startup warm-up is still running, the rules file is missing or the
+    upstream API keeps failing checks.
+    """
+    threadpool = to_thread.current_default_thread_limiter().statistics()
+    snapshot = {
+        "in_flight": openai_service.in_flight,
+        "threadpool": {
+            "busy": threadpool.borrowed_tokens,
+            "size": threadpool.total_tokens,
+            "waiting": threadpool.tasks_waiting,
+        },
+        "results_queue": {"pending": results_store.pending(), "capacity": results_store.queue_size},
+        "scheduler": scheduler.stats(),
+        "coalesced_waiting": zone_flights.stats()["waiting"],
+        "upstream": upstream_monitor.status(),
+        "warmup": warm_up.status(),
+        "rules": {"loaded": config.rules_file_exists, "hash": openai_service.rules_hash},
+        "prompt_hash": openai_service.prompt_hash,
+    }
+    problems = readiness_problems(
+        snapshot,
+        max_in_flight=config.ready_max_in_flight or scheduler.max_concurrency,
+        max_queued=config.ready_max_queued or 2 * scheduler.max_concurrency,
+    )
+    return FastJSONResponse(
+        {"status": "not_ready" if problems else "ready", "problems": problems, **snapshot},
+        status_code=503 if problems else 200
+    )
+
+
+@app.get("/metrics")
+@limiter.limit("300/hour")
+def metrics(request: Request, api_key: APIKey = Depends(verify_api_key)):
+    """Operational counters as JSON
+
+    Requires API key authentication.
+    """
+    return {
+        "single_flight": zone_flights.stats(),
+        "api_keys": api_keys.stats(),
+        "scheduler": scheduler.stats(),
+        "backend": backend.stats(),
+        "results_store": {
+            "pending": results_store.pending(),
+            "dropped": results_store.dropped,
+        },
+    }
+
+
+@app.get("/debug/trace")
+@limiter.limit("60/hour")
+def debug_traces(request: Request, api_key: APIKey = Depends(verify_api_key)):
+    """List recent slow requests (at least TRACE_SLOW_MS), newest first
+
+    Requires API key authentication.
+    """
+    return {"slow_threshold_ms": tracer.slow_threshold_ms, "traces": tracer.recent()}
+
+
+@app.get("/debug/trace/{request_id}")
+@limiter.limit("60/hour")
+def debug_trace(request: Request, request_id: str, api_key: APIKey = Depends(verify_api_key)):
+    """Span breakdown of a recent slow request
+
+    Requires API key authentication.
+
+    Raises:
+        HTTPException: 404 if no trace is kept for request_id
+    """
+    trace = tracer.get(request_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found (not recent or not slow)")
+    return trace
+
+
+@app.get("/debug/profile", response_class=PlainTextResponse)
+@limiter.limit("10/hour")
+async def debug_profile(
+    request: Request,
+    seconds: float = Query(10, gt=0, le=config.profile_max_seconds),
+    api_key: APIKey = Depends(verify_api_key)
+):
+    """Sample every thread of this worker for N seconds
+
+    Requires API key authentication. Returns collapsed stacks
+    ("frame;frame;frame count" per line) for flamegraph.pl or speedscope.
+
+    Raises:
+        HTTPException: 409 if a profile is already running on this worker
+    """
+    profiler = SamplingProfiler(config.profile_interval)
+    try:
+        profiler.start()
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        collapsed = profiler.stop()
+    return PlainTextResponse(collapsed, headers={"X-Profile-Samples": str(profiler.samples)})
+
+
+@app.get("/debug/profile/{request_id}", response_class=PlainTextResponse)
+@limiter.limit("60/hour")
+def debug_request_profile(request: Request, request_id: str, api_key: APIKey = Depends(verify_api_key)):
+    """Collapsed stacks captured for a request sent with X-Profile: 1
+
+    Requires API key authentication.
+
+    Raises:
+        HTTPException: 404 if no profile is kept for request_id
+    """
+    collapsed = request_profiles.get(request_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(collapsed)
+
+
 @app.get("/debug/prompts")
 @limiter.limit("10/hour")
-def debug_prompts(request: Request, api_key: str = Depends(verify_api_key)):
+def debug_prompts(request: Request, api_key: APIKey = Depends(verify_api_key)):
     """Debug endpoint to see the prompts being sent to OpenAI
 
     WARNING: This exposes your prompt engineering.
@@ -156,48 +505,384 @@ def debug_prompts(request: Request, api_key: str = Depends(verify_api_key)):
     }
 
 
-@app.post("/zone")
+def _store_result(assessment: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Queue a result for persistence and tag it with its result_id
+
+    The insert happens off the critical path; the writer thread batches it.
+    result_id is None when the store dropped the record (write queue full).
+    """
+    result["result_id"] = results_store.record(build_record(assessment, result))
+    return result
+
+
+def _result_response(result: Dict[str, Any]) -> Response:
+    """JSON response for a zoning, flagged with X-Result-Stored: false if it was not stored"""
+    headers = {"X-Result-Stored": "false"} if result.get("result_id") is None else None
+    return FastJSONResponse(result, headers=headers)
+
+
+def _charge_tokens(api_key: Optional[APIKey], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Charge a fresh model result's token usage to the key's daily budget"""
+    if api_key is not None:
+        usage = result.get("metadata", {}).get("usage", {})
+        api_keys.record_tokens(api_key, usage.get("total_tokens", 0))
+    return result
+
+
+def _lane_for(api_key: Optional[APIKey], lane: str) -> str:
+    """Scheduler lane for an endpoint's model calls, demoted to the key's class"""
+    return lane if api_key is None else lane_for(lane, api_key.priority)
+
+
+def _scheduling_for(api_key: Optional[APIKey], lane: str):
+    """Schedule the block's model calls in the caller's lane, as its key's tenant"""
+    if api_key is None:
+        return scheduling(lane)
+    return scheduling(_lane_for(api_key, lane), api_key.name, api_key.weight)
+
+
+def _zone_and_store(assessment: Dict[str, Any], api_key: Optional[APIKey] = None,
+                    lane: str = "interactive", votes: int = 1) -> Dict[str, Any]:
+    """Zone and persist an assessment, coalescing concurrent identical submissions
+
+    Callers with the same canonical assessment (under the same prompt and
+    number of votes) and scheduler lane that arrive while a call is in flight
+    wait for it and share its result and result_id, or its error. Tokens are
+    charged to the caller whose request made the model call. The lane is part
+    of the key, so an interactive request never waits behind a queued batch
+    call for the same assessment.
+    """
+    key = (assessment_hash(assessment), openai_service.prompt_hash, votes, _lane_for(api_key, lane))
+    with _scheduling_for(api_key, lane):
+        return zone_flights.do(
+            key, lambda: _store_result(
+                assessment, _charge_tokens(api_key, openai_service.generate_zone_report(assessment, votes))
+            )
+        )
+
+
+def _replay_or_claim(api_key: APIKey, idempotency_key: str, assessment: Dict[str, Any],
+                     votes: int) -> Optional[Response]:
+    """Claim an Idempotency-Key for a /zone request, or answer from an earlier one
+
+    Returns:
+        The stored response of the request that first used the key, or None
+        when this request now owns the key
+
+    Raises:
+        HTTPException: 409 while the first request is still running, 422 if
+            the key was used with a different request
+    """
+    claim = idempotency_keys.claim(api_key.name, idempotency_key, f"{assessment_hash(assessment)}:{votes}")
+    if claim.state == "replay":
+        logger.info("Replaying stored response for Idempotency-Key %s", idempotency_key)
+        return Response(claim.body, status_code=claim.status_code, media_type="application/json",
+                        headers={"Idempotent-Replayed": "true"})
+    if claim.state == "conflict":
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request"
+        )
+    if claim.state == "in_flight":
+        raise HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is still in progress",
+            headers={"Retry-After": "5"}
+        )
+    return None
+
+
+@app.post("/zone", openapi_extra=ASSESSMENT_BODY)
 @limiter.limit("50/hour")
-def zone(request: Request, assessment: Assessment, api_key: str = Depends(verify_api_key)):
+def zone(request: Request, api_key: APIKey = Depends(reserve_key_slot),
+         assessment: Assessment = Depends(parse_assessment),
+         votes: int = Query(1, ge=1, le=config.max_votes),
+         idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255)):
     """Generate zone recommendation report from assessment
 
     Requires API key authentication via X-API-Key header.
-    Rate limited to 50 requests per hour per IP address.
+    Rate limited to 50 requests per hour per API key, plus the key's own
+    rate, concurrency and daily token limits.
 
     Args:
         request: FastAPI request object (for rate limiting)
         assessment: Brand architecture assessment JSON
         api_key: Verified API key from header
+        votes: Samples drawn in one model call; the majority zone/subzone
+            wins and confidence reflects their agreement
+        idempotency_key: Client-chosen key; retries with the same key and
+            body get the first successful response back without a model call
 
     Returns:
-        Dict with report_markdown and summary
+        Dict with result_id, report_markdown, summary and metadata
 
     Raises:
-        HTTPException: 401 if invalid API key, 429 if rate limited, 503 on OpenAI errors
+        HTTPException: 401 if invalid API key, 409 while a request with the
+            same Idempotency-Key is running, 422 if the key was used with a
+            different body, 429 if rate limited, 503 on OpenAI errors
     """
     # Log request with brand info if available
     brand_name = assessment.root.get("brand", "Unknown")
-    logger.info(f"📥 Received zone recommendation request for brand: {brand_name}")
+    bind_log_context(brand=brand_name)
+    logger.info("📥 Received zone recommendation request for brand: %s", brand_name)
 
+    if idempotency_key is not None:
+        replay = _replay_or_claim(api_key, idempotency_key, assessment.root, votes)
+        if replay is not None:
+            return replay
+
+    response = None
     try:
-        result = openai_service.generate_zone_report(assessment.root)
+        result = _zone_and_store(assessment.root, api_key, votes=votes)
 
         # Log success with zone info
         zone = result.get("summary", {}).get("zone", "unknown")
         confidence = result.get("summary", {}).get("confidence", 0)
-        logger.info(f"✅ Successfully generated zone recommendation: Zone {zone} ({confidence}% confidence)")
+        logger.info("✅ Successfully generated zone recommendation: Zone %s (%s%% confidence)", zone, confidence,
+                    extra={"zone": zone, "confidence": confidence})
 
-        return result
+        response = _result_response(result)
+        if idempotency_key is not None:
+            idempotency_keys.complete(api_key.name, idempotency_key, response.status_code, response.body)
+        return response
 
     except OpenAIServiceError as e:
-        logger.error(f"❌ OpenAI service error for brand {brand_name}: {e}")
+        logger.error("❌ OpenAI service error for brand %s: %s", brand_name, e)
         raise HTTPException(
             status_code=503,
             detail=f"OpenAI service unavailable: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"❌ Unexpected error for brand {brand_name}: {e}", exc_info=True)
+        logger.error("❌ Unexpected error for brand %s: %s", brand_name, e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Internal server error"
         )
+    finally:
+        # A failed request frees its key so the client's retry can run
+        if idempotency_key is not None and response is None:
+            idempotency_keys.release(api_key.name, idempotency_key)
+
+
+@app.post("/zone/{result_id}/revise")
+@limiter.limit("50/hour")
+def revise_zone(request: Request, result_id: str, patch: JSONPatch,
+                api_key: APIKey = Depends(reserve_key_slot)):
+    """Re-zone a stored assessment after applying a JSON Patch to it
+
+    Only the changed questions are re-scored. When the winning zone, gates and
+    margin hold up the previous report is reused without a model call;
+    otherwise the model updates the previous narrative.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        result_id: Stored zoning to revise
+        patch: RFC 6902 operations against the stored assessment
+        api_key: Verified API key from header
+
+    Returns:
+        Dict with result_id, report_markdown, summary, metadata and revision
+
+    Raises:
+        HTTPException: 404 if result_id is unknown, 422 if the patch cannot be
+            applied, 503 on OpenAI errors
+    """
+    stored = results_store.get(result_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Zoning not found")
+
+    try:
+        with _scheduling_for(api_key, "interactive"):
+            assessment, result = revise_zoning(stored, patch.root, openai_service)
+    except JSONPatchError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid patch: {e}")
+    except OpenAIServiceError as e:
+        logger.error("❌ OpenAI service error revising %s: %s", result_id, e)
+        raise HTTPException(
+            status_code=503,
+            detail=f"OpenAI service unavailable: {str(e)}"
+        )
+    except Exception as e:
+        logger.error("❌ Unexpected error revising %s: %s", result_id, e, exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error"
+        )
+
+    if result["revision"]["llm_called"]:
+        _charge_tokens(api_key, result)
+    return _result_response(_store_result(assessment, result))
+
+
+@app.get("/zonings")
+@limiter.limit("300/hour")
+def list_zonings(
+    request: Request,
+    brand: Optional[str] = None,
+    division: Optional[str] = None,
+    zone: Optional[str] = Query(None, pattern=r"^[1345][A-Ca-c]?$"),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    api_key: APIKey = Depends(verify_api_key)
+):
+    """List stored zone recommendations, newest first
+
+    Requires API key authentication via X-API-Key header.
+    The page is streamed as JSON; pass next_cursor back as cursor for the next page.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        brand: Filter by exact brand name
+        division: Filter by exact division name
+        zone: Filter by zone ("3") or zone and subzone ("3A")
+        since: Inclusive lower bound on creation time (ISO date or timestamp)
+        until: Exclusive upper bound on creation time (ISO date or timestamp)
+        cursor: Cursor returned by the previous page
+        limit: Page size (1-500)
+        api_key: Verified API key from header
+
+    Returns:
+        Streaming JSON: {"items": [...], "next_cursor": "..." | null}
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        rows = results_store.iter_zonings(
+            brand=brand, division=division, zone=zone,
+            since=since, until=until, cursor=cursor, limit=limit
+        )
+    except ResultsStoreError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(iter_page_json(rows, limit), media_type="application/json")
+
+
+@app.post("/zone/bulk")
+@limiter.limit("10/hour")
+async def zone_bulk(request: Request, api_key: APIKey = Depends(reserve_key_slot)):
+    """Zone an NDJSON upload of assessments, streaming NDJSON results back
+
+    Requires API key authentication via X-API-Key header.
+    Each request line is one assessment object. Lines are read only as
+    processing slots free up (BULK_CONCURRENCY), so memory stays flat for
+    any upload size. Each output line carries the 0-based input "index" and
+    is emitted as soon as that item completes (completion order, not input
+    order). Failed items produce {"index", "error", "status"} lines.
+
+    Args:
+        request: FastAPI request object (body is read as a stream)
+        api_key: Verified API key from header
+
+    Returns:
+        Streaming application/x-ndjson response
+    """
+    logger.info("📥 Received bulk zone request")
+
+    async def handle(assessment: Dict[str, Any]) -> Dict[str, Any]:
+        # Items stay out of the request's trace, which would otherwise grow with the upload
+        with untraced():
+            return await run_in_threadpool(_zone_and_store, assessment, api_key, "batch")
+
+    async def encode():
+        lines = aiter_lines(request.stream(), config.bulk_max_line_bytes)
+        async for record in iter_bulk_results(lines, handle, config.bulk_concurrency):
+            yield dumps_line(record)
+
+    return NDJSONStreamingResponse(encode())
+
+
+@app.get("/zonings/export")
+@limiter.limit("30/hour")
+def export_zonings(
+    request: Request,
+    brand: Optional[str] = None,
+    division: Optional[str] = None,
+    zone: Optional[str] = Query(None, pattern=r"^[1345][A-Ca-c]?$"),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    api_key: APIKey = Depends(verify_api_key)
+):
+    """Export stored zone recommendations as NDJSON, newest first
+
+    Takes the same filters as GET /zonings. Each line is a full record
+    (assessment, summary, report and metadata); rows are streamed straight
+    from the database cursor.
+    """
+    rows = results_store.iter_zonings(
+        brand=brand, division=division, zone=zone,
+        since=since, until=until, limit=None, full=True
+    )
+    return StreamingResponse((dumps_line(row) for row in rows), media_type="application/x-ndjson")
+
+
+@app.get("/analytics")
+@limiter.limit("300/hour")
+def analytics(
+    request: Request,
+    group_by: str = Query("division,zone", pattern=r"^[a-z]*(,[a-z]+)*$"),
+    division: Optional[str] = None,
+    model: Optional[str] = None,
+    zone: Optional[str] = Query(None, pattern=r"^[1345][A-Ca-c]?$"),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    api_key: APIKey = Depends(verify_api_key)
+):
+    """Zone counts, confidence, latency and token totals per division, model and day
+
+    Requires API key authentication via X-API-Key header.
+    Served from aggregates the results writer updates with every stored
+    zoning, so the cost does not grow with the number of zonings.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        group_by: Comma-separated dimensions: day, division, model, zone ("" for totals only)
+        division: Filter by exact division name
+        model: Filter by exact model name
+        zone: Filter by zone ("3") or zone and subzone ("3A")
+        since: Inclusive first day (ISO date)
+        until: Exclusive last day (ISO date)
+        api_key: Verified API key from header
+
+    Returns:
+        {"group_by": [...], "groups": [...], "totals": {...}}
+
+    Raises:
+        HTTPException: 400 for an unknown group_by dimension
+    """
+    try:
+        return results_store.analytics(
+            group_by=tuple(name for name in group_by.split(",") if name),
+            division=division, model=model, zone=zone, since=since, until=until
+        )
+    except ResultsStoreError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Stored zonings never change, but clients revalidate so access stays authenticated
+ZONING_CACHE_CONTROL = "private, no-cache"
+
+
+@app.get("/zonings/{result_id}")
+@limiter.limit("300/hour")
+def get_zoning(request: Request, result_id: str, api_key: APIKey = Depends(verify_api_key),
+               if_none_match: Optional[str] = Header(None, alias="If-None-Match")):
+    """Fetch a stored zone recommendation with its assessment and full report
+
+    Responses carry a strong ETag; a request whose If-None-Match matches it
+    gets 304 Not Modified without the payload being loaded.
+
+    Raises:
+        HTTPException: 404 if no zoning is stored under result_id
+    """
+    if if_none_match:
+        etag = results_store.get_etag(result_id)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": ZONING_CACHE_CONTROL})
+
+    record = results_store.get(result_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Zoning not found")
+    return FastJSONResponse(record, headers={"ETag": result_etag(record), "Cache-Control": ZONING_CACHE_CONTROL})
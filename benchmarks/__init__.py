@@ -0,0 +1,6 @@
+"""Micro-benchmarks for request-path overhead
+
+Run a benchmark as a module from the project root, e.g.
+
+    python -m benchmarks.logging_overhead
+"""
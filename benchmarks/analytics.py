@@ -0,0 +1,72 @@
+"""Latency of analytics from the aggregates vs a GROUP BY over every zoning
+
+Fills a temporary results database with deterministic zonings of synthetic
+assessments (services.synthetic) in steps of --step rows. After each step it
+times ResultsStore.analytics(), which reads zoning_aggregates, against the
+same per-division/zone query run over the zonings table. All rows are
+written today, so the aggregates hold one day; each further day adds at
+most one row per division, model and zone.
+
+    python -m benchmarks.analytics [--rows 100000] [--step 25000] [--queries 20]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from services.results_store import ResultsStore, build_record
+from services.scoring import build_deterministic_report
+from services.synthetic import generate_assessments
+
+FULL_SCAN = (
+    "SELECT division, zone, subzone, COUNT(*), AVG(confidence), SUM(latency_ms), SUM(total_tokens) "
+    "FROM zonings GROUP BY division, zone, subzone"
+)
+
+
+def _time(fn, queries: int) -> float:
+    """Median milliseconds of fn over queries calls"""
+    samples = []
+    for _ in range(queries):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--step", type=int, default=25_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultsStore(str(Path(tmp) / "zonings.db"), batch_size=500, flush_interval=0.05,
+                             queue_size=args.step + 1)
+        conn = store._connect()
+        written = 0
+        print(f"{'zonings':>9} {'aggregate rows':>15} {'analytics ms':>13} {'full scan ms':>13}")
+        try:
+            while written < args.rows:
+                count = min(args.step, args.rows - written)
+                for assessment in generate_assessments(count, args.seed, start=written):
+                    result = build_deterministic_report(assessment)
+                    result["metadata"]["latency_ms"] = 1
+                    store.record(build_record(assessment, result))
+                store.flush()
+                written += count
+
+                aggregates = conn.execute("SELECT COUNT(*) FROM zoning_aggregates").fetchone()[0]
+                fast = _time(store.analytics, args.queries)
+                slow = _time(lambda: conn.execute(FULL_SCAN).fetchall(), args.queries)
+                print(f"{written:>9} {aggregates:>15} {fast:>13.2f} {slow:>13.2f}")
+        finally:
+            conn.close()
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
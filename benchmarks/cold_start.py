@@ -0,0 +1,96 @@
+"""Time from worker start to the first successful /zone, per warm-up mode
+
+Starts fresh interpreters against a local stub upstream (see
+benchmarks/stub_upstream.py; plain HTTP, so no TLS handshake is included)
+and measures in each:
+
+- import: importing app
+- ready: until the startup warm-up has finished (the lifespan has run)
+- first /zone: latency of the first zoning request after that
+- total: process start to the first /zone response
+
+Modes: "eager" imports the OpenAI SDK and builds a client before the app,
+as the worker did before the SDK import was deferred; "off" defers both to
+the first request; "connect" does them in the startup warm-up.
+
+    python -m benchmarks.cold_start [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.stub_upstream import StubUpstream
+
+ROOT = Path(__file__).parent.parent
+SAMPLE = ROOT / "samples" / "novatel_assessment.json"
+MODES = ("eager", "off", "connect")
+
+
+def _child(mode: str) -> None:
+    """Measure one cold start in this (fresh) interpreter and print JSON"""
+    started = time.perf_counter()
+    if mode == "eager":
+        import openai
+        openai.OpenAI()
+    import app
+    imported = time.perf_counter()
+
+    from fastapi.testclient import TestClient
+    with TestClient(app.app) as client:
+        while app.warm_up.status()["state"] == "warming":
+            time.sleep(0.001)
+        ready = time.perf_counter()
+        response = client.post("/zone", content=SAMPLE.read_bytes(),
+                               headers={"X-API-Key": os.environ["API_KEY"], "Content-Type": "application/json"})
+        done = time.perf_counter()
+    assert response.status_code == 200, response.text
+    print(json.dumps({
+        "import": (imported - started) * 1000,
+        "ready": (ready - started) * 1000,
+        "first /zone": (done - ready) * 1000,
+        "total": (done - started) * 1000,
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child)
+        return
+
+    with StubUpstream() as stub, tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for mode in MODES:
+            env = {
+                **os.environ,
+                "OPENAI_API_KEY": "sk-stub", "BACKEND_BASE_URL": stub.base_url, "API_KEY": "hbz_benchmark",
+                "WARMUP": "connect" if mode == "connect" else "off", "UPSTREAM_CHECK_INTERVAL": "0",
+                "RESULTS_DB_PATH": str(Path(tmp) / f"{mode}.db"), "LOG_LEVEL": "WARNING",
+            }
+            runs = [
+                json.loads(subprocess.run(
+                    [sys.executable, "-m", "benchmarks.cold_start", "--child", mode],
+                    cwd=ROOT, env=env, capture_output=True, text=True, check=True
+                ).stdout.splitlines()[-1])
+                for _ in range(args.runs)
+            ]
+            results[mode] = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+    print(f"median of {args.runs} fresh processes (ms)")
+    columns = list(results[MODES[0]])
+    print(f"  {'mode':<10}" + "".join(f"{column:>14}" for column in columns))
+    for mode, row in results.items():
+        print(f"  {mode:<10}" + "".join(f"{row[column]:14.0f}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
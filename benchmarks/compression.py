@@ -0,0 +1,84 @@
+"""Bytes on the wire and CPU cost of each response encoding
+
+Encodes three representative bodies with every available encoding (gzip,
+plus zstd and brotli when installed):
+
+- one stored zoning (GET /zonings/{id}): the sample assessment with a
+  report of --report-kb KB of markdown prose (model reports run to several
+  KB; the text is taken from the rules file)
+- a 50-row /zonings page (distinct ids, hashes and timestamps)
+- a 50-record NDJSON export (distinct reports), compressed line by line
+  with a flush after each line as the middleware does for streams
+
+    python -m benchmarks.compression [--report-kb 6] [--iterations 200]
+"""
+import argparse
+import json
+import timeit
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from services.results_store import build_record
+from services.scoring import build_deterministic_report
+from utils import codec
+from utils.compression import COMPRESSORS, compress
+
+ROOT = Path(__file__).parent.parent
+SAMPLE = ROOT / "samples" / "novatel_assessment.json"
+RULES = next((ROOT / "rules").glob("*.md"), None)
+
+
+def _record(assessment: Dict, kb: int, offset: int = 0) -> Dict:
+    """Stored zoning whose report is padded to kb KB with rules-file prose from offset"""
+    result = build_deterministic_report(assessment)
+    prose = RULES.read_text(encoding="utf-8") if RULES else ""
+    prose = (prose * 2)[offset % max(1, len(prose)):]
+    result["report_markdown"] += "\n\n" + prose[:max(0, kb * 1024 - len(result["report_markdown"]))]
+    record = build_record(assessment, result)
+    record["assessment"], record["summary"] = assessment, json.loads(record["summary"])
+    return record
+
+
+def _stream(lines: List[bytes], encoding: str) -> bytes:
+    compressor = COMPRESSORS[encoding]()
+    return b"".join(compressor.compress(line) for line in lines) + compressor.finish()
+
+
+def _per_call_us(fn: Callable[[], bytes], iterations: int) -> float:
+    return min(timeit.repeat(fn, number=iterations, repeat=3)) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--report-kb", type=int, default=6)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    assessment = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    records = [_record(assessment, args.report_kb, offset=i * args.report_kb * 1024) for i in range(50)]
+    record = records[0]
+    page = {"items": [{k: r[k] for k in ("id", "created_at", "brand", "zone", "subzone",
+                                         "confidence", "assessment_hash", "summary")} for r in records],
+            "next_cursor": "x" * 40}
+    export = [codec.dumps(r) + b"\n" for r in records]
+
+    bodies = {
+        "zoning": lambda encoding: compress(codec.dumps(record), encoding),
+        "page (50)": lambda encoding: compress(codec.dumps(page), encoding),
+        "export (50, streamed)": lambda encoding: _stream(export, encoding),
+    }
+    sizes = {"zoning": len(codec.dumps(record)), "page (50)": len(codec.dumps(page)),
+             "export (50, streamed)": sum(map(len, export))}
+
+    print(f"encodings: {', '.join(COMPRESSORS)} (zlib {zlib.ZLIB_VERSION})")
+    for name, encode in bodies.items():
+        print(f"  {name}: {sizes[name]} bytes uncompressed")
+        for encoding in COMPRESSORS:
+            size = len(encode(encoding))
+            micros = _per_call_us(lambda: encode(encoding), args.iterations)
+            print(f"    {encoding:<5} {size:8d} bytes ({100 * size / sizes[name]:4.1f}%)  {micros:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Per-request JSON encode/decode cost: standard library vs the fast codec
+
+Times the three JSON steps of a /zone request on the sample assessment and
+a report-sized response:
+
+- decoding the request body (json.loads + Pydantic Dict validation vs
+  codec.loads + type check)
+- serialising the assessment into the user message (indent=2 vs compact
+  canonical), with the resulting size
+- encoding the response (jsonable_encoder + JSONResponse vs FastJSONResponse)
+
+    python -m benchmarks.json_codec [--iterations 2000]
+"""
+import argparse
+import json
+import timeit
+from pathlib import Path
+from typing import Any, Dict
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import RootModel
+from starlette.responses import JSONResponse
+
+from utils import codec
+from utils.codec import FastJSONResponse
+
+SAMPLE = Path(__file__).parent.parent / "samples" / "novatel_assessment.json"
+
+
+class _Assessment(RootModel[Dict[str, Any]]):
+    pass
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    return min(timeit.repeat(fn, number=iterations, repeat=3)) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    body = SAMPLE.read_bytes()
+    assessment = json.loads(body)
+    response = {
+        "report_markdown": "# Zone 3B — Endorsed Brand (Recommended)\n\n" + "Lorem ipsum dolor sit amet. " * 400,
+        "summary": {"brand": "NovAtel", "zone": "3", "subzone": "B", "confidence": 82,
+                    "drivers": ["Q8b"] * 5, "conflicts": [], "risks": ["r"] * 3, "next_steps": ["s"] * 3},
+        "metadata": {"model": "gpt-4o", "prompt_hash": "0" * 64, "latency_ms": 12840,
+                     "usage": {"prompt_tokens": 31000, "completion_tokens": 1400, "total_tokens": 32400}},
+        "result_id": "f" * 32,
+    }
+
+    indented = json.dumps(assessment, ensure_ascii=False, indent=2)
+    compact = codec.dumps_canonical(assessment)
+
+    rows = [
+        ("decode body (json + pydantic)", _per_call_us(lambda: _Assessment.model_validate(json.loads(body)), n)),
+        (f"decode body ({codec.BACKEND})", _per_call_us(lambda: isinstance(codec.loads(body), dict), n)),
+        ("user message (indent=2)", _per_call_us(lambda: json.dumps(assessment, ensure_ascii=False, indent=2), n)),
+        (f"user message (canonical, {codec.BACKEND})", _per_call_us(lambda: codec.dumps_canonical(assessment), n)),
+        ("response (jsonable_encoder + JSONResponse)",
+         _per_call_us(lambda: JSONResponse(jsonable_encoder(response)).body, n)),
+        (f"response (FastJSONResponse, {codec.BACKEND})", _per_call_us(lambda: FastJSONResponse(response).body, n)),
+    ]
+
+    print(f"{n} iterations, backend={codec.BACKEND}")
+    for label, micros in rows:
+        print(f"  {label:<45} {micros:9.1f} us")
+    print(f"  user message size: {len(indented)} -> {len(compact)} chars "
+          f"({100 * (1 - len(compact) / len(indented)):.0f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Per-record cost of logging on the request path
+
+Compares a synchronous StreamHandler (the previous setup) with the queue
+pipeline from utils.logging_config. The sink is a file whose writes are
+delayed by --write-latency-us to model a stdout pipe under back-pressure
+(container log drivers); 0 measures pure CPU cost. Also shows the cost of
+filtered-out DEBUG calls with eager f-string versus lazy %-style formatting.
+
+    python -m benchmarks.logging_overhead [--records 20000] [--threads 8] [--write-latency-us 50]
+"""
+import argparse
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logging_config import ContextFilter, JSONFormatter, _StructuredQueueHandler
+
+PAYLOAD = {"brand": "NovAtel", "zone": "3", "subzone": "B", "confidence": 82}
+
+
+class _SlowFile:
+    """File wrapper whose writes take at least latency seconds"""
+
+    def __init__(self, path: str, latency: float):
+        self._file = open(path, "w", encoding="utf-8")
+        self._latency = latency
+
+    def write(self, text: str) -> int:
+        if self._latency:
+            time.sleep(self._latency)
+        return self._file.write(text)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _emit(logger: logging.Logger, count: int) -> None:
+    for i in range(count):
+        logger.info("Recommended zone: %s (%s) with %s%% confidence", "3", "Endorsed Brand", 82,
+                    extra={"zone": "3", "latency_ms": i})
+
+
+def _timed(logger: logging.Logger, records: int, threads: int) -> float:
+    """Microseconds per record spent in the calling threads"""
+    per_thread = records // threads
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda _: _emit(logger, per_thread), range(threads)))
+    return (time.perf_counter() - start) / (per_thread * threads) * 1e6
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers[:] = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--write-latency-us", type=float, default=50.0)
+    args = parser.parse_args()
+    latency = args.write_latency_us / 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_stream = _SlowFile(os.path.join(tmp, "sync.log"), latency)
+        sync_handler = logging.StreamHandler(sync_stream)
+        sync_handler.setFormatter(JSONFormatter())
+        sync_us = _timed(_logger("sync", sync_handler), args.records, args.threads)
+        sync_stream.close()
+
+        queued_stream = _SlowFile(os.path.join(tmp, "queued.log"), latency)
+        file_handler = logging.StreamHandler(queued_stream)
+        file_handler.setFormatter(JSONFormatter())
+        queue_handler = _StructuredQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(ContextFilter())
+        listener = logging.handlers.QueueListener(queue_handler.queue, file_handler)
+        listener.start()
+        queued_us = _timed(_logger("queued", queue_handler), args.records, args.threads)
+        drain_start = time.perf_counter()
+        listener.stop()
+        drain_s = time.perf_counter() - drain_start
+        queued_stream.close()
+
+    filtered = logging.getLogger("bench.filtered")
+    filtered.setLevel(logging.INFO)
+    start = time.perf_counter()
+    for _ in range(args.records):
+        filtered.debug(f"Assessment: {PAYLOAD}")
+    eager_us = (time.perf_counter() - start) / args.records * 1e6
+    start = time.perf_counter()
+    for _ in range(args.records):
+        filtered.debug("Assessment: %s", PAYLOAD)
+    lazy_us = (time.perf_counter() - start) / args.records * 1e6
+
+    print(f"{args.records} records, {args.threads} threads, {args.write_latency_us:g} us write latency")
+    print(f"  sync StreamHandler (JSON)   {sync_us:8.2f} us/record on caller")
+    print(f"  queue + listener (JSON)     {queued_us:8.2f} us/record on caller "
+          f"(listener drained backlog in {drain_s:.2f}s)")
+    print(f"  filtered DEBUG, f-string    {eager_us:8.2f} us/call")
+    print(f"  filtered DEBUG, %-style     {lazy_us:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Peak memory per request: copy-heavy vs bounded report handling
+
+Measures the tracemalloc peak of the per-request string and bytes work around
+a model call, for a fake report of --report-kb kilobytes:
+
+- building the user message (indent=2 JSON and chained + vs canonical
+  JSON and one join)
+- injecting the zone overview (slicing the report vs one str.replace)
+- encoding a /zone/bulk response of --items results (one list encoded at
+  the end vs one line encoded per item as it is streamed)
+
+    python -m benchmarks.memory [--report-kb 64] [--items 50]
+"""
+import argparse
+import json
+import re
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from services.openai_service import _inject_zone_overview
+from services.report_builder import zone_overview
+from utils import codec
+
+SAMPLE = Path(__file__).parent.parent / "samples" / "novatel_assessment.json"
+
+
+def _peak_kb(fn: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _legacy_inject(markdown: str, zone: str, subzone: str) -> str:
+    definition = zone_overview(zone, subzone)
+    match = re.search(r"(\n\n)(\*\*SCORING BREAKDOWN\*\*|\*\*.*Assessment.*\*\*|##\s+)", markdown)
+    insert_pos = match.start()
+    return markdown[:insert_pos] + "\n\n" + definition + "\n" + markdown[insert_pos:]
+
+
+def _legacy_request(assessment: Dict, previous: str) -> Tuple[str, str]:
+    encoded = json.dumps(assessment, ensure_ascii=False, indent=2)
+    user_msg = (
+        "PREVIOUS REPORT:\n" + previous +
+        "\n\nCHANGED ANSWERS:\n- Z3Q3: False -> True" +
+        "\n\nUPDATED ASSESSMENT JSON:\n" + encoded +
+        "\n\nUpdate the previous report for the changed answers."
+    )
+    return user_msg, _legacy_inject(previous, "3", "B")
+
+
+def _bounded_request(assessment: Dict, previous: str) -> Tuple[str, str]:
+    encoded = codec.dumps_canonical(assessment)
+    user_msg = "".join((
+        "PREVIOUS REPORT:\n", previous,
+        "\n\nCHANGED ANSWERS:\n- Z3Q3: False -> True",
+        "\n\nUPDATED ASSESSMENT JSON:\n", encoded,
+        "\n\nUpdate the previous report for the changed answers.",
+    ))
+    return user_msg, _inject_zone_overview(previous, "3", "B")
+
+
+def _legacy_bulk(results: List[Dict]) -> bytes:
+    collected = [dict(result) for result in results]
+    return json.dumps({"results": collected}, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _streamed_bulk(results: List[Dict]) -> int:
+    def lines() -> Iterator[bytes]:
+        for result in results:
+            yield codec.dumps(result) + b"\n"
+    return sum(len(line) for line in lines())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--report-kb", type=int, default=64)
+    parser.add_argument("--items", type=int, default=50)
+    args = parser.parse_args()
+
+    assessment = json.loads(SAMPLE.read_bytes())
+    paragraph = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+    report = ("# Zone 3B — Endorsed Brand\n\nConfidence: 82%\n- driver\n\n**SCORING BREAKDOWN**\n\n"
+              + paragraph * (args.report_kb * 1024 // len(paragraph)))
+    results = [{"line": i, "status": "ok", "result": {"report_markdown": report, "summary": {"zone": "3"}}}
+               for i in range(args.items)]
+
+    rows = [
+        ("request (indent=2, chained +, slicing)", _peak_kb(lambda: _legacy_request(assessment, report))),
+        ("request (canonical, join, str.replace)", _peak_kb(lambda: _bounded_request(assessment, report))),
+        (f"bulk response ({args.items} items, one document)", _peak_kb(lambda: _legacy_bulk(results))),
+        (f"bulk response ({args.items} items, streamed lines)", _peak_kb(lambda: _streamed_bulk(results))),
+    ]
+
+    print(f"report {len(report) / 1024:.0f} KiB, backend={codec.BACKEND}")
+    for label, peak in rows:
+        print(f"  {label:<48} peak {peak:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Prompt tokens and zone agreement: JSON vs compact assessment encoding
+
+Encodes the sample assessment and --variants seeded random variants (each
+answer redrawn from its question's domain, some left unanswered) three ways:
+indented JSON (the original prompt), compact canonical JSON (PROMPT_ENCODING
+=json) and the question-code encoding (PROMPT_ENCODING=compact). Reports the
+user-message token counts, and checks zone agreement by decoding the compact
+text and scoring it against the original with the deterministic scorer.
+
+Token counts use tiktoken when installed and otherwise an estimate of one
+token per 4 characters (marked "~"). --live N additionally sends N variants
+to the model under both encodings and compares the zones it returns (needs
+OPENAI_API_KEY, or a BACKEND server; costs 2N requests). With --stub the
+live calls go through the backend adapter to a local stub server instead,
+which checks the request path without zone agreement meaning anything.
+
+    python -m benchmarks.prompt_encoding [--variants 200] [--seed 7] [--live 0] [--stub]
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import statistics
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from services.prompt_encoding import build_legend, decode_compact, encode_compact
+from services.question_catalog import QUESTIONS
+from services.scoring import score_assessment
+from utils import codec
+
+SAMPLE = Path(__file__).parent.parent / "samples" / "novatel_assessment.json"
+
+
+def _token_counter(model: str) -> Tuple[Callable[[str], int], bool]:
+    """Return (count_tokens, exact)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return (lambda text: (len(text) + 3) // 4), False
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return (lambda text: len(encoding.encode(text))), True
+
+
+def _variant(base: Dict[str, Any], rng: random.Random, missing_rate: float = 0.05) -> Dict[str, Any]:
+    """Copy of base with every catalogued answer redrawn at random"""
+    assessment = copy.deepcopy(base)
+    for q in QUESTIONS:
+        node = assessment
+        for part in q.section:
+            node = node.setdefault(part, {})
+        if rng.random() < missing_rate:
+            node.pop(q.key, None)
+        else:
+            node[q.key] = rng.choice(q.domain)
+    return assessment
+
+
+def _live_zones(assessments: List[Dict[str, Any]]) -> None:
+    from config import Config
+    from services.openai_service import OpenAIService
+
+    config = Config()
+    services = {}
+    for encoding in ("json", "compact"):
+        config.prompt_encoding = encoding
+        services[encoding] = OpenAIService(config)
+    agree = 0
+    for i, assessment in enumerate(assessments):
+        zones = {}
+        for encoding, service in services.items():
+            summary = service.generate_zone_report(assessment)["summary"]
+            zones[encoding] = f"{summary.get('zone')}{summary.get('subzone') or ''}"
+        agree += zones["json"] == zones["compact"]
+        print(f"  live {i + 1}: json={zones['json']} compact={zones['compact']}")
+    print(f"  live zone agreement: {agree}/{len(assessments)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--model", default="gpt-4o", help="Tokenizer to count with (if tiktoken is installed)")
+    parser.add_argument("--live", type=int, default=0, help="Variants to also zone with the model")
+    parser.add_argument("--stub", action="store_true", help="Send the live calls to a local stub server")
+    args = parser.parse_args()
+
+    count, exact = _token_counter(args.model)
+    mark = "" if exact else "~"
+    base = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    rng = random.Random(args.seed)
+    assessments = [base] + [_variant(base, rng) for _ in range(args.variants)]
+
+    encoders = {
+        "indented JSON": lambda a: json.dumps(a, ensure_ascii=False, indent=2),
+        "canonical JSON": codec.dumps_canonical,
+        "compact": encode_compact,
+    }
+    tokens: Dict[str, List[int]] = {name: [] for name in encoders}
+    agree = 0
+    for assessment in assessments:
+        for name, encode in encoders.items():
+            tokens[name].append(count(encode(assessment)))
+        expected = score_assessment(assessment)
+        decoded = score_assessment(decode_compact(encode_compact(assessment)))
+        agree += (expected["zone"], expected["subzone"], expected["zones"]) == \
+                 (decoded["zone"], decoded["subzone"], decoded["zones"])
+
+    baseline = statistics.mean(tokens["indented JSON"])
+    print(f"{len(assessments)} assessments (sample + {args.variants} variants), "
+          f"tokens {'via tiktoken/' + args.model if exact else 'estimated at 4 chars/token'}")
+    for name, counts in tokens.items():
+        mean = statistics.mean(counts)
+        print(f"  {name:<15} user message {mark}{mean:7.0f} tokens mean "
+              f"(sample {mark}{counts[0]}, {100 * (1 - mean / baseline):3.0f}% fewer than indented)")
+    print(f"  legend (system prompt, cacheable prefix): {mark}{count(build_legend())} tokens once")
+    print(f"  deterministic zone agreement after decode: {agree}/{len(assessments)}")
+
+    if args.live and args.stub:
+        from benchmarks.stub_upstream import StubUpstream
+        with StubUpstream() as stub:
+            os.environ.update(BACKEND="vllm", BACKEND_BASE_URL=stub.base_url)
+            _live_zones(assessments[:args.live])
+    elif args.live:
+        _live_zones(assessments[:args.live])
+
+
+if __name__ == "__main__":
+    main()
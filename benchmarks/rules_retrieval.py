@@ -0,0 +1,113 @@
+"""Prompt tokens and zone agreement: full rules file vs chunked rules sections
+
+Builds the prompt of the sample assessment and --variants seeded synthetic
+assessments (services.synthetic) under RULES_MODE=full and
+RULES_MODE=chunked, and reports per-request prompt tokens (system +
+developer + user message), how often the STEP 5 fallback tier and the
+STEPs after a gate are left out, and a coverage check: the chunked prompt
+must hold the section of every gate that fired and, without a gate, of
+every STEP 1-4 question that scored points.
+
+--live N sends N variants to the model under both modes and compares the
+zones it returns (needs OPENAI_API_KEY or a BACKEND server; 2N requests).
+
+    python -m benchmarks.rules_retrieval [--variants 200] [--seed 7] [--live 0]
+"""
+import argparse
+import json
+import os
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.prompt_encoding import _token_counter
+from services.scoring import score_assessment
+from services.synthetic import generate_assessments
+
+ROOT = Path(__file__).parent.parent
+SAMPLE = ROOT / "samples" / "novatel_assessment.json"
+RULES = next((ROOT / "rules").glob("*.md"), None)
+
+
+def _required(score: Dict) -> List[str]:
+    """Questions whose sections a chunked prompt must contain"""
+    if score["gates"]:
+        return list(score["gates"])
+    return [code for code in score["contributions"] if not code.startswith("Z3F")]
+
+
+def _services():
+    from config import Config
+    from services.openai_service import OpenAIService
+
+    services = {}
+    for mode in ("full", "chunked"):
+        config = Config()
+        config.rules_mode = mode
+        services[mode] = OpenAIService(config)
+    return services
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--model", default="gpt-4o", help="Tokenizer to count with (if tiktoken is installed)")
+    parser.add_argument("--live", type=int, default=0, help="Variants to also zone with the model")
+    args = parser.parse_args()
+
+    # Without --live only prompts are built, so no API key is needed
+    if RULES is not None:
+        os.environ.setdefault("SYSTEM_RULES_PATH", str(RULES))
+    if not args.live:
+        os.environ.setdefault("OPENAI_API_KEY", "unused")
+    services = _services()
+    index = services["chunked"].rules_index
+    if index is None:
+        raise SystemExit(f"No rules file at {os.environ['SYSTEM_RULES_PATH']}")
+
+    count, exact = _token_counter(args.model)
+    mark = "" if exact else "~"
+    base = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    assessments = [base] + list(generate_assessments(args.variants, args.seed))
+
+    tokens: Dict[str, List[int]] = {mode: [] for mode in services}
+    sections: List[int] = []
+    gated = fallback = covered = 0
+    for assessment in assessments:
+        for mode, service in services.items():
+            tokens[mode].append(count(service.system_prompt) + count(service.developer_prompt)
+                                + count(service.user_message(assessment)))
+        score = score_assessment(assessment)
+        ids = set(index.relevant_ids(assessment, score))
+        sections.append(len(ids))
+        gated += bool(score["gates"])
+        fallback += "STEP 5" in ids
+        covered += all(index.section_for(code) in ids for code in _required(score))
+
+    full = statistics.mean(tokens["full"])
+    print(f"{len(assessments)} assessments (sample + {args.variants} variants), "
+          f"tokens {'via tiktoken/' + args.model if exact else 'estimated at 4 chars/token'}")
+    for mode, counts in tokens.items():
+        mean = statistics.mean(counts)
+        print(f"  {mode:<8} prompt {mark}{mean:7.0f} tokens mean (sample {mark}{counts[0]}, "
+              f"p95 {mark}{sorted(counts)[int(len(counts) * 0.95)]}, {100 * (1 - mean / full):3.0f}% fewer than full)")
+    print(f"  sections per request: {statistics.mean(sections):.1f} of {len(index)} mean")
+    print(f"  gated (STEPs 3-5 left out): {gated}/{len(assessments)}; "
+          f"STEP 5 fallback included: {fallback}/{len(assessments)}")
+    print(f"  scoring questions covered by the selected sections: {covered}/{len(assessments)}")
+
+    if args.live:
+        agree = 0
+        for i, assessment in enumerate(assessments[:args.live]):
+            zones = {}
+            for mode, service in services.items():
+                summary = service.generate_zone_report(assessment)["summary"]
+                zones[mode] = f"{summary.get('zone')}{summary.get('subzone') or ''}"
+            agree += zones["full"] == zones["chunked"]
+            print(f"  live {i + 1}: full={zones['full']} chunked={zones['chunked']}")
+        print(f"  live zone agreement: {agree}/{args.live}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Local stand-in for an OpenAI-compatible API
+
+Serves just what the service calls, over plain HTTP on 127.0.0.1:
+
+- GET  /v1/models/{model}       (upstream check and warm-up)
+- POST /v1/chat/completions     (n samples of a canned Zone 3B report)
+
+Point the service at it with BACKEND_BASE_URL=<StubUpstream.base_url>, so
+calls go through the same backend adapter as a self-hosted server (see
+services/backends.py). Usage is estimated at four characters per token.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+SUMMARY = {"brand": "Stub", "zone": "3", "subzone": "B", "zone_name": "Endorsed Brand", "confidence": 80,
+           "drivers": [], "conflicts": [], "risks": [], "next_steps": []}
+
+REPORT = (
+    "# Zone 3B — Endorsed Brand (Recommended)\n\n"
+    "Confidence: 80%\n- Stub upstream report\n\n"
+    "**SCORING BREAKDOWN**\n\nNo scoring: this report comes from the local stub.\n\n"
+    "```json\n" + json.dumps(SUMMARY) + "\n```\n"
+)
+
+
+class StubUpstream:
+    """Threaded stub server; use as a context manager"""
+
+    def __init__(self, latency: float = 0.0, report: str = REPORT):
+        """
+        Args:
+            latency: Seconds each chat completion takes
+            report: Content of every completion choice
+        """
+        self.latency = latency
+        self.report = report
+        self.requests = 0
+        self.last_request: Optional[Dict[str, Any]] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "StubUpstream":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                if self.path.startswith("/v1/models/"):
+                    model = self.path.rsplit("/", 1)[1]
+                    self._send(200, {"id": model, "object": "model", "created": 0, "owned_by": "stub"})
+                else:
+                    self._send(404, {"error": {"message": "not found"}})
+
+            def do_POST(self) -> None:
+                if self.path != "/v1/chat/completions":
+                    self._send(404, {"error": {"message": "not found"}})
+                    return
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                stub.requests += 1
+                stub.last_request = request
+                time.sleep(stub.latency)
+                self._send(200, stub.completion(request))
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, name="stub-upstream", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Chat completion response body for a request"""
+        n = int(request.get("n") or 1)
+        content = self.report if request.get("max_tokens") != 1 else "pong"
+        prompt_tokens = sum(len(m.get("content") or "") for m in request.get("messages", [])) // 4
+        completion_tokens = n * (len(content) // 4)
+        return {
+            "id": f"chatcmpl-stub-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{"index": i, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}} for i in range(n)],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
@@ -0,0 +1,74 @@
+"""Throughput of the deterministic pipeline on synthetic assessments
+
+Streams --count seeded assessments from services.synthetic through
+generation, the deterministic scorer (services.scoring) and the compiled
+validation table (services.validation_rules), timing each stage per item,
+and prints the zone mix the profile produced. The gate edge cases are
+scored too, and each must land in the zone its gate forces.
+
+    python -m benchmarks.synthetic_load [--count 100000] [--seed 7] [--gate-rate 0.05]
+"""
+import argparse
+import collections
+import time
+
+from services.question_catalog import QUESTIONS_BY_CODE
+from services.scoring import score_assessment
+from services.synthetic import DEFAULT_PROFILE, SyntheticGenerator, SyntheticProfile, gate_cases
+from services.validation_rules import compile_validation_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--true-rate", type=float, default=DEFAULT_PROFILE.true_rate)
+    parser.add_argument("--missing-rate", type=float, default=DEFAULT_PROFILE.missing_rate)
+    parser.add_argument("--gate-rate", type=float, default=DEFAULT_PROFILE.gate_rate)
+    args = parser.parse_args()
+
+    profile = SyntheticProfile(true_rate=args.true_rate, missing_rate=args.missing_rate, gate_rate=args.gate_rate)
+    table = compile_validation_table("")
+    timings = collections.Counter()
+    zones = collections.Counter()
+    statuses = collections.Counter()
+    gated = 0
+
+    for assessment in SyntheticGenerator(args.seed, profile).generate(args.count):
+        # Generation is timed between items, the way a consumer sees it
+        scored = time.perf_counter()
+        score = score_assessment(assessment)
+        validated = time.perf_counter()
+        status = table.validate(assessment, score)["status"]
+        done = time.perf_counter()
+        timings["score"] += validated - scored
+        timings["validate"] += done - validated
+        zones[score["zone"] + score["subzone"]] += 1
+        statuses[status] += 1
+        gated += bool(score["gates"])
+
+    started = time.perf_counter()
+    for _ in SyntheticGenerator(args.seed, profile).generate(args.count):
+        pass
+    timings["generate"] = time.perf_counter() - started
+
+    print(f"{args.count} synthetic assessments (seed {args.seed}, true {args.true_rate}, "
+          f"missing {args.missing_rate}, gate {args.gate_rate})")
+    for stage in ("generate", "score", "validate"):
+        seconds = timings[stage]
+        print(f"  {stage:<9} {1e6 * seconds / args.count:7.1f} µs/item  {args.count / seconds:9.0f} items/s")
+    print("  zones: " + ", ".join(f"{zone} {100 * n / args.count:.1f}%" for zone, n in sorted(zones.items())))
+    print(f"  gated: {gated}/{args.count}; validation: " + ", ".join(f"{s} {n}" for s, n in sorted(statuses.items())))
+
+    failures = []
+    for case, assessment in gate_cases(args.seed, profile):
+        score = score_assessment(assessment)
+        codes = case.split(":", 1)[1].split("+") if case.startswith("gate:") else []
+        expected = max((QUESTIONS_BY_CODE[code].gate for code in codes), default=None)
+        if sorted(score["gates"]) != sorted(codes) or (expected and score["zone"] != expected):
+            failures.append(f"{case} -> zone {score['zone']}, gates {score['gates']}")
+    print(f"  gate edge cases: {'all forced their zone' if not failures else '; '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
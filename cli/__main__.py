@@ -0,0 +1,30 @@
+"""Command-line entry point: python -m cli <command> ..."""
+import argparse
+import sys
+
+from cli import bulk, generate, replay, zone
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the top-level argument parser with all subcommands"""
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Brand Zoning command-line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    bulk.add_parser(subparsers)
+    generate.add_parser(subparsers)
+    replay.add_parser(subparsers)
+    zone.add_parser(subparsers)
+    return parser
+
+
+def main(argv=None) -> int:
+    """Parse arguments and run the selected command
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
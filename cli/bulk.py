@@ -0,0 +1,136 @@
+"""Bulk NDJSON import/export against a running Brand Zoning API
+
+    python -m cli bulk upload portfolio.ndjson -o results.ndjson
+    python -m cli bulk export --division "Autonomy & Positioning" -o zonings.ndjson
+"""
+import argparse
+import contextlib
+import itertools
+import os
+import sys
+from typing import BinaryIO, Iterator, List, Tuple
+
+import httpx
+
+from utils.ndjson import NDJSON_MEDIA_TYPE, dumps_line, iter_lines, parse_line
+
+# Largest accepted input line, matching the server's limit
+MAX_LINE_BYTES = 1_000_000
+
+
+def add_parser(subparsers) -> None:
+    """Register the bulk command and its upload/export subcommands"""
+    parser = subparsers.add_parser("bulk", help="Bulk NDJSON import/export via the API")
+    commands = parser.add_subparsers(dest="bulk_command", required=True)
+
+    def add_connection_args(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--url", default=os.getenv("ZONER_URL", "http://localhost:8080"),
+                         help="API base URL (default: $ZONER_URL or http://localhost:8080)")
+        sub.add_argument("--api-key", default=os.getenv("API_KEY"),
+                         help="API key (default: $API_KEY)")
+        sub.add_argument("-o", "--output", default="-", help="Output NDJSON file (default: stdout)")
+
+    upload = commands.add_parser("upload", help="Zone every assessment in an NDJSON file")
+    upload.add_argument("input", help="NDJSON file, one assessment object per line")
+    upload.add_argument("--batch-size", type=int, default=100,
+                        help="Lines sent per /zone/bulk request (default: 100)")
+    upload.add_argument("--timeout", type=float, default=600.0, help="Per-request timeout in seconds")
+    add_connection_args(upload)
+    upload.set_defaults(func=run_upload)
+
+    export = commands.add_parser("export", help="Download stored zonings as NDJSON")
+    for name in ("brand", "division", "zone", "since", "until"):
+        export.add_argument(f"--{name}")
+    add_connection_args(export)
+    export.set_defaults(func=run_export)
+
+
+@contextlib.contextmanager
+def _open_output(path: str):
+    """Open an output path for binary writing, '-' meaning stdout"""
+    if path == "-":
+        yield sys.stdout.buffer
+    else:
+        with open(path, "wb") as f:
+            yield f
+
+
+def _batches(stream: BinaryIO, batch_size: int) -> Iterator[List[Tuple[int, bytes]]]:
+    """Group input lines into batches without reading ahead of the current batch"""
+    lines = iter_lines(stream, MAX_LINE_BYTES)
+    while True:
+        batch = list(itertools.islice(lines, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def run_upload(args: argparse.Namespace) -> int:
+    """Stream an NDJSON file through POST /zone/bulk in fixed-size batches
+
+    Each batch is a separate request whose results are written out as they
+    arrive, so neither side buffers more than one batch. Output indices refer
+    to lines of the input file.
+
+    Returns:
+        0 if every item succeeded, 1 otherwise
+    """
+    headers = {"X-API-Key": args.api_key or "", "Content-Type": NDJSON_MEDIA_TYPE}
+    total = failed = 0
+
+    with open(args.input, "rb") as source, _open_output(args.output) as out, \
+            httpx.Client(base_url=args.url, timeout=args.timeout) as client:
+        for batch in _batches(source, args.batch_size):
+            # Oversized lines (b"" placeholders) are reported locally, not sent
+            sent = [(index, line) for index, line in batch if line]
+            for index, line in batch:
+                if not line:
+                    out.write(dumps_line({"index": index, "error": "Line exceeds maximum size", "status": 422}))
+                    failed += 1
+                    total += 1
+            if not sent:
+                continue
+
+            body = b"".join(line + b"\n" for _, line in sent)
+            with client.stream("POST", "/zone/bulk", content=body, headers=headers) as response:
+                if response.status_code != 200:
+                    response.read()
+                    print(f"Bulk request failed ({response.status_code}): {response.text}", file=sys.stderr)
+                    return 1
+                for line in response.iter_lines():
+                    if not line.strip():
+                        continue
+                    record = parse_line(line.encode("utf-8"))
+                    record["index"] = sent[record["index"]][0]
+                    failed += "error" in record
+                    total += 1
+                    out.write(dumps_line(record))
+                    out.flush()
+
+    print(f"Processed {total} assessment(s), {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def run_export(args: argparse.Namespace) -> int:
+    """Stream GET /zonings/export to a local NDJSON file
+
+    Returns:
+        0 on success, 1 on HTTP error
+    """
+    params = {name: getattr(args, name) for name in ("brand", "division", "zone", "since", "until")
+              if getattr(args, name)}
+    count = 0
+
+    with _open_output(args.output) as out, httpx.Client(base_url=args.url, timeout=None) as client:
+        with client.stream("GET", "/zonings/export", params=params,
+                           headers={"X-API-Key": args.api_key or ""}) as response:
+            if response.status_code != 200:
+                response.read()
+                print(f"Export failed ({response.status_code}): {response.text}", file=sys.stderr)
+                return 1
+            for chunk in response.iter_bytes():
+                out.write(chunk)
+                count += chunk.count(b"\n")
+
+    print(f"Exported {count} zoning(s)", file=sys.stderr)
+    return 0
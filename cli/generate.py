@@ -0,0 +1,76 @@
+"""Write seeded synthetic assessments as NDJSON for load and fuzz testing
+
+    python -m cli generate -n 1000000 --seed 7 -o synthetic.ndjson
+    python -m cli generate -n 500 --gate-rate 0.5 --edge-cases | python -m cli bulk upload /dev/stdin
+
+Assessments come from services.synthetic; the same seed and index always
+give the same assessment, so --start splits a large run across machines.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict
+
+from cli.bulk import _open_output
+from services.question_catalog import QUESTIONS_BY_CODE
+from services.synthetic import DEFAULT_PROFILE, SyntheticGenerator, SyntheticProfile, gate_cases
+from utils.ndjson import dumps_line
+
+
+def add_parser(subparsers) -> None:
+    """Register the generate command"""
+    parser = subparsers.add_parser("generate", help="Write synthetic assessments as NDJSON")
+    parser.add_argument("-n", "--count", type=int, default=1000, help="Assessments to write (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed (default: 0)")
+    parser.add_argument("--start", type=int, default=0, help="Index of the first assessment (default: 0)")
+    parser.add_argument("--true-rate", type=float, default=DEFAULT_PROFILE.true_rate,
+                        help=f"Chance a yes/no question is answered Yes (default: {DEFAULT_PROFILE.true_rate})")
+    parser.add_argument("--missing-rate", type=float, default=DEFAULT_PROFILE.missing_rate,
+                        help=f"Chance a question is unanswered (default: {DEFAULT_PROFILE.missing_rate})")
+    parser.add_argument("--gate-rate", type=float, default=DEFAULT_PROFILE.gate_rate,
+                        help=f"Chance of one Zone 4/5 gate answered Yes (default: {DEFAULT_PROFILE.gate_rate})")
+    parser.add_argument("--weights", type=json.loads, default={},
+                        help='Per-question answer weights as JSON, e.g. \'{"Z1Q1": {"<20": 3}, "Z3Q4": {"true": 2}}\'')
+    parser.add_argument("--edge-cases", action="store_true",
+                        help="Also write the gate edge cases first (see services.synthetic.gate_cases)")
+    parser.add_argument("-o", "--output", default="-", help="Output NDJSON file (default: stdout)")
+    parser.set_defaults(func=run_generate)
+
+
+def _parse_weights(raw: Dict[str, Dict[str, float]]) -> Dict[str, Dict[Any, float]]:
+    """JSON weights with "true"/"false" keys turned into booleans for yes/no questions"""
+    weights = {}
+    for code, answers in raw.items():
+        question = QUESTIONS_BY_CODE.get(code)
+        if question is not None and not question.is_bracket:
+            answers = {{"true": True, "false": False}.get(str(k).lower(), k): v for k, v in answers.items()}
+        weights[code] = answers
+    return weights
+
+
+def run_generate(args: argparse.Namespace) -> int:
+    """Stream synthetic assessments to an NDJSON file
+
+    Returns:
+        0 on success, 2 for an invalid profile
+    """
+    try:
+        profile = SyntheticProfile(true_rate=args.true_rate, missing_rate=args.missing_rate,
+                                   gate_rate=args.gate_rate, weights=_parse_weights(args.weights))
+        generator = SyntheticGenerator(args.seed, profile)
+    except (ValueError, AttributeError) as e:
+        print(f"Invalid profile: {e}", file=sys.stderr)
+        return 2
+
+    count = 0
+    with _open_output(args.output) as out:
+        if args.edge_cases:
+            for _, assessment in gate_cases(args.seed, profile):
+                out.write(dumps_line(assessment))
+                count += 1
+        for assessment in generator.generate(args.count, args.start):
+            out.write(dumps_line(assessment))
+            count += 1
+
+    print(f"Wrote {count} assessment(s)", file=sys.stderr)
+    return 0
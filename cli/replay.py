@@ -0,0 +1,353 @@
+"""Replay a labelled assessment corpus against two prompt bundles
+
+    python -m cli replay corpus.jsonl --candidate "llm:SYSTEM_RULES_PATH=rules/new.md"
+    python -m cli replay corpus.jsonl --candidate "llm:REPORT_MODE=templated" --json replay.json
+    python -m cli replay corpus/ --deterministic
+
+A bundle is "deterministic" (the scorer) or "llm", optionally followed by
+environment overrides applied while its configuration is built
+("llm:SYSTEM_RULES_PATH=...,PROMPT_ENCODING=compact"). Model responses are
+recorded in the results database under the bundle's prompt hash and replayed
+from there on later runs, so only new prompts or new corpus items cost API
+calls; replayed results keep the latency and token counts of the original
+call.
+
+Corpus items are either bare assessments or {"assessment": {...},
+"expected": "3A"} objects; labels ("1", "3A", ...) are compared with each
+bundle's result. --deterministic runs the scorer only and compares it with
+the labels, in seconds.
+"""
+import argparse
+import concurrent.futures as cf
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from cli.zone import _DeterministicZoner, _iter_inputs
+from config import ConfigError
+from services.results_store import ResultsStore, build_record
+from utils.hashing import assessment_hash
+
+# Outcome of one corpus item under one bundle
+Outcome = Dict[str, Any]
+
+
+def add_parser(subparsers) -> None:
+    """Register the replay command"""
+    parser = subparsers.add_parser("replay", help="Compare zones from two prompt bundles over a corpus")
+    parser.add_argument("corpus", help="Directory of *.json items or a JSONL file")
+    parser.add_argument("--baseline", default="llm", help='Baseline bundle (default: "llm")')
+    parser.add_argument("--candidate", help="Candidate bundle (omit to compare the baseline with the labels)")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="Score with the deterministic scorer only and compare with the labels")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel model calls (default: 4)")
+    parser.add_argument("--db", default=os.getenv("RESULTS_DB_PATH", "data/zonings.db"),
+                        help="Results database holding recorded responses (default: $RESULTS_DB_PATH)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Call the model even for recorded items (new responses are still recorded)")
+    parser.add_argument("--json", dest="json_path", help="Also write the full report as JSON here")
+    parser.add_argument("--max-flips", type=int,
+                        help="Exit with status 1 if more items than this change label")
+    parser.set_defaults(func=run_replay)
+
+
+def make_bundle(spec: str):
+    """Build the zoner for a bundle spec
+
+    Raises:
+        ValueError: If the spec is malformed
+        ConfigError: If the configuration with the overrides is invalid
+    """
+    kind, _, options = spec.partition(":")
+    if kind == "deterministic" and not options:
+        return _DeterministicZoner()
+    if kind != "llm":
+        raise ValueError(f'Invalid bundle {spec!r}; expected "deterministic" or "llm[:VAR=value,...]"')
+    overrides = {}
+    for option in filter(None, options.split(",")):
+        name, sep, value = option.partition("=")
+        if not sep or not name:
+            raise ValueError(f"Invalid bundle override {option!r}; expected VAR=value")
+        overrides[name.strip()] = value.strip()
+
+    from config import Config
+    from services.openai_service import OpenAIService
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        return OpenAIService(Config())
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _label(summary: Dict[str, Any]) -> Optional[str]:
+    """Zone plus subzone ("3A", "1") of a result summary"""
+    zone = str(summary.get("zone") or "")
+    if not zone:
+        return None
+    subzone = str(summary.get("subzone") or "").upper() if zone == "3" else ""
+    return zone + subzone
+
+
+def _expected(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Split a corpus item into (assessment, expected label)"""
+    if isinstance(item.get("assessment"), dict):
+        expected = item.get("expected")
+        if isinstance(expected, dict):
+            expected = _label(expected)
+        return item["assessment"], str(expected).upper() if expected else None
+    return item, None
+
+
+def evaluate(zoner, items: List[Dict[str, Any]], store: Optional[ResultsStore],
+             workers: int = 4, replay: bool = True) -> List[Outcome]:
+    """Zone every item with a bundle, replaying recorded responses when available
+
+    Args:
+        zoner: Bundle from make_bundle
+        items: Assessments in corpus order
+        store: Results database model responses are recorded in and
+            replayed from (None for none; the scorer never uses it)
+        workers: Parallel calls
+        replay: Serve items from recorded responses when available
+
+    Returns:
+        One outcome per item: label, confidence, latency_ms, total_tokens,
+        replayed, and error when the call failed
+    """
+    # The scorer is faster than a database lookup, and its results are not
+    # zonings anyone asked for, so it is never recorded or replayed
+    if isinstance(zoner, _DeterministicZoner):
+        store = None
+    outcomes: List[Optional[Outcome]] = [None] * len(items)
+    pending = []
+    for index, assessment in enumerate(items):
+        hit = store.find_cached(assessment_hash(assessment), zoner.prompt_hash) if store and replay else None
+        if hit:
+            outcomes[index] = {
+                "label": _label(hit["summary"]), "confidence": hit["confidence"],
+                "latency_ms": hit["latency_ms"], "total_tokens": hit["total_tokens"], "replayed": True,
+            }
+        else:
+            pending.append(index)
+
+    def call(assessment: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        started = time.perf_counter()
+        result = zoner.generate_zone_report(assessment)
+        return result, int((time.perf_counter() - started) * 1000)
+
+    with cf.ThreadPoolExecutor(max(1, workers)) as pool:
+        futures = {pool.submit(call, items[index]): index for index in pending}
+        for future in cf.as_completed(futures):
+            index = futures[future]
+            try:
+                result, elapsed_ms = future.result()
+            except Exception as e:
+                outcomes[index] = {"label": None, "confidence": None, "latency_ms": None,
+                                   "total_tokens": None, "replayed": False, "error": str(e)}
+                continue
+            metadata = result.get("metadata", {})
+            if store and metadata.get("prompt_hash"):
+                store.record(build_record(items[index], result))
+            outcomes[index] = {
+                "label": _label(result.get("summary", {})),
+                "confidence": result.get("summary", {}).get("confidence"),
+                "latency_ms": metadata.get("latency_ms", elapsed_ms),
+                "total_tokens": metadata.get("usage", {}).get("total_tokens"),
+                "replayed": False,
+            }
+    return outcomes
+
+
+def confusion(pairs: List[Tuple[Optional[str], Optional[str]]]) -> Dict[str, Dict[str, int]]:
+    """Count (row, column) label pairs, with a missing label counted as error"""
+    matrix: Dict[str, Dict[str, int]] = {}
+    for row, column in pairs:
+        cells = matrix.setdefault(row or "error", {})
+        cells[column or "error"] = cells.get(column or "error", 0) + 1
+    return matrix
+
+
+def _stats(values: List[Optional[float]]) -> Optional[Dict[str, float]]:
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {"mean": round(statistics.fmean(values), 1), "p50": round(statistics.median(values), 1)}
+
+
+def _delta(baseline: Optional[Dict[str, float]], candidate: Optional[Dict[str, float]]) -> Optional[float]:
+    if baseline is None or candidate is None:
+        return None
+    return round(candidate["mean"] - baseline["mean"], 1)
+
+
+def compare(sources: List[str], expected: List[Optional[str]], baseline: List[Outcome],
+            candidate: Optional[List[Outcome]] = None) -> Dict[str, Any]:
+    """Build the replay report from per-item outcomes
+
+    Returns:
+        Dict with accuracy against labels per bundle and, when a candidate is
+        given, zone and label confusion matrices, confidence drift,
+        latency/token deltas and the items whose label changed
+    """
+    labelled = [i for i, label in enumerate(expected) if label]
+
+    def accuracy(outcomes: List[Outcome]) -> Optional[Dict[str, Any]]:
+        if not labelled:
+            return None
+        correct = sum(outcomes[i]["label"] == expected[i] for i in labelled)
+        zone_correct = sum((outcomes[i]["label"] or "")[:1] == expected[i][:1] for i in labelled)
+        return {"labelled": len(labelled), "label_correct": correct, "zone_correct": zone_correct,
+                "matrix": confusion([(expected[i], outcomes[i]["label"]) for i in labelled])}
+
+    report: Dict[str, Any] = {
+        "items": len(sources),
+        "baseline": {
+            "errors": sum("error" in o for o in baseline),
+            "replayed": sum(o["replayed"] for o in baseline),
+            "vs_expected": accuracy(baseline),
+            "latency_ms": _stats([o["latency_ms"] for o in baseline]),
+            "total_tokens": _stats([o["total_tokens"] for o in baseline]),
+        },
+    }
+    if candidate is None:
+        report["mismatches"] = [
+            {"source": sources[i], "expected": expected[i], "baseline": baseline[i]["label"]}
+            for i in labelled if baseline[i]["label"] != expected[i]
+        ]
+        return report
+
+    report["candidate"] = {
+        "errors": sum("error" in o for o in candidate),
+        "replayed": sum(o["replayed"] for o in candidate),
+        "vs_expected": accuracy(candidate),
+        "latency_ms": _stats([o["latency_ms"] for o in candidate]),
+        "total_tokens": _stats([o["total_tokens"] for o in candidate]),
+    }
+    pairs = list(zip(baseline, candidate))
+    drift = [c["confidence"] - b["confidence"] for b, c in pairs
+             if isinstance(b["confidence"], int) and isinstance(c["confidence"], int)]
+    report.update({
+        "zone_agreement": sum((b["label"] or "")[:1] == (c["label"] or "")[:1] and b["label"] is not None
+                              for b, c in pairs),
+        "label_agreement": sum(b["label"] == c["label"] and b["label"] is not None for b, c in pairs),
+        "zone_matrix": confusion([((b["label"] or "")[:1] or None, (c["label"] or "")[:1] or None)
+                                  for b, c in pairs]),
+        "label_matrix": confusion([(b["label"], c["label"]) for b, c in pairs]),
+        "confidence_drift": {
+            "mean": round(statistics.fmean(drift), 1),
+            "mean_abs": round(statistics.fmean(abs(d) for d in drift), 1),
+            "max_abs": max(abs(d) for d in drift),
+        } if drift else None,
+        "latency_ms_delta": _delta(report["baseline"]["latency_ms"], report["candidate"]["latency_ms"]),
+        "total_tokens_delta": _delta(report["baseline"]["total_tokens"], report["candidate"]["total_tokens"]),
+        "flips": [
+            {"source": sources[i], "expected": expected[i], "baseline": b["label"], "candidate": c["label"],
+             "confidence": [b["confidence"], c["confidence"]]}
+            for i, (b, c) in enumerate(pairs) if b["label"] != c["label"]
+        ],
+    })
+    return report
+
+
+def _print_matrix(title: str, matrix: Dict[str, Dict[str, int]], rows: str, columns: str) -> None:
+    labels = sorted(set(matrix) | {c for cells in matrix.values() for c in cells})
+    corner = rows + "\\" + columns
+    width = max([len(corner)] + [len(label) for label in labels]) + 1
+    print(f"\n{title}")
+    print(f"{corner:<{width}}" + "".join(f"{label:>{width}}" for label in labels))
+    for row in labels:
+        cells = matrix.get(row, {})
+        print(f"{row:<{width}}" + "".join(f"{cells.get(c, 0) or '.':>{width}}" for c in labels))
+
+
+def _print_report(report: Dict[str, Any], baseline: str, candidate: Optional[str]) -> None:
+    def describe(name: str, spec: str, side: Dict[str, Any]) -> None:
+        latency, tokens = side["latency_ms"], side["total_tokens"]
+        print(f"{name}: {spec} ({side['replayed']} replayed, {side['errors']} errors; "
+              f"latency p50 {latency['p50'] if latency else '-'} ms; "
+              f"tokens mean {tokens['mean'] if tokens else '-'})")
+        if side["vs_expected"]:
+            acc = side["vs_expected"]
+            print(f"  vs labels: {acc['label_correct']}/{acc['labelled']} labels, "
+                  f"{acc['zone_correct']}/{acc['labelled']} zones")
+
+    print(f"{report['items']} items")
+    describe("baseline", baseline, report["baseline"])
+    if candidate is None:
+        if report["baseline"]["vs_expected"]:
+            _print_matrix("Labels vs baseline", report["baseline"]["vs_expected"]["matrix"], "label", "base")
+        for item in report["mismatches"]:
+            print(f"  {item['source']}: expected {item['expected']}, got {item['baseline']}")
+        return
+
+    describe("candidate", candidate, report["candidate"])
+    print(f"agreement: {report['zone_agreement']}/{report['items']} zones, "
+          f"{report['label_agreement']}/{report['items']} labels")
+    drift = report["confidence_drift"]
+    if drift:
+        print(f"confidence drift: mean {drift['mean']:+}, mean |d| {drift['mean_abs']}, max |d| {drift['max_abs']}")
+    for name in ("latency_ms_delta", "total_tokens_delta"):
+        if report[name] is not None:
+            print(f"{name.replace('_delta', '')} delta (mean): {report[name]:+}")
+    _print_matrix("Zone confusion", report["zone_matrix"], "base", "cand")
+    _print_matrix("Zone+subzone confusion", report["label_matrix"], "base", "cand")
+    for flip in report["flips"]:
+        print(f"  {flip['source']}: {flip['baseline']} -> {flip['candidate']}"
+              + (f" (expected {flip['expected']})" if flip["expected"] else ""))
+
+
+def run_replay(args: argparse.Namespace) -> int:
+    """Replay the corpus and print the comparison
+
+    Returns:
+        0 on success, 1 on unreadable input, failed items or too many flips
+    """
+    corpus = Path(args.corpus)
+    if not corpus.exists():
+        print(f"Corpus not found: {corpus}", file=sys.stderr)
+        return 1
+    baseline_spec = "deterministic" if args.deterministic else args.baseline
+    candidate_spec = None if args.deterministic else args.candidate
+
+    sources, items, expected = [], [], []
+    for source, item in _iter_inputs(corpus):
+        if not isinstance(item, dict):
+            print(f"{source}: not a JSON object ({item})", file=sys.stderr)
+            return 1
+        assessment, label = _expected(item)
+        sources.append(source)
+        items.append(assessment)
+        expected.append(label)
+
+    try:
+        bundles = [make_bundle(spec) for spec in filter(None, (baseline_spec, candidate_spec))]
+    except (ValueError, ConfigError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    # evaluate() leaves the scorer's results out of the database
+    store = None if args.deterministic else ResultsStore(args.db)
+    try:
+        outcomes = [evaluate(zoner, items, store, args.workers, replay=not args.no_cache) for zoner in bundles]
+    finally:
+        if store:
+            store.close()
+
+    report = compare(sources, expected, *outcomes)
+    _print_report(report, baseline_spec, candidate_spec)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"bundles": {"baseline": baseline_spec, "candidate": candidate_spec}, **report}, f, indent=2)
+
+    errors = sum(side["errors"] for side in (report["baseline"], report.get("candidate")) if side)
+    too_many_flips = args.max_flips is not None and len(report.get("flips", [])) > args.max_flips
+    return 1 if errors or too_many_flips else 0
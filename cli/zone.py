@@ -0,0 +1,270 @@
+"""Zone local assessment files without running the API server
+
+    python -m cli zone assessments/ -o results.jsonl --markdown-dir reports/
+    python -m cli zone portfolio.jsonl --mode deterministic --checkpoint zone.ckpt
+
+Items already zoned under the same prompt (or scorer) are served from the
+results database instead of being zoned again, and a checkpoint file of
+completed assessment hashes lets an interrupted run resume where it stopped.
+"""
+import argparse
+import concurrent.futures as cf
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, TextIO, Tuple
+
+from services.results_store import ResultsStore, build_record
+from utils.hashing import assessment_hash
+
+# Per-process zoner, created by _init_worker in each pool worker
+_zoner = None
+
+
+def add_parser(subparsers) -> None:
+    """Register the zone command"""
+    parser = subparsers.add_parser("zone", help="Zone a directory of JSON files or a JSONL file locally")
+    parser.add_argument("input", help="Directory of *.json assessments or a JSONL file")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL file (default: stdout)")
+    parser.add_argument("--markdown-dir", help="Also write one markdown report per brand here")
+    parser.add_argument("--mode", choices=("llm", "deterministic"), default="llm",
+                        help="Zone with the model or with the deterministic scorer (default: llm)")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel workers (default: 4)")
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread",
+                        help="Worker pool type (default: thread)")
+    parser.add_argument("--checkpoint", help="File of completed assessment hashes, used to resume")
+    parser.add_argument("--db", default=os.getenv("RESULTS_DB_PATH", "data/zonings.db"),
+                        help="Results database used as cache (default: $RESULTS_DB_PATH)")
+    parser.add_argument("--no-cache", action="store_true", help="Zone every item even if cached")
+    parser.set_defaults(func=run_zone)
+
+
+class _DeterministicZoner:
+    """Zoner backed by services.scoring (no model call)"""
+
+    def __init__(self):
+        from services.scoring import SCORER_HASH
+        self.prompt_hash = SCORER_HASH
+
+    def generate_zone_report(self, assessment: Dict[str, Any]) -> Dict[str, Any]:
+        from services.scoring import build_deterministic_report
+        result = build_deterministic_report(assessment)
+        result.pop("scores")
+        return result
+
+
+def _make_zoner(mode: str):
+    """Build the zoner for a mode: an OpenAIService or the deterministic scorer"""
+    if mode == "deterministic":
+        return _DeterministicZoner()
+    from config import Config
+    from services.openai_service import OpenAIService
+    return OpenAIService(Config())
+
+
+def _init_worker(mode: str) -> None:
+    """Pool initializer: build one zoner per worker process"""
+    global _zoner
+    _zoner = _make_zoner(mode)
+
+
+def _zone_one(assessment: Dict[str, Any]) -> Dict[str, Any]:
+    """Zone one assessment with this process's zoner"""
+    return _zoner.generate_zone_report(assessment)
+
+
+def _iter_inputs(path: Path) -> Iterator[Tuple[str, Any]]:
+    """Yield (source, assessment) pairs; unparsable entries yield the exception"""
+    if path.is_dir():
+        for file in sorted(path.glob("*.json")):
+            try:
+                yield file.name, json.loads(file.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                yield file.name, e
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield f"{path.name}:{number}", json.loads(line)
+                except ValueError as e:
+                    yield f"{path.name}:{number}", e
+
+
+def _count_inputs(path: Path) -> int:
+    """Number of items _iter_inputs will yield, without parsing them"""
+    if path.is_dir():
+        return sum(1 for _ in path.glob("*.json"))
+    with open(path, "rb") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def _load_checkpoint(path: Optional[str]) -> Set[str]:
+    """Read completed assessment hashes from a checkpoint file"""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def _slug(text: str) -> str:
+    """File-name-safe slug of a brand name"""
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower() or "unknown"
+
+
+class _Progress:
+    """Throughput and ETA reporting on stderr"""
+
+    def __init__(self, total: int, interval: float = 1.0):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.started = time.monotonic()
+        self._last = 0.0
+
+    def update(self, force: bool = False) -> None:
+        """Count one finished item and print progress at most once per interval"""
+        self.done += not force
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        elapsed = max(now - self.started, 1e-9)
+        rate = self.done / elapsed
+        remaining = (self.total - self.done) / rate if rate else float("inf")
+        eta = f"{remaining:.0f}s" if remaining != float("inf") else "?"
+        print(f"\r{self.done}/{self.total} done, {rate:.1f} items/s, ETA {eta}   ",
+              end="", file=sys.stderr, flush=True)
+
+
+def run_zone(args: argparse.Namespace) -> int:
+    """Zone every input assessment, writing JSONL results and markdown reports
+
+    Returns:
+        0 if every item succeeded, 1 if any failed, 130 if interrupted
+    """
+    source_path = Path(args.input)
+    if not source_path.exists():
+        print(f"Input not found: {source_path}", file=sys.stderr)
+        return 1
+
+    completed = _load_checkpoint(args.checkpoint)
+    zoner = _make_zoner(args.mode)
+    store = ResultsStore(args.db)
+    markdown_dir = Path(args.markdown_dir) if args.markdown_dir else None
+    if markdown_dir:
+        markdown_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.executor == "process":
+        pool: cf.Executor = cf.ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                                                   initargs=(args.mode,))
+    else:
+        global _zoner
+        _zoner = zoner
+        pool = cf.ThreadPoolExecutor(args.workers)
+
+    progress = _Progress(_count_inputs(source_path))
+    failed = skipped = cached = 0
+    # Append when resuming so earlier results are kept
+    mode = "a" if completed else "w"
+    out: TextIO = sys.stdout if args.output == "-" else open(args.output, mode, encoding="utf-8")
+    checkpoint = open(args.checkpoint, "a", encoding="utf-8") if args.checkpoint else None
+    brands_written: Dict[str, str] = {}
+
+    def emit(source: str, assessment: Dict[str, Any], digest: str,
+             result: Dict[str, Any], result_id: str, from_cache: bool) -> None:
+        out.write(json.dumps({
+            "source": source,
+            "brand": assessment.get("brand"),
+            "result_id": result_id,
+            "assessment_hash": digest,
+            "cached": from_cache,
+            "summary": result.get("summary", {}),
+            "metadata": result.get("metadata", {}),
+            "report_markdown": result.get("report_markdown", ""),
+        }, ensure_ascii=False) + "\n")
+        out.flush()
+        if markdown_dir:
+            slug = _slug(str(assessment.get("brand") or "unknown"))
+            # Several assessments of one brand keep separate files
+            if brands_written.setdefault(slug, digest) != digest:
+                slug = f"{slug}-{digest[:8]}"
+            (markdown_dir / f"{slug}.md").write_text(result.get("report_markdown", ""), encoding="utf-8")
+        if checkpoint:
+            checkpoint.write(digest + "\n")
+            checkpoint.flush()
+        completed.add(digest)
+
+    def fail(source: str, error: Any) -> None:
+        nonlocal failed
+        failed += 1
+        out.write(json.dumps({"source": source, "error": str(error)}, ensure_ascii=False) + "\n")
+        out.flush()
+
+    in_flight: Dict[cf.Future, Tuple[str, Dict[str, Any], str]] = {}
+    max_in_flight = max(1, args.workers) * 2
+
+    def drain(block_until: int) -> None:
+        """Collect finished futures until at most block_until remain in flight"""
+        while len(in_flight) > block_until:
+            done, _ = cf.wait(in_flight, return_when=cf.FIRST_COMPLETED)
+            for future in done:
+                source, assessment, digest = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    fail(source, e)
+                else:
+                    result_id = store.record(build_record(assessment, result))
+                    emit(source, assessment, digest, result, result_id, False)
+                progress.update()
+
+    try:
+        for source, assessment in _iter_inputs(source_path):
+            if not isinstance(assessment, dict):
+                fail(source, assessment if isinstance(assessment, Exception)
+                     else "Assessment must be a JSON object")
+                progress.update()
+                continue
+
+            digest = assessment_hash(assessment)
+            if digest in completed:
+                skipped += 1
+                progress.update()
+                continue
+
+            hit = None if args.no_cache else store.find_cached(digest, zoner.prompt_hash)
+            if hit:
+                cached += 1
+                emit(source, assessment, digest, {
+                    "summary": hit["summary"],
+                    "metadata": {"model": hit["model"], "prompt_hash": hit["prompt_hash"]},
+                    "report_markdown": hit["report_markdown"],
+                }, hit["id"], True)
+                progress.update()
+                continue
+
+            in_flight[pool.submit(_zone_one, assessment)] = (source, assessment, digest)
+            drain(max_in_flight - 1)
+        drain(0)
+    except KeyboardInterrupt:
+        for future in in_flight:
+            future.cancel()
+        print("\nInterrupted; rerun with the same --checkpoint to resume", file=sys.stderr)
+        return 130
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        store.close()
+        if checkpoint:
+            checkpoint.close()
+        if out is not sys.stdout:
+            out.close()
+
+    progress.update(force=True)
+    print(f"\nZoned {progress.done - failed - skipped - cached}, cached {cached}, "
+          f"skipped {skipped} (checkpoint), failed {failed}", file=sys.stderr)
+    return 1 if failed else 0
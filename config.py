@@ -15,8 +15,31 @@ class Config:
     """Application configuration loaded from environment variables"""
 
     def __init__(self):
-        # Required
-        self.openai_api_key = self._get_required("OPENAI_API_KEY")
+        # Model backend: "openai", or a self-hosted OpenAI-compatible server
+        # ("vllm", "llama.cpp"), with optional overrides of its profile
+        # (see services/backends.py)
+        self.backend = os.getenv("BACKEND", "openai").lower()
+        if self.backend not in ("openai", "vllm", "llama.cpp"):
+            raise ConfigError(
+                f"BACKEND must be 'openai', 'vllm' or 'llama.cpp', got '{self.backend}'"
+            )
+        self.backend_base_url = os.getenv("BACKEND_BASE_URL") or None
+        self.backend_developer_role = os.getenv("BACKEND_DEVELOPER_ROLE", "").lower() or None
+        if self.backend_developer_role not in (None, "developer", "system"):
+            raise ConfigError(
+                f"BACKEND_DEVELOPER_ROLE must be 'developer' or 'system', got '{self.backend_developer_role}'"
+            )
+        self.backend_max_concurrency = int(os.getenv("BACKEND_MAX_CONCURRENCY", "0"))
+        if self.backend_max_concurrency < 0:
+            raise ConfigError(
+                f"BACKEND_MAX_CONCURRENCY must be 0 (profile's limit) or more, got {self.backend_max_concurrency}"
+            )
+
+        # Required for the OpenAI API (self-hosted servers accept any key)
+        if self.backend == "openai" and not self.backend_base_url:
+            self.openai_api_key = self._get_required("OPENAI_API_KEY")
+        else:
+            self.openai_api_key = os.getenv("OPENAI_API_KEY") or None
 
         # Optional with defaults
         self.openai_model = os.getenv("OPENAI_MODEL", "gpt-4o")
@@ -25,13 +48,107 @@ class Config:
             "/app/rules/HEX-5112.md"
         )
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
+        self.log_format = os.getenv("LOG_FORMAT", "json")
+        self.log_sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
         self.cors_origins = self._parse_cors_origins()
 
+        # Client API keys beyond the legacy API_KEY (see services/api_keys.py)
+        self.api_keys_file = os.getenv("API_KEYS_FILE") or None
+
+        # Report generation: "full" (model writes the whole report) or
+        # "templated" (model writes only the prose; see services/report_builder.py)
+        self.report_mode = os.getenv("REPORT_MODE", "full").lower()
+        if self.report_mode not in ("full", "templated"):
+            raise ConfigError(
+                f"REPORT_MODE must be 'full' or 'templated', got '{self.report_mode}'"
+            )
+
+        # Assessment encoding in the user prompt: "json" or "compact"
+        # (question codes, legend in the system prompt)
+        self.prompt_encoding = os.getenv("PROMPT_ENCODING", "json").lower()
+        if self.prompt_encoding not in ("json", "compact"):
+            raise ConfigError(
+                f"PROMPT_ENCODING must be 'json' or 'compact', got '{self.prompt_encoding}'"
+            )
+
+        # Rules in the prompt: "full" (whole rules file in the system prompt)
+        # or "chunked" (only the sections an assessment needs, sent with it;
+        # see services/rules_index.py)
+        self.rules_mode = os.getenv("RULES_MODE", "full").lower()
+        if self.rules_mode not in ("full", "chunked"):
+            raise ConfigError(
+                f"RULES_MODE must be 'full' or 'chunked', got '{self.rules_mode}'"
+            )
+
         # OpenAI client settings
         self.openai_timeout = 30.0
         self.openai_max_retries = 3
         self.temperature = 0.1
 
+        # Results store settings
+        self.results_db_path = os.getenv("RESULTS_DB_PATH", "data/zonings.db")
+        self.results_batch_size = 50
+        self.results_flush_interval = 0.5
+
+        # Idempotency-Key support for POST /zone (kept in the results database):
+        # seconds a stored response is replayed, and seconds an unfinished
+        # claim blocks its key (covers a worker dying mid-request)
+        self.idempotency_ttl = float(os.getenv("IDEMPOTENCY_TTL", "86400"))
+        self.idempotency_lease = 300.0
+
+        # Size limits: request bodies (413 above this; for /zone/bulk it
+        # applies per line) and model-written reports
+        self.max_request_bytes = int(os.getenv("MAX_REQUEST_BYTES", "1000000"))
+        self.max_report_chars = int(os.getenv("MAX_REPORT_CHARS", "200000"))
+
+        # Bulk (NDJSON) processing settings
+        self.bulk_concurrency = int(os.getenv("BULK_CONCURRENCY", "4"))
+        self.bulk_max_line_bytes = self.max_request_bytes
+
+        # Largest /zone?votes=N (samples per model call)
+        self.max_votes = 7
+
+        # Upstream call scheduling: global concurrency budget shared by the
+        # interactive, job and batch lanes (batch concurrency adapts to latency)
+        self.scheduler_concurrency = int(os.getenv("SCHEDULER_CONCURRENCY", "8"))
+        if self.scheduler_concurrency < 1:
+            raise ConfigError(
+                f"SCHEDULER_CONCURRENCY must be at least 1, got {self.scheduler_concurrency}"
+            )
+        self.scheduler_queue_timeout = float(os.getenv("SCHEDULER_QUEUE_TIMEOUT", "60"))
+        self.scheduler_batch_queue_timeout = float(os.getenv("SCHEDULER_BATCH_QUEUE_TIMEOUT", "600"))
+        self.scheduler_latency_tolerance = 2.0
+
+        # Response compression (smaller complete bodies are sent as-is)
+        self.compression_min_size = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+        # Readiness (/readyz): saturation limits and background upstream check.
+        # Unset limits follow the scheduler budget (see app.readyz)
+        self.ready_max_in_flight = int(os.getenv("READY_MAX_IN_FLIGHT", "0")) or None
+        self.ready_max_queued = int(os.getenv("READY_MAX_QUEUED", "0")) or None
+        self.upstream_check_interval = float(os.getenv("UPSTREAM_CHECK_INTERVAL", "30"))
+        self.upstream_failure_threshold = 3
+
+        # Startup warm-up before /readyz reports ready: "off", "connect"
+        # (import the SDK, build the client, open a connection) or
+        # "completion" (also a one-token completion, which is billed)
+        self.warmup = os.getenv("WARMUP", "connect").lower()
+        if self.warmup not in ("off", "connect", "completion"):
+            raise ConfigError(
+                f"WARMUP must be 'off', 'connect' or 'completion', got '{self.warmup}'"
+            )
+
+        # Tracing (slow requests kept for /debug/trace, optionally exported)
+        self.trace_slow_ms = float(os.getenv("TRACE_SLOW_MS", "1000"))
+        self.trace_export_path = os.getenv("TRACE_EXPORT_PATH") or None
+        self.trace_buffer_size = 100
+        self.trace_max_spans = 500
+
+        # Sampling profiler (/debug/profile and the X-Profile header)
+        self.profile_interval = 0.005
+        self.profile_max_seconds = 60
+        self.profile_buffer_size = 20
+
         # Validation
         self.rules_file_exists = Path(self.system_rules_path).exists()
 
@@ -0,0 +1,310 @@
+"""API key registry with per-key limits
+
+Keys are held in memory keyed by the SHA-256 of the key. Authentication is
+one hash and one dict lookup whatever the number of keys, and the stored
+digest is then checked with a constant-time comparison. The registry file
+(API_KEYS_FILE) lists only digests, is re-read when its mtime changes
+(checked at most every reload_interval seconds), and a bad edit keeps the
+previous keys. The legacy single API_KEY variable still works as a key named
+"default" with no limits.
+
+Registry file format:
+
+    {"keys": [
+        {"name": "dashboard", "key_sha256": "<hex>", "priority": "interactive",
+         "rate_limit": "600/hour", "max_concurrent": 4, "daily_token_budget": 2000000},
+        {"name": "importer", "key_sha256": "<hex>", "priority": "batch", "max_concurrent": 2,
+         "weight": 2}
+    ]}
+
+weight is the key's relative share of upstream capacity within its
+scheduling lane (see services.scheduler); it defaults to 1.
+
+Usage counters (rate windows, in-flight calls, tokens spent today) are per
+worker process and keyed by name, so they survive reloads.
+"""
+import hashlib
+import hmac
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Scheduling classes, highest priority first
+PRIORITIES = ("interactive", "job", "batch")
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)\s*$")
+
+
+class APIKeyError(ValueError):
+    """Raised for an invalid registry file"""
+    pass
+
+
+class APIKey(NamedTuple):
+    """A registered client key (the key itself is never stored)"""
+    name: str
+    digest: str
+    priority: str = "interactive"
+    rate_limit: Optional[Tuple[int, int]] = None  # (requests, period seconds)
+    max_concurrent: Optional[int] = None
+    daily_token_budget: Optional[int] = None
+    weight: int = 1
+
+
+def key_digest(key: str) -> str:
+    """SHA-256 hex digest of an API key, as stored in the registry"""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def parse_rate(value: str) -> Tuple[int, int]:
+    """Parse "N/second|minute|hour|day" into (N, period seconds)"""
+    match = _RATE.match(value or "")
+    if not match:
+        raise APIKeyError(f"Invalid rate limit {value!r}; expected e.g. '600/hour'")
+    return int(match.group(1)), _PERIODS[match.group(2)]
+
+
+def _positive_int(entry: Dict[str, Any], field: str) -> Optional[int]:
+    value = entry.get(field)
+    if value is None:
+        return None
+    if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+        raise APIKeyError(f"Key {entry.get('name')!r}: {field} must be a positive integer")
+    return value
+
+
+def parse_registry(data: Any) -> Dict[str, APIKey]:
+    """Validate a registry document and index it by digest
+
+    Raises:
+        APIKeyError: If the document or any entry is invalid
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("keys"), list):
+        raise APIKeyError('Registry must be an object with a "keys" list')
+    keys: Dict[str, APIKey] = {}
+    names = set()
+    for entry in data["keys"]:
+        if not isinstance(entry, dict) or not isinstance(entry.get("name"), str) or not entry["name"]:
+            raise APIKeyError("Every key needs a name")
+        digest = str(entry.get("key_sha256", "")).lower()
+        if not re.fullmatch(r"[0-9a-f]{64}", digest):
+            raise APIKeyError(f"Key {entry['name']!r}: key_sha256 must be a SHA-256 hex digest")
+        priority = entry.get("priority", "interactive")
+        if priority not in PRIORITIES:
+            raise APIKeyError(f"Key {entry['name']!r}: priority must be one of {', '.join(PRIORITIES)}")
+        if entry["name"] == "default":
+            raise APIKeyError('Key name "default" is reserved for the API_KEY env var key')
+        if entry["name"] in names or digest in keys:
+            raise APIKeyError(f"Duplicate key {entry['name']!r}")
+        names.add(entry["name"])
+        keys[digest] = APIKey(
+            name=entry["name"],
+            digest=digest,
+            priority=priority,
+            rate_limit=parse_rate(entry["rate_limit"]) if entry.get("rate_limit") else None,
+            max_concurrent=_positive_int(entry, "max_concurrent"),
+            daily_token_budget=_positive_int(entry, "daily_token_budget"),
+            weight=_positive_int(entry, "weight") or 1,
+        )
+    return keys
+
+
+class _Usage:
+    """Per-key counters"""
+
+    __slots__ = ("tokens", "refilled", "in_flight", "spent", "day")
+
+    def __init__(self) -> None:
+        self.tokens: Optional[float] = None  # rate-limit bucket level
+        self.refilled = time.monotonic()
+        self.in_flight = 0
+        self.spent = 0
+        self.day = ""
+
+
+class KeyRegistry:
+    """In-memory API keys with hot reload and per-key limits"""
+
+    def __init__(self, path: Optional[str] = None, env_var: str = "API_KEY", reload_interval: float = 5.0):
+        """
+        Args:
+            path: Registry JSON file (None to use only the env var key)
+            env_var: Environment variable holding a legacy single key
+            reload_interval: Minimum seconds between checks for changes
+        """
+        self.path = path
+        self.env_var = env_var
+        self.reload_interval = reload_interval
+        self._keys: Dict[str, APIKey] = {}
+        self._file_keys: Dict[str, APIKey] = {}
+        self._mtime: Optional[float] = None
+        self._env_key: Optional[str] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._usage: Dict[str, _Usage] = {}
+        self.refresh(force=True)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def refresh(self, force: bool = False) -> None:
+        """Pick up changes to the registry file or env var
+
+        The file is only stat()ed, and the env var read, once per
+        reload_interval unless forced.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked < self.reload_interval:
+            return
+        with self._lock:
+            self._checked = now
+            env_key = os.environ.get(self.env_var) or None
+            changed = env_key != self._env_key
+            self._env_key = env_key
+            if self.path:
+                try:
+                    mtime = os.stat(self.path).st_mtime
+                except OSError:
+                    mtime = None
+                if mtime != self._mtime:
+                    self._mtime = mtime
+                    changed = self._load_file() or changed
+            if changed or force:
+                keys = dict(self._file_keys)
+                if env_key:
+                    digest = key_digest(env_key)
+                    keys.setdefault(digest, APIKey(name="default", digest=digest))
+                self._keys = keys
+
+    def _load_file(self) -> bool:
+        """Re-read the registry file; keep the previous keys if it is invalid"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                keys = parse_registry(json.load(f))
+        except FileNotFoundError:
+            logger.warning("API key registry %s not found", self.path)
+            keys = {}
+        except (OSError, ValueError) as e:
+            logger.error("Invalid API key registry %s, keeping previous keys: %s", self.path, e)
+            return False
+        self._file_keys = keys
+        logger.info("Loaded %d API key(s) from %s", len(keys), self.path)
+        return True
+
+    @property
+    def configured(self) -> bool:
+        """Whether any key is registered"""
+        self.refresh()
+        return bool(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ------------------------------------------------------------------
+    # Authentication and limits
+    # ------------------------------------------------------------------
+
+    def authenticate(self, presented: Optional[str]) -> Optional[APIKey]:
+        """Look up the key for a presented secret
+
+        Returns:
+            The APIKey, or None if the secret is not registered
+        """
+        if not presented:
+            return None
+        self.refresh()
+        digest = key_digest(presented)
+        key = self._keys.get(digest)
+        if key is None or not hmac.compare_digest(key.digest, digest):
+            return None
+        return key
+
+    def _usage_for(self, key: APIKey) -> _Usage:
+        usage = self._usage.get(key.name)
+        if usage is None:
+            usage = self._usage.setdefault(key.name, _Usage())
+        return usage
+
+    def allow_request(self, key: APIKey) -> Optional[float]:
+        """Consume one request from the key's rate limit
+
+        Returns:
+            None if allowed, otherwise seconds until a request is allowed
+        """
+        if key.rate_limit is None:
+            return None
+        limit, period = key.rate_limit
+        with self._lock:
+            usage = self._usage_for(key)
+            now = time.monotonic()
+            level = limit if usage.tokens is None else usage.tokens
+            level = min(limit, level + (now - usage.refilled) * limit / period)
+            usage.refilled = now
+            if level < 1:
+                usage.tokens = level
+                return (1 - level) * period / limit
+            usage.tokens = level - 1
+            return None
+
+    def acquire(self, key: APIKey) -> bool:
+        """Take one of the key's concurrent slots (False when all are in use)"""
+        with self._lock:
+            usage = self._usage_for(key)
+            if key.max_concurrent is not None and usage.in_flight >= key.max_concurrent:
+                return False
+            usage.in_flight += 1
+            return True
+
+    def release(self, key: APIKey) -> None:
+        """Return a slot taken by acquire"""
+        with self._lock:
+            usage = self._usage_for(key)
+            usage.in_flight = max(0, usage.in_flight - 1)
+
+    def _spent_today(self, usage: _Usage) -> int:
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if usage.day != today:
+            usage.day, usage.spent = today, 0
+        return usage.spent
+
+    def budget_remaining(self, key: APIKey) -> Optional[int]:
+        """Tokens left in today's (UTC) budget, or None if unlimited"""
+        if key.daily_token_budget is None:
+            return None
+        with self._lock:
+            return max(0, key.daily_token_budget - self._spent_today(self._usage_for(key)))
+
+    def record_tokens(self, key: APIKey, tokens: int) -> None:
+        """Charge model tokens to the key's daily budget"""
+        if tokens <= 0:
+            return
+        with self._lock:
+            usage = self._usage_for(key)
+            self._spent_today(usage)
+            usage.spent += tokens
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-key usage for /metrics"""
+        with self._lock:
+            keys = {key.name: key for key in self._keys.values()}
+            result = {}
+            for name, key in keys.items():
+                usage = self._usage.get(name) or _Usage()
+                result[name] = {
+                    "priority": key.priority,
+                    "in_flight": usage.in_flight,
+                    "max_concurrent": key.max_concurrent,
+                    "tokens_today": self._spent_today(usage) if name in self._usage else 0,
+                    "daily_token_budget": key.daily_token_budget,
+                }
+            return result
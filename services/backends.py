@@ -0,0 +1,122 @@
+"""Chat-completions backends: OpenAI or any OpenAI-compatible server
+
+A backend is a base URL plus a model profile: which model to ask for, how
+the developer prompt is sent, and how many calls the server takes at once.
+Local servers such as vLLM and llama.cpp speak the OpenAI API, but their
+chat templates usually know only system/user/assistant roles and accept a
+single leading system message, so their profiles fold the developer prompt
+into the system message.
+
+Each Backend keeps its own token and call counters (reported in /metrics)
+and, when the profile sets max_concurrency, its own concurrency limit on top
+of the scheduler's global budget.
+"""
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
+
+from config import Config
+
+
+@dataclass(frozen=True)
+class BackendProfile:
+    """Where model calls go and how messages are shaped for the server"""
+    name: str
+    model: str = ""
+    base_url: Optional[str] = None  # None: the OpenAI API
+    api_key: Optional[str] = None
+    developer_role: str = "developer"  # "system": merged into the system message
+    max_concurrency: Optional[int] = None  # None: only the scheduler's budget applies
+
+
+# Defaults per BACKEND; the model and API key, and any BACKEND_* overrides,
+# come from the configuration
+BACKEND_PROFILES: Dict[str, BackendProfile] = {
+    "openai": BackendProfile(name="openai"),
+    "vllm": BackendProfile(name="vllm", base_url="http://localhost:8000/v1", developer_role="system"),
+    "llama.cpp": BackendProfile(name="llama.cpp", base_url="http://localhost:8080/v1",
+                                developer_role="system", max_concurrency=1),
+}
+
+
+def load_sdk():
+    """The OpenAI SDK, imported on first use
+
+    Importing it, and building a client (which loads the HTTP transport), is
+    most of the worker's import time, so both wait for the first model call
+    or the startup warm-up (see OpenAIService.warm_up).
+    """
+    import openai
+    return openai
+
+
+def profile_from_config(config: Config) -> BackendProfile:
+    """The BACKEND profile with the configured overrides applied"""
+    overrides: Dict[str, Any] = {"model": config.openai_model, "api_key": config.openai_api_key}
+    if config.backend_base_url:
+        overrides["base_url"] = config.backend_base_url
+    if config.backend_developer_role:
+        overrides["developer_role"] = config.backend_developer_role
+    if config.backend_max_concurrency:
+        overrides["max_concurrency"] = config.backend_max_concurrency
+    return replace(BACKEND_PROFILES[config.backend], **overrides)
+
+
+class Backend:
+    """Client, message shaping, concurrency limit and token accounting for one profile"""
+
+    def __init__(self, profile: BackendProfile):
+        """
+        Args:
+            profile: Server and model to send calls to
+        """
+        self.profile = profile
+        self._client = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(profile.max_concurrency) if profile.max_concurrency else None
+        self._counters = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+    @property
+    def client(self):
+        """OpenAI SDK client for the profile's server, created on first use"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    # Local servers ignore the key, but the SDK requires one
+                    self._client = load_sdk().OpenAI(api_key=self.profile.api_key or "local",
+                                                     base_url=self.profile.base_url)
+        return self._client
+
+    def messages(self, system: str, developer: str, user: str) -> List[Dict[str, str]]:
+        """Chat messages for the profile's roles"""
+        if self.profile.developer_role == "system":
+            return [{"role": "system", "content": system + "\n\n" + developer},
+                    {"role": "user", "content": user}]
+        return [{"role": "system", "content": system},
+                {"role": "developer", "content": developer},
+                {"role": "user", "content": user}]
+
+    def slot(self):
+        """Hold one of the backend's concurrent calls (no-op without a limit)"""
+        return self._slots if self._slots is not None else nullcontext()
+
+    def record_usage(self, usage: Dict[str, int]) -> None:
+        """Add one call's token counts (see openai_service._extract_usage)"""
+        with self._lock:
+            self._counters["calls"] += 1
+            for name in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                self._counters[name] += usage.get(name, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Profile and token totals since start"""
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "name": self.profile.name,
+            "base_url": self.profile.base_url,
+            "model": self.profile.model,
+            "developer_role": self.profile.developer_role,
+            "max_concurrency": self.profile.max_concurrency,
+            **counters,
+        }
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Set, Tuple
+
+from services.openai_service import OpenAIServiceError
+from utils.logging_config import get_logger
+from utils.ndjson import NDJSONLineError, parse_line
+
+logger = get_logger(__name__)
+
+# Async callable turning one assessment into a result dict
+Handler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+async def _process_line(index: int, line: bytes, handler: Handler) -> Dict[str, Any]:
+    """Run one NDJSON line through the handler, mapping failures to error records"""
+    try:
+        assessment = parse_line(line)
+        result = await handler(assessment)
+        return {"index": index, **result}
+    except NDJSONLineError as e:
+        return {"index": index, "error": str(e), "status": 422}
+    except OpenAIServiceError as e:
+        return {"index": index, "error": f"OpenAI service unavailable: {e}", "status": 503}
+    except Exception as e:
+        logger.error("Bulk item %d failed: %s", index, e, exc_info=True)
+        return {"index": index, "error": "Internal server error", "status": 500}
+
+
+async def iter_bulk_results(lines: AsyncIterator[Tuple[int, bytes]], handler: Handler,
+                            concurrency: int) -> AsyncIterator[Dict[str, Any]]:
+    """Process NDJSON lines with bounded concurrency, yielding in completion order
+
+    At most `concurrency` items are in flight; the next input line is only
+    read once a slot frees up, so a fast uploader is throttled by TCP
+    backpressure instead of being buffered in memory.
+
+    Args:
+        lines: Async iterator of (index, line) pairs (see utils.ndjson.aiter_lines)
+        handler: Async callable producing the result dict for one assessment
+        concurrency: Maximum items processed at once
+
+    Yields:
+        Result dicts carrying the input "index", or an "error" and "status"
+    """
+    in_flight: Set["asyncio.Task[Dict[str, Any]]"] = set()
+    reader = lines.__aiter__()
+    next_line: "asyncio.Task[Tuple[int, bytes]] | None" = None
+    exhausted = False
+
+    try:
+        while True:
+            if next_line is None and not exhausted and len(in_flight) < concurrency:
+                next_line = asyncio.ensure_future(reader.__anext__())
+
+            waiting = set(in_flight)
+            if next_line is not None:
+                waiting.add(next_line)
+            if not waiting:
+                return
+
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                if task is next_line:
+                    next_line = None
+                    try:
+                        index, line = task.result()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        continue
+                    in_flight.add(asyncio.ensure_future(_process_line(index, line, handler)))
+                else:
+                    in_flight.discard(task)
+                    yield task.result()
+    finally:
+        # Client went away or the stream failed: stop outstanding work
+        pending = list(in_flight) + ([next_line] if next_line is not None else [])
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,159 @@
+"""Idempotency keys for model-calling requests
+
+A client that retries a POST /zone after a gateway timeout sends the same
+Idempotency-Key header again. The first request claims the key; once it
+succeeds its response is stored, and every replay within the TTL gets that
+response back without another model call.
+
+Keys live in a table of the results database, so all workers sharing the
+database see the same claims. A key is scoped to the API key that used it
+and bound to a hash of the request: reusing it with a different body is a
+conflict. A claim whose request fails is released so the client can retry,
+and a claim left behind by a crashed worker expires after lease seconds.
+"""
+import sqlite3
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    client TEXT NOT NULL,
+    key TEXT NOT NULL,
+    request_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    status_code INTEGER,
+    response BLOB,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (client, key)
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_expires ON idempotency_keys (expires_at);
+"""
+
+
+class Claim(NamedTuple):
+    """Outcome of claiming a key
+
+    state is "new" (the caller owns the key and must complete or release
+    it), "replay" (status_code and body hold the stored response),
+    "in_flight" (the first request is still running) or "conflict" (the key
+    was used with a different request).
+    """
+    state: str
+    status_code: Optional[int] = None
+    body: Optional[bytes] = None
+
+
+class IdempotencyStore:
+    """SQLite table of idempotency keys and their stored responses"""
+
+    def __init__(self, db_path: str, ttl: float = 86400.0, lease: float = 300.0,
+                 purge_interval: float = 60.0):
+        """Open (or create) the idempotency table
+
+        Args:
+            db_path: Path to the SQLite database file (shared with the results store)
+            ttl: Seconds a completed response is replayed
+            lease: Seconds an unfinished claim blocks the key
+            purge_interval: Minimum seconds between deletions of expired keys
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.lease = lease
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode (transactions are explicit)"""
+        conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def claim(self, client: str, key: str, request_hash: str) -> Claim:
+        """Claim a key for a request, or find what an earlier request left
+
+        Args:
+            client: Name of the API key making the request
+            key: Idempotency-Key header value
+            request_hash: Hash identifying the request (body and options)
+
+        Returns:
+            The Claim; only a "new" claim may go on to call the model
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front, so two workers cannot
+            # both see the key as free
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if now - self._last_purge >= self.purge_interval:
+                    self._last_purge = now
+                    conn.execute("DELETE FROM idempotency_keys WHERE expires_at <= ?", (now,))
+                row = conn.execute(
+                    "SELECT request_hash, status, status_code, response, expires_at "
+                    "FROM idempotency_keys WHERE client = ? AND key = ?",
+                    (client, key)
+                ).fetchone()
+                if row is not None and row[4] > now:
+                    stored_hash, status, status_code, response, _ = row
+                    conn.execute("COMMIT")
+                    if stored_hash != request_hash:
+                        return Claim("conflict")
+                    if status != "done":
+                        return Claim("in_flight")
+                    return Claim("replay", status_code, bytes(response))
+                conn.execute(
+                    "INSERT OR REPLACE INTO idempotency_keys "
+                    "(client, key, request_hash, status, created_at, expires_at) VALUES (?, ?, ?, 'in_flight', ?, ?)",
+                    (client, key, request_hash, now, now + self.lease)
+                )
+                conn.execute("COMMIT")
+                return Claim("new")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def complete(self, client: str, key: str, status_code: int, body: bytes) -> None:
+        """Store the response of a claimed key for replays within the TTL"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE idempotency_keys SET status = 'done', status_code = ?, response = ?, expires_at = ? "
+                "WHERE client = ? AND key = ?",
+                (status_code, body, now + self.ttl, client, key)
+            )
+        except sqlite3.Error as e:
+            # The response has been produced; a replay will just run again
+            logger.error("Failed to store idempotent response for key %s: %s", key, e)
+        finally:
+            conn.close()
+
+    def release(self, client: str, key: str) -> None:
+        """Drop an unfinished claim so the request can be retried"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "DELETE FROM idempotency_keys WHERE client = ? AND key = ? AND status = 'in_flight'",
+                (client, key)
+            )
+        except sqlite3.Error as e:
+            logger.error("Failed to release idempotency key %s: %s", key, e)
+        finally:
+            conn.close()
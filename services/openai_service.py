@@ -1,10 +1,21 @@
 import json
 import re
+import threading
 import time
-from typing import Any, Dict
-from openai import OpenAI, APITimeoutError, APIError
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
 from config import Config
+from services.backends import Backend, load_sdk, profile_from_config
+from services.prompt_encoding import build_legend, encode_compact
+from services.rules_index import RulesIndex
+from services.report_builder import TEMPLATED_OUTPUT_FORMAT, ReportBuilder, parse_prose, zone_overview
+from services.scheduler import Scheduler, SchedulerTimeout
+from services.scoring import score_assessment
+from services.validation_rules import ValidationTable, compile_validation_table
+from utils import codec
+from utils.hashing import sha256_hex
 from utils.logging_config import get_logger
+from utils.tracing import span, traced
 
 logger = get_logger(__name__)
 
@@ -14,6 +25,7 @@ class OpenAIServiceError(Exception):
     pass
 
 
+@traced()
 def _extract_summary(markdown: str) -> Dict[str, Any]:
     """Extract JSON summary from markdown code fence
 
@@ -33,109 +45,30 @@ def _extract_summary(markdown: str) -> Dict[str, Any]:
     return {}
 
 
-# Zone overview definitions (inserted verbatim into reports)
-ZONE_DEFINITIONS = {
-    "1": """## Zone 1: Fully Masterbranded
+def _extract_usage(response: Any) -> Dict[str, int]:
+    """Extract token usage counts from a chat completion response
 
-### Overview
-
-Zone 1 represents complete alignment with Hexagon.
-Offerings carry no separate logo, colour, or name identity, they are wholly Hexagon.
-
-Zone 1 applies to brands, products, and services that are fully absorbed into the Hexagon masterbrand. These entities no longer carry a separate identity and are represented exclusively using the Hexagon visual system.
-
-This is the most integrated form of brand alignment and the default destination for many newly launched or fully transitioned offerings.
-
-### Visual Identity Principles
-
-- Use only the Hexagon logo.
-- Follow Hexagon typography, colour palette, and layout.
-- Use descriptive names (e.g., "Hexagon Atlas")
-""",
-    "3A": """## Zone 3A: Endorsed by Hexagon (Business Unit Lockups)
-
-### Overview
-
-Zone 3A applies to legacy or business unit brands endorsed by Hexagon.
-The endorsed logo remains but is redrawn in Hexagon Sky Dark Blue and paired in a formal lockup.
-
-### Visual Identity Principles
-
-- Approved lockup: Hexagon logo above or beside endorsed logo with divider.
-- Endorsed logo scaled to 70% of Hexagon size.
-- Original colours retired.
-""",
-    "3B": """## Zone 3B: Sub-brands
-
-### Overview
-
-Zone 3B applies to internal or external initiatives, platforms, and programs that require a distinctive name but not a standalone logo.
-
-### Principles
-
-- Sub-brand names appear in text only.
-- Always accompanied by the Hexagon logo.
-- Use Hexagon typography and colour palette.
-""",
-    "3C": """## Zone 3C: Integrated Products and Solutions
-
-### Overview
-
-Zone 3C covers products, services, and solutions fully integrated within Hexagon.
-They use unified naming and badge systems, never independent logos.
-
-### Badge System
-
-- Marketing Badge: For campaigns and web.
-- Application Badge: For software UI or icons.
-- Colours follow Hexagon's Land, Sea, Sky families.
-
-### Attribution Levels
-
-1. Portfolio/Platform: Text only.
-2. Suite/Solution: Text only.
-3. Product: Badge assigned.
-4. Embedded: Hexagon logo only.
-""",
-    "4": """## Zones 4 & 5: Independent and Transitional Brands
-
-### Overview
-
-Zones 4 and 5 cover brands operating outside Hexagon's visual system due to strategic, legal, or market reasons.
-
-### Zone 4 – Independent Brands
-
-- Remain visually separate.
-- Use their own logos and colours.
-- Carry no Hexagon attribution.
-
-### Zone 5 – Transitional Brands
-
-- Newly acquired or incubating brands.
-- Retain their identity temporarily.
-- Evaluated for migration to Zones 1–3.
-""",
-    "5": """## Zones 4 & 5: Independent and Transitional Brands
-
-### Overview
-
-Zones 4 and 5 cover brands operating outside Hexagon's visual system due to strategic, legal, or market reasons.
-
-### Zone 4 – Independent Brands
+    Args:
+        response: Chat completion response object
 
-- Remain visually separate.
-- Use their own logos and colours.
-- Carry no Hexagon attribution.
+    Returns:
+        Dict with prompt/completion/total token counts (missing counts omitted)
+    """
+    usage = getattr(response, "usage", None)
+    counts = {}
+    for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        value = getattr(usage, field, None)
+        if isinstance(value, int):
+            counts[field] = value
+    return counts
 
-### Zone 5 – Transitional Brands
 
-- Newly acquired or incubating brands.
-- Retain their identity temporarily.
-- Evaluated for migration to Zones 1–3.
-"""
-}
+# Where _inject_zone_overview places the zone definition
+_SECTION_START = re.compile(r"\n\n(?:\*\*SCORING BREAKDOWN\*\*|\*\*.*Assessment.*\*\*|##\s+)")
+_CONFIDENCE_BLOCK = re.compile(r"Confidence:.*?\n(?:[-•]\s+.*\n)+", re.DOTALL)
 
 
+@traced()
 def _inject_zone_overview(markdown: str, zone: str, subzone: str = "") -> str:
     """Inject zone overview definition into markdown after confidence block
 
@@ -147,156 +80,97 @@ def _inject_zone_overview(markdown: str, zone: str, subzone: str = "") -> str:
     Returns:
         Markdown with zone overview injected
     """
-    # Build zone key
-    zone_key = f"{zone}{subzone}" if zone == "3" and subzone else zone
-
-    # Get definition
-    definition = ZONE_DEFINITIONS.get(zone_key, "")
+    # Pre-rendered definition (see services.report_builder)
+    definition = zone_overview(zone, subzone)
     if not definition:
-        logger.warning(f"No zone definition found for zone {zone}{subzone}")
+        logger.warning("No zone definition found for zone %s%s", zone, subzone)
         return markdown
 
-    # Find insertion point: after confidence block, before next section
-    # Look for patterns like "**SCORING BREAKDOWN**" or other section headers
-    pattern = r"(\n\n)(\*\*SCORING BREAKDOWN\*\*|\*\*.*Assessment.*\*\*|##\s+)"
-    match = re.search(pattern, markdown)
-
+    # Insert before the first section after the confidence block (e.g.
+    # "**SCORING BREAKDOWN**"), else after the confidence bullets. The matched
+    # text is first found at the match position, so a single str.replace
+    # builds the result in one allocation without slicing the report.
+    match = _SECTION_START.search(markdown)
+    if match:
+        logger.debug("Zone overview injected for Zone %s%s", zone, subzone)
+        return markdown.replace(match.group(0), "\n\n" + definition + "\n" + match.group(0), 1)
+    match = _CONFIDENCE_BLOCK.search(markdown)
     if match:
-        # Insert before the matched section
-        insert_pos = match.start()
-        modified = markdown[:insert_pos] + "\n\n" + definition.strip() + "\n" + markdown[insert_pos:]
-        logger.info(f"Zone overview injected for Zone {zone}{subzone}")
-        return modified
-    else:
-        # Fallback: append after first major section (after confidence)
-        # Look for the end of confidence block (after the bullet points)
-        confidence_pattern = r"(Confidence:.*?\n(?:[-•]\s+.*\n)+)"
-        match = re.search(confidence_pattern, markdown, re.DOTALL)
-        if match:
-            insert_pos = match.end()
-            modified = markdown[:insert_pos] + "\n" + definition.strip() + "\n\n" + markdown[insert_pos:]
-            logger.info(f"Zone overview injected for Zone {zone}{subzone} (fallback position)")
-            return modified
+        logger.debug("Zone overview injected for Zone %s%s (fallback position)", zone, subzone)
+        return markdown.replace(match.group(0), match.group(0) + "\n" + definition + "\n\n", 1)
 
     logger.warning("Could not find insertion point for zone overview")
     return markdown
 
 
-def _validate_zone_assignment(assessment: Dict[str, Any], summary: Dict[str, Any], brand_name: str) -> None:
-    """Validate zone assignment against assessment data and log warnings
+@traced()
+def _validate_zone_assignment(table: ValidationTable, assessment: Dict[str, Any],
+                              summary: Dict[str, Any], brand_name: str) -> Dict[str, Any]:
+    """Check the zone assignment against the assessment answers
 
     Args:
+        table: Compiled validation rules (services.validation_rules)
         assessment: Brand architecture assessment data
         summary: Parsed summary from AI response
         brand_name: Brand name for logging
-    """
-    zone = summary.get("zone", "")
-    subzone = summary.get("subzone", "")
-
-    # Check Zone 5 gating condition
-    zone5_data = assessment.get("zone5", {})
-    if zone5_data.get("active_restriction_preventing_hex"):
-        if zone != "5":
-            logger.error(f"❌ [{brand_name}] Z5 Q1 gating condition (legal restriction) present but assigned Zone {zone}")
-
-    # Check Zone 4 triggers
-    zone4_data = assessment.get("zone4", {})
-    z4_triggers = [
-        ("hex_branding_reduces_trust", "Q2: Hex branding reduces trust"),
-        ("hex_link_creates_risk", "Q3: Hex link creates risk"),
-        ("stakeholders_object_elimination", "Q8: Stakeholders object to elimination"),
-        ("rebrand_invalidates_contracts", "Q9: Contracts would be invalidated")
-    ]
-
-    z4_trigger_count = sum(1 for key, _ in z4_triggers if zone4_data.get(key))
-    if z4_trigger_count > 0 and zone != "4":
-        triggered = [desc for key, desc in z4_triggers if zone4_data.get(key)]
-        logger.warning(f"⚠️ [{brand_name}] {z4_trigger_count} Zone 4 trigger(s) present but assigned Zone {zone}: {', '.join(triggered)}")
-
-    # Check Zone 3A indicators vs assignment
-    if zone == "3":
-        zone3_data = assessment.get("zone3", {})
-        z3_confidence = zone3_data.get("z3_confidence_fallback", {})
-
-        z3a_indicators = {
-            "removal_causes_attrition": "Q8a: Removal causes attrition",
-            "removal_risk_in_key_markets": "Removal risk in key markets",
-            "transition_complexity_gt12mo": "Q8b: Complex transition >12mo"
-        }
-
-        z3a_score = sum(1 for key in z3a_indicators if zone3_data.get(key))
-
-        # Additional Z3A indicators from confidence section
-        if z3_confidence.get("generates_demand_via_own_equity"):
-            z3a_score += 1
-        if zone3_data.get("higher_awareness_than_hex"):
-            z3a_score += 1
-
-        # Zone 1 revenue indicator
-        zone1_data = assessment.get("zone1", {})
-        if zone1_data.get("pct_of_division_revenue") == "20-70":
-            z3a_score += 1
-
-        if subzone == "A" and z3a_score < 2:
-            logger.warning(f"⚠️ [{brand_name}] Zone 3A assigned but only {z3a_score} strong Z3A indicators found")
-        elif subzone == "B" and z3a_score >= 3:
-            logger.warning(f"⚠️ [{brand_name}] Zone 3B assigned but {z3a_score} Z3A indicators present (may warrant 3A)")
-        elif subzone == "C" and zone3_data.get("independent_marketing_budget"):
-            logger.warning(f"⚠️ [{brand_name}] Zone 3C assigned but brand has independent marketing budget (usually Z3A/3B)")
-
-    # Check Zone 1 indicators
-    if zone == "1":
-        zone1_data = assessment.get("zone1", {})
-        if zone1_data.get("pct_of_division_revenue") in ["20-70", "> 70"]:
-            logger.warning(f"⚠️ [{brand_name}] Zone 1 assigned but revenue contribution is {zone1_data.get('pct_of_division_revenue')} (usually Z3A or Z2B)")
-
-    logger.info(f"✅ [{brand_name}] Validation complete: Zone {zone}{subzone or ''}")
 
+    Returns:
+        Validation block: status, rules_hash and findings
+    """
+    validation = table.validate(assessment, summary)
+    if validation["findings"]:
+        logger.debug("[%s] Validation %s: %s", brand_name, validation["status"],
+                     ", ".join(finding["rule"] for finding in validation["findings"]))
+    return validation
 
-class OpenAIService:
-    """Service for interacting with OpenAI API"""
 
-    MACHINE_JSON_SCHEMA = {
-        "type": "object",
-        "additionalProperties": False,
-        "properties": {
-            "brand": {"type": "string"},
-            "zone": {"type": "string", "enum": ["1", "3", "4", "5"]},
-            "zone_name": {"type": "string", "enum": [
-                "Full Masterbrand Integration", "Endorsed Brand",
-                "High-Stakes Independence", "Legal/Accounting/Integration Hold"
-            ]},
-            "subzone": {"type": "string"},
-            "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
-            "drivers": {"type": "array", "items": {"type": "string"}},
-            "conflicts": {"type": "array", "items": {"type": "string"}},
-            "risks": {"type": "array", "items": {"type": "string"}},
-            "next_steps": {"type": "array", "items": {"type": "string"}}
-        },
-        "required": ["brand", "zone", "zone_name", "subzone", "confidence",
-                     "drivers", "conflicts", "risks", "next_steps"]
-    }
+def _tally_votes(summaries: List[Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+    """Pick the majority zone/subzone among sampled report summaries
 
-    def __init__(self, config: Config):
-        """Initialize OpenAI service
+    Samples without a zone do not vote. Ties go to the label whose samples
+    are more confident on average. The vote's own confidence is the winning
+    samples' mean confidence scaled by their share of all samples, so a
+    3-of-5 majority at 80% reports 48%. It is only reported in the vote
+    metadata: the summary stays the winning sample's, matching its report.
 
-        Args:
-            config: Application configuration
-        """
-        self.config = config
-        self.client = OpenAI(api_key=config.openai_api_key)
+    Args:
+        summaries: Parsed summary of each sample
 
-        # Build system prompt with rules
-        rules_text = config.load_rules_text()
-        self.system_prompt = f"""You are a strict brand-architecture adjudicator.
-Apply these rules verbatim. If the rules file is present, it overrides ambiguities.
+    Returns:
+        (index of the sample whose report is used, vote metadata)
+    """
+    ballots: Dict[str, List[int]] = {}
+    for index, summary in enumerate(summaries):
+        zone = str(summary.get("zone") or "")
+        if zone:
+            label = zone + (str(summary.get("subzone") or "").upper() if zone == "3" else "")
+            ballots.setdefault(label, []).append(index)
+
+    def confidence(index: int) -> float:
+        value = summaries[index].get("confidence")
+        return value if isinstance(value, (int, float)) else 0
+
+    if not ballots:
+        return 0, {"samples": len(summaries), "tally": {}, "agreement": 0.0, "model_confidence": None}
+
+    def strength(label: str) -> Tuple[int, float]:
+        voters = ballots[label]
+        return len(voters), sum(map(confidence, voters)) / len(voters)
+
+    winner = max(ballots, key=strength)
+    voters = ballots[winner]
+    mean_confidence = strength(winner)[1]
+    return max(voters, key=confidence), {
+        "samples": len(summaries),
+        "tally": {label: len(indices) for label, indices in sorted(ballots.items())},
+        "agreement": round(len(voters) / len(summaries), 2),
+        "model_confidence": round(mean_confidence),
+        "confidence": round(mean_confidence * len(voters) / len(summaries)),
+    }
 
-=== RULES FILE (if provided) ===
-{rules_text}
-=== END RULES FILE ===
-"""
 
-        self.developer_prompt = """You MUST output, in order:
+# Output layout for model-written reports (REPORT_MODE=full)
+_OUTPUT_FORMAT = """You MUST output, in order:
 1) H1 line: "# Zone X[Subzone] — [Zone Name] (Recommended)" (e.g., "# Zone 3A — Endorsed Brand Architecture (Recommended)")
 2) **CONCLUSION:** ...
 3) Confidence block with numeric score format (see below)
@@ -352,7 +226,10 @@ Zone 3 Sub-zones:
 
 Winner Margin: 14 points ahead of Zone 1
 
-Precedence Rules (CRITICAL - Follow Exactly):
+"""
+
+# Zone adjudication rules, shared by both report modes
+ADJUDICATION_RULES = """Precedence Rules (CRITICAL - Follow Exactly):
 
 STEP 1 - Check GATING conditions (immediate assignment):
 - Z5 Q1: Legal/compliance restriction = Yes → FORCE Zone 5 (stop evaluation)
@@ -453,34 +330,280 @@ Conflict Resolution (0-30): Consistency of signals (inverse of conflicts)
 - 5-14: Significant conflicts
 - 0-4: Highly contradictory
 
-ALWAYS show numeric breakdown. If thin data, label as "Provisional" but still provide N/100 score.
+"""
+
+_FORMATTING = """ALWAYS show numeric breakdown. If thin data, label as "Provisional" but still provide N/100 score.
 
 Formatting:
 - Anchors: zone-recommendation, conclusion, confidence, zone-assessment, strategy, risks, next-steps, summary-json.
 - ≤120 words per section; bullets OK; no extra sections.
 - Cite evidence with (Q#) or (Not provided in assessment)."""
 
-    def generate_zone_report(self, assessment: Dict[str, Any]) -> Dict[str, Any]:
+
+class OpenAIService:
+    """Service for interacting with OpenAI API"""
+
+    MACHINE_JSON_SCHEMA = {
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {
+            "brand": {"type": "string"},
+            "zone": {"type": "string", "enum": ["1", "3", "4", "5"]},
+            "zone_name": {"type": "string", "enum": [
+                "Full Masterbrand Integration", "Endorsed Brand",
+                "High-Stakes Independence", "Legal/Accounting/Integration Hold"
+            ]},
+            "subzone": {"type": "string"},
+            "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
+            "drivers": {"type": "array", "items": {"type": "string"}},
+            "conflicts": {"type": "array", "items": {"type": "string"}},
+            "risks": {"type": "array", "items": {"type": "string"}},
+            "next_steps": {"type": "array", "items": {"type": "string"}}
+        },
+        "required": ["brand", "zone", "zone_name", "subzone", "confidence",
+                     "drivers", "conflicts", "risks", "next_steps"]
+    }
+
+    def __init__(self, config: Config, scheduler: Optional[Scheduler] = None,
+                 backend: Optional[Backend] = None):
+        """Initialize OpenAI service
+
+        Args:
+            config: Application configuration
+            scheduler: Shared upstream concurrency budget (None for unlimited)
+            backend: Server to send model calls to (default: built from the
+                BACKEND settings)
+        """
+        self.config = config
+        self.scheduler = scheduler
+        self.backend = backend or Backend(profile_from_config(config))
+
+        # Model calls currently waiting on the API (read by /readyz)
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+        # Build system prompt with rules
+        rules_text = config.load_rules_text()
+        self.rules_hash = sha256_hex(rules_text) if rules_text else None
+        self.validation_table = compile_validation_table(rules_text)
+        # In chunked mode each request carries only the rules sections its
+        # assessment needs, after the static prompts (which stay cacheable)
+        self.rules_index = RulesIndex(rules_text) if config.rules_mode == "chunked" and rules_text else None
+        if self.rules_index is None:
+            self.system_prompt = f"""You are a strict brand-architecture adjudicator.
+Apply these rules verbatim. If the rules file is present, it overrides ambiguities.
+
+=== RULES FILE (if provided) ===
+{rules_text}
+=== END RULES FILE ===
+"""
+        else:
+            self.system_prompt = """You are a strict brand-architecture adjudicator.
+Apply these rules verbatim. If the rules file is present, it overrides ambiguities.
+
+The sections of the rules file that apply to an assessment are sent with it,
+between === RULES FILE SECTIONS === markers.
+"""
+
+        # In templated mode the model writes only the evidence-specific prose
+        # and the rest of the report is assembled locally
+        self.report_mode = config.report_mode
+        self.report_builder = ReportBuilder()
+        if self.report_mode == "templated":
+            self.developer_prompt = ADJUDICATION_RULES + TEMPLATED_OUTPUT_FORMAT
+        else:
+            self.developer_prompt = _OUTPUT_FORMAT + ADJUDICATION_RULES + _FORMATTING
+
+        # The compact encoding's legend is static, so it sits in the system
+        # prompt where it is part of the cached prefix
+        if config.prompt_encoding == "compact":
+            self.system_prompt += "\n\n" + build_legend()
+
+        # Identifies the prompt bundle a stored result was produced with
+        bundle = self.system_prompt + "\n" + self.developer_prompt
+        if self.rules_index is not None:
+            bundle += "\nRULES_MODE=chunked " + self.rules_hash
+        self.prompt_hash = sha256_hex(bundle)
+
+    @property
+    def _response_options(self) -> Dict[str, Any]:
+        """Extra chat completion arguments for the report mode"""
+        if self.report_mode == "templated":
+            return {"response_format": {"type": "json_object"}}
+        return {}
+
+    @property
+    def client(self):
+        """SDK client of the backend, created on first use"""
+        return self.backend.client
+
+    def _slot(self):
+        """Scheduler slot for one API attempt (no-op without a scheduler)"""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of model calls currently in progress"""
+        return self._in_flight
+
+    def check_upstream(self, timeout: float = 5.0) -> None:
+        """Make one cheap, unretried API request to confirm the API is reachable
+
+        Retrieves the configured model's metadata (no tokens are used).
+        Client errors such as 404 still prove reachability and are ignored.
+
+        Raises:
+            OpenAIServiceError: If the API cannot be reached or answers with a 5xx
+        """
+        try:
+            self.client.with_options(timeout=timeout, max_retries=0).models.retrieve(self.backend.profile.model)
+        except load_sdk().APIStatusError as e:
+            if e.status_code >= 500:
+                raise OpenAIServiceError(f"OpenAI API returned {e.status_code}") from e
+        except load_sdk().APIConnectionError as e:  # includes timeouts
+            raise OpenAIServiceError(f"OpenAI API unreachable: {e}") from e
+
+    def warm_up(self, completion: bool = False, timeout: float = 10.0) -> None:
+        """Get ready for the first request: import the SDK, build the client
+        and open a pooled connection to the API (TLS handshake included)
+
+        Args:
+            completion: Also request a one-token completion from the
+                configured model (billed, but warms the model route too)
+            timeout: Seconds allowed per request
+
+        Raises:
+            OpenAIServiceError: If the API cannot be reached or the
+                completion fails
+        """
+        self.check_upstream(timeout)
+        if completion:
+            try:
+                self.client.with_options(timeout=timeout, max_retries=0).chat.completions.create(
+                    model=self.backend.profile.model,
+                    messages=[{"role": "user", "content": "ping"}],
+                    max_tokens=1
+                )
+            except load_sdk().APIError as e:
+                raise OpenAIServiceError(f"Warm-up completion failed: {e}") from e
+
+    @traced("generate_zone_report")
+    def generate_zone_report(self, assessment: Dict[str, Any], votes: int = 1) -> Dict[str, Any]:
         """Generate zone recommendation report from assessment
 
         Args:
             assessment: Brand architecture assessment data
+            votes: Number of samples to draw in one call (n); with more than
+                one, the majority zone/subzone wins (see _tally_votes)
 
         Returns:
-            Dict with 'report_markdown' and 'summary' keys
+            Dict with 'report_markdown', 'summary', 'metadata' (model,
+            prompt_hash, latency_ms, token usage and, when voting, the
+            vote tally) and 'validation' (consistency findings) keys
 
         Raises:
             OpenAIServiceError: If API call fails after retries
         """
         # Extract brand name for logging
         brand_name = assessment.get("brand", "Unknown")
-        logger.info(f"Zone request for brand: {brand_name}")
+        logger.info("Zone request for brand: %s", brand_name)
+
+        return self._request_report(assessment, self.user_message(assessment), votes)
+
+    def user_message(self, assessment: Dict[str, Any]) -> str:
+        """User message of a zoning request: rules sections (chunked mode) and the assessment"""
+        rules = self._rules_sections(assessment)
+        with span("serialize_assessment", encoding=self.config.prompt_encoding):
+            label, encoded = self._encode_assessment(assessment)
+            return "".join((
+                rules, "ASSESSMENT ", label, ":\n", encoded,
+                "\n\nFollow all formatting + precedence rules exactly."
+            ))
+
+    @traced("revise_zone_report")
+    def revise_zone_report(self, assessment: Dict[str, Any], previous_report: str,
+                           changed_answers: List[str]) -> Dict[str, Any]:
+        """Regenerate a report after some answers changed, using the previous report as context
+
+        Args:
+            assessment: Updated brand architecture assessment data
+            previous_report: Markdown report produced for the previous version
+            changed_answers: Human-readable descriptions of the changed answers
+
+        Returns:
+            Same shape as generate_zone_report
+
+        Raises:
+            OpenAIServiceError: If API call fails after retries
+        """
+        brand_name = assessment.get("brand", "Unknown")
+        logger.info("Revision request for brand: %s (%d changed answer(s))", brand_name, len(changed_answers))
+
+        changes = "\n".join(f"- {change}" for change in changed_answers) or "- (no scored answers changed)"
+        label, encoded = self._encode_assessment(assessment)
+        # One join: chained + would copy the previous report once per operator
+        user_msg = "".join((
+            self._rules_sections(assessment),
+            "PREVIOUS REPORT:\n", previous_report,
+            "\n\nCHANGED ANSWERS:\n", changes,
+            "\n\nUPDATED ASSESSMENT ", label, ":\n", encoded,
+            "\n\nUpdate the previous report for the changed answers. Keep unaffected sections "
+            "unless the changes alter them. Follow all formatting + precedence rules exactly."
+        ))
+        return self._request_report(assessment, user_msg)
+
+    def _rules_sections(self, assessment: Dict[str, Any]) -> str:
+        """Rules sections sent with an assessment in chunked mode ("" otherwise)"""
+        if self.rules_index is None:
+            return ""
+        with span("select_rules") as current:
+            text, ids = self.rules_index.select(assessment)
+            current.set_attribute("rules.sections", len(ids))
+        logger.debug("Sending %d of %d rules sections", len(ids), len(self.rules_index))
+        return "".join(("=== RULES FILE SECTIONS ===\n", text, "\n=== END RULES FILE SECTIONS ===\n\n"))
+
+    def _encode_assessment(self, assessment: Dict[str, Any]) -> Tuple[str, str]:
+        """Render the assessment for the user message
 
-        user_msg = (
-            "ASSESSMENT JSON:\n" +
-            json.dumps(assessment, ensure_ascii=False, indent=2) +
-            "\n\nFollow all formatting + precedence rules exactly."
-        )
+        Returns:
+            (label, text): "JSON" with compact, key-sorted JSON (identical text
+            for identical assessments), or "(COMPACT)" with the question-code
+            encoding described by the legend in the system prompt
+        """
+        if self.config.prompt_encoding == "compact":
+            return "(COMPACT)", encode_compact(assessment)
+        return "JSON", codec.dumps_canonical(assessment)
+
+    def _render(self, assessment: Dict[str, Any], content: str) -> Tuple[str, Dict[str, Any]]:
+        """Turn one model output into (markdown, summary) for the report mode"""
+        if self.report_mode == "templated":
+            with span("assemble_report"):
+                return self.report_builder.assemble(
+                    assessment, parse_prose(content), score_assessment(assessment)
+                )
+        # Inject zone overview definition into markdown (templated reports
+        # already include it)
+        summary = _extract_summary(content)
+        markdown = _inject_zone_overview(content, summary.get("zone", "unknown"), summary.get("subzone", ""))
+        return markdown, summary
+
+    def _request_report(self, assessment: Dict[str, Any], user_msg: str, votes: int = 1) -> Dict[str, Any]:
+        """Call the model with retries and post-process the report
+
+        Args:
+            assessment: Assessment the report is about (for validation/logging)
+            user_msg: User message to send after the system and developer prompts
+            votes: Samples to request (the API's n parameter)
+
+        Returns:
+            Dict with 'report_markdown', 'summary', 'metadata' and 'validation' keys
+
+        Raises:
+            OpenAIServiceError: If API call fails after retries
+        """
+        brand_name = assessment.get("brand", "Unknown")
 
         # Track response time
         start_time = time.time()
@@ -488,26 +611,52 @@ Formatting:
         # Retry logic
         for attempt in range(self.config.openai_max_retries):
             try:
-                logger.info(f"Calling OpenAI API (attempt {attempt + 1}/{self.config.openai_max_retries})")
+                logger.info("Calling OpenAI API (attempt %d/%d)", attempt + 1, self.config.openai_max_retries,
+                            extra={"attempt": attempt + 1})
 
                 # Debug logging - show what's being sent (only in DEBUG mode)
-                logger.debug(f"System prompt length: {len(self.system_prompt)} chars")
-                logger.debug(f"Developer prompt length: {len(self.developer_prompt)} chars")
-                logger.debug(f"Assessment JSON length: {len(user_msg)} chars")
-                logger.debug(f"Model: {self.config.openai_model}, Temperature: {self.config.temperature}")
-
-                response = self.client.chat.completions.create(
-                    model=self.config.openai_model,
-                    messages=[
-                        {"role": "system", "content": self.system_prompt},
-                        {"role": "developer", "content": self.developer_prompt},
-                        {"role": "user", "content": user_msg},
-                    ],
-                    temperature=self.config.temperature
-                )
-
-                markdown = response.choices[0].message.content
-                summary = _extract_summary(markdown)
+                logger.debug("System prompt length: %d chars", len(self.system_prompt))
+                logger.debug("Developer prompt length: %d chars", len(self.developer_prompt))
+                logger.debug("Assessment JSON length: %d chars", len(user_msg))
+                logger.debug("Model: %s, Temperature: %s", self.config.openai_model, self.config.temperature)
+
+                # Each attempt holds a scheduler slot, and a backend slot when
+                # the server has a concurrency limit, only while the request
+                # is in flight, so backoff sleeps leave them to other calls
+                profile = self.backend.profile
+                with self._slot(), self.backend.slot(), span("openai.chat_completion", attempt=attempt + 1,
+                                                             model=profile.model, backend=profile.name):
+                    with self._in_flight_lock:
+                        self._in_flight += 1
+                    try:
+                        response = self.client.chat.completions.create(
+                            model=profile.model,
+                            messages=self.backend.messages(self.system_prompt, self.developer_prompt, user_msg),
+                            temperature=self.config.temperature,
+                            **self._response_options,
+                            **({"n": votes} if votes > 1 else {})
+                        )
+                    finally:
+                        with self._in_flight_lock:
+                            self._in_flight -= 1
+
+                contents = [choice.message.content or "" for choice in response.choices]
+                oversized = max(map(len, contents), default=0)
+                if oversized > self.config.max_report_chars:
+                    # Not retried: the same prompt would produce a similar report
+                    raise OpenAIServiceError(
+                        f"Model report of {oversized} characters exceeds MAX_REPORT_CHARS "
+                        f"({self.config.max_report_chars})"
+                    )
+                samples = [self._render(assessment, content) for content in contents]
+                vote = None
+                if len(samples) > 1:
+                    winner, vote = _tally_votes([summary for _, summary in samples])
+                    # The summary keeps the sample's own confidence, so it
+                    # agrees with the report's confidence block and JSON
+                    markdown, summary = samples[winner]
+                else:
+                    markdown, summary = samples[0]
 
                 # Calculate response time
                 response_time = time.time() - start_time
@@ -518,29 +667,47 @@ Formatting:
                 subzone = summary.get("subzone", "")
                 confidence = summary.get("confidence", 0)
 
-                # Inject zone overview definition into markdown
-                markdown = _inject_zone_overview(markdown, zone, subzone)
-
-                logger.info(f"OpenAI response received in {response_time:.2f}s")
-                logger.info(f"Recommended zone: {zone} ({zone_name}) with {confidence}% confidence")
-                logger.info("Successfully generated zone report")
+                usage = _extract_usage(response)
+                self.backend.record_usage(usage)
+                latency_ms = int(response_time * 1000)
+                logger.info(
+                    "OpenAI response received in %.2fs: Zone %s%s (%s) with %s%% confidence",
+                    response_time, zone, subzone, zone_name, confidence,
+                    extra={"zone": zone, "subzone": subzone, "confidence": confidence,
+                           "latency_ms": latency_ms, **usage}
+                )
 
                 # Validate zone assignment against assessment data
-                _validate_zone_assignment(assessment, summary, brand_name)
+                validation = _validate_zone_assignment(self.validation_table, assessment, summary, brand_name)
 
+                metadata = {
+                    "model": self.config.openai_model,
+                    "prompt_hash": self.prompt_hash,
+                    "latency_ms": latency_ms,
+                    "usage": usage
+                }
+                if vote is not None:
+                    metadata["votes"] = vote
+                    logger.info("Vote over %d samples: %s (agreement %.0f%%)", vote["samples"],
+                                vote["tally"], vote["agreement"] * 100)
                 return {
                     "report_markdown": markdown,
-                    "summary": summary
+                    "summary": summary,
+                    "metadata": metadata,
+                    "validation": validation
                 }
 
-            except (APITimeoutError, APIError) as e:
-                logger.warning(f"OpenAI API error (attempt {attempt + 1}): {e}")
+            except SchedulerTimeout as e:
+                raise OpenAIServiceError(str(e))
+            except load_sdk().APIError as e:  # includes timeouts
+                logger.warning("OpenAI API error (attempt %d): %s", attempt + 1, e, extra={"attempt": attempt + 1})
 
                 if attempt < self.config.openai_max_retries - 1:
                     # Exponential backoff
                     sleep_time = 2 ** attempt
-                    logger.info(f"Retrying in {sleep_time}s...")
-                    time.sleep(sleep_time)
+                    logger.info("Retrying in %ds...", sleep_time)
+                    with span("openai.backoff", seconds=sleep_time):
+                        time.sleep(sleep_time)
                 else:
                     raise OpenAIServiceError(
                         f"OpenAI API call failed after {self.config.openai_max_retries} attempts: {e}"
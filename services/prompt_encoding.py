@@ -0,0 +1,172 @@
+"""Compact assessment encoding for the user prompt
+
+Instead of the assessment JSON, the model receives answers keyed by their
+rules-file question codes:
+
+    brand: NovAtel
+    division: Autonomy & Positioning
+    YES: Z4Q7 Z3Q8b Z3FQ26
+    VALUES: Z4Q1=50-70 Z4Q12=6-12 Z1Q1=20-70
+    MISSING: Z3Q20
+
+Yes/no questions answered "no" are omitted (the default), so a typical
+assessment shrinks to a few lines. The legend mapping codes to questions is
+static and goes in the system prompt, where it is part of the cacheable
+prefix. Keys the catalog does not know are passed through as compact JSON
+under OTHER, so the encoding loses nothing (see decode_compact).
+"""
+import copy
+from typing import Any, Dict, List, Tuple
+
+from services.question_catalog import BOOLEAN, QUESTIONS, QUESTIONS_BY_CODE, get_answer
+from utils import codec
+
+# Top-level scalar fields written as "key: value" header lines
+HEADER_FIELDS = ("brand", "division", "contact", "date_completed")
+
+
+def build_legend() -> str:
+    """Legend explaining the compact encoding, for the system prompt"""
+    lines = [
+        "=== COMPACT ASSESSMENT ENCODING ===",
+        "Assessments arrive as lines keyed by question code (e.g. Z1Q3 = Zone 1 question 3):",
+        "- 'YES:' lists yes/no questions answered Yes.",
+        "- Yes/no questions not listed under YES or MISSING were answered No.",
+        "- 'VALUES:' gives CODE=answer for bracketed questions (and any non-yes/no answer).",
+        "- 'MISSING:' lists questions with no answer (treat as 'Not provided in assessment').",
+        "- 'OTHER:' carries any additional fields as JSON.",
+        "Cite evidence with these codes.",
+        "",
+        "Code | Question | Answers",
+    ]
+    for q in QUESTIONS:
+        answers = "yes/no" if q.domain == BOOLEAN else " / ".join(str(d) for d in q.domain)
+        lines.append(f"{q.code} | {q.label} | {answers}")
+    lines.append("=== END COMPACT ASSESSMENT ENCODING ===")
+    return "\n".join(lines)
+
+
+def _residual(assessment: Dict[str, Any]) -> Dict[str, Any]:
+    """Parts of the assessment not covered by the catalog or header lines"""
+    rest = copy.deepcopy(assessment)
+    for field in HEADER_FIELDS:
+        if isinstance(rest.get(field), (str, int, float)) and not isinstance(rest.get(field), bool):
+            rest.pop(field)
+    for q in QUESTIONS:
+        node = rest
+        for part in q.section:
+            node = node.get(part) if isinstance(node, dict) else None
+        if isinstance(node, dict) and q.key in node:
+            answer = node[q.key]
+            # Only answers representable on the YES/VALUES/MISSING lines are removed
+            if answer is None or isinstance(answer, (bool, str, int, float)):
+                del node[q.key]
+
+    def prune(node: Any) -> Any:
+        if isinstance(node, dict):
+            pruned = {k: prune(v) for k, v in node.items()}
+            return {k: v for k, v in pruned.items() if v != {} or not isinstance(node[k], dict)}
+        return node
+
+    return prune(rest)
+
+
+def encode_compact(assessment: Dict[str, Any]) -> str:
+    """Encode an assessment in the compact question-code format
+
+    Args:
+        assessment: Brand architecture assessment data
+
+    Returns:
+        Multi-line compact encoding (see module docstring)
+    """
+    lines: List[str] = []
+    for field in HEADER_FIELDS:
+        value = assessment.get(field)
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            lines.append(f"{field}: {value}")
+
+    yes: List[str] = []
+    values: List[str] = []
+    missing: List[str] = []
+    for q in QUESTIONS:
+        answer = get_answer(assessment, q)
+        if answer is None:
+            missing.append(q.code)
+        elif q.domain == BOOLEAN and isinstance(answer, bool):
+            if answer:
+                yes.append(q.code)
+        elif isinstance(answer, (str, int, float)):
+            values.append(f"{q.code}={answer}")
+
+    lines.append("YES: " + (" ".join(yes) or "-"))
+    if values:
+        lines.append("VALUES: " + " ".join(values))
+    if missing:
+        lines.append("MISSING: " + " ".join(missing))
+    other = _residual(assessment)
+    if other:
+        lines.append("OTHER: " + codec.dumps_canonical(other))
+    return "\n".join(lines)
+
+
+def _set(target: Dict[str, Any], path: Tuple[str, ...], value: Any) -> None:
+    for part in path[:-1]:
+        target = target.setdefault(part, {})
+    target[path[-1]] = value
+
+
+def decode_compact(text: str) -> Dict[str, Any]:
+    """Rebuild the scored content of an assessment from its compact encoding
+
+    Used to check that the encoding preserves everything the scorer (and so
+    the model) needs. Yes/no questions not listed are decoded as No; answers
+    listed as MISSING are left out.
+
+    Args:
+        text: Output of encode_compact
+
+    Returns:
+        Assessment dict
+    """
+    assessment: Dict[str, Any] = {}
+    yes: List[str] = []
+    values: Dict[str, str] = {}
+    missing: List[str] = []
+
+    for line in text.splitlines():
+        key, _, rest = line.partition(": ")
+        if key == "YES":
+            yes = [code for code in rest.split() if code != "-"]
+        elif key == "VALUES":
+            for item in rest.split(" "):
+                code, _, value = item.partition("=")
+                if code in QUESTIONS_BY_CODE:
+                    values[code] = value
+                elif values:
+                    # Bracket values may contain spaces ("> 70")
+                    last = next(reversed(values))
+                    values[last] += " " + item
+        elif key == "MISSING":
+            missing = rest.split()
+        elif key == "OTHER":
+            _merge(assessment, codec.loads(rest))
+        elif key in HEADER_FIELDS:
+            assessment[key] = rest
+
+    for q in QUESTIONS:
+        if q.code in missing:
+            continue
+        if q.code in values:
+            _set(assessment, q.path, values[q.code])
+        elif q.domain == BOOLEAN:
+            _set(assessment, q.path, q.code in yes)
+    return assessment
+
+
+def _merge(target: Dict[str, Any], extra: Dict[str, Any]) -> None:
+    for key, value in extra.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
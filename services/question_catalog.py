@@ -0,0 +1,252 @@
+"""Question catalog for the brand architecture assessment
+
+Maps every assessment key (as submitted by the assessment form, see
+samples/novatel_assessment.json) to its question code in the HEX 5112 rules
+file, its answer domain and its scoring. Point values follow the developer
+prompt's Quick Scoring Reference where it covers a question and the rules
+file otherwise; form questions whose wording predates the v009 rules are
+scored by their closest v009 counterpart.
+
+Scoring targets are main zones ("1", "3", "4", "5") and Zone 3 sub-zones
+("3A", "3B", "3C"). Sub-zone points from Zone 3 questions are listed
+alongside the main Zone 3 points they also earn; the Z3 confidence fallback
+tier (rules STEP 5) only scores sub-zones.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Question(NamedTuple):
+    """One assessment question"""
+    code: str                                   # Rules file code, e.g. "Z4Q1"
+    section: Tuple[str, ...]                    # Path to the containing dict, e.g. ("zone3",)
+    key: str                                    # Answer key within the section
+    label: str                                  # Short human-readable description
+    domain: Tuple[Any, ...]                     # Allowed answers (booleans or bracket values)
+    scoring: Dict[Any, Dict[str, int]]          # Answer -> {target: points}
+    gate: Optional[str] = None                  # Zone forced when the answer is True
+
+    @property
+    def path(self) -> Tuple[str, ...]:
+        """Full key path from the assessment root"""
+        return self.section + (self.key,)
+
+    @property
+    def is_bracket(self) -> bool:
+        """True for bracketed (multiple choice) questions"""
+        return self.domain != BOOLEAN
+
+
+BOOLEAN = (True, False)
+
+Z4 = ("zone4",)
+Z5 = ("zone5",)
+Z1 = ("zone1",)
+Z3 = ("zone3",)
+Z3F = ("zone3", "z3_confidence_fallback")
+
+
+QUESTIONS: Tuple[Question, ...] = (
+    # STEP 1: Zone 4 (High-Stakes Independence)
+    Question("Z4Q1", Z4, "unaided_awareness_3plus_regions", "Unaided awareness across 3+ regions",
+             (">70", "50-70", "30-49", "<30", "unknown"),
+             {">70": {"4": 2}, "50-70": {"3": 2}, "30-49": {"3": 1}, "<30": {"1": 3}, "unknown": {"1": 3}}),
+    Question("Z4Q2", Z4, "hex_branding_reduces_trust", "Hex branding reduces trust", BOOLEAN,
+             {True: {"4": 2}}),
+    Question("Z4Q3", Z4, "hex_link_creates_risk", "Hex link creates risk", BOOLEAN,
+             {True: {"4": 3}}),
+    Question("Z4Q4", Z4, "direct_competition_no_resolution", "Unresolved competition with Hexagon offers", BOOLEAN,
+             {True: {"4": 2}, False: {"3": 1}}),
+    Question("Z4Q5", Z4, "legal_forbids_hex_branding", "Acquisition agreement forbids Hex branding", BOOLEAN,
+             {}, gate="4"),
+    Question("Z4Q6", Z4, "restricted_by_law", "Export/sanctions restriction", BOOLEAN,
+             {}, gate="4"),
+    Question("Z4Q7", Z4, "vision_mission_incompatible", "Values incompatible with Hexagon", BOOLEAN,
+             {True: {"4": 2}}),
+    Question("Z4Q8", Z4, "stakeholders_object_elimination", "Stakeholders object to elimination", BOOLEAN,
+             {}, gate="4"),
+    Question("Z4Q9", Z4, "rebrand_invalidates_contracts", "Contracts would be invalidated", BOOLEAN,
+             {}, gate="4"),
+    Question("Z4Q10", Z4, "top2_and_hex_endorsement_weakens", "Top 2 in category, endorsement weakens", BOOLEAN,
+             {True: {"4": 2}, False: {"3": 2, "3A": 2}}),
+    Question("Z4Q11", Z4, "tm_dispute_key_markets", "Trademark dispute in key markets", BOOLEAN,
+             {True: {"4": 3}}),
+    Question("Z4Q12", Z4, "name_change_lockup_months", "Name-change lock-up period",
+             ("none", "<6", "6-12", "12+"),
+             {"<6": {"1": 2}, "6-12": {"3": 2}, "12+": {"5": 3}}),
+    Question("Z4Q13", Z4, "contracts_require_distinct_branding", "Contracts require distinct branding", BOOLEAN,
+             {True: {"4": 2}}),
+    Question("Z4Q14", Z4, "active_litigation_ip", "Active litigation or IP dispute", BOOLEAN,
+             {True: {"4": 2}, False: {"1": 2, "3": 2}}),
+
+    # STEP 2: Zone 5 (Legal / Accounting / Integration Hold)
+    Question("Z5Q1", Z5, "active_restriction_preventing_hex", "Legal restriction prevents Hex adoption", BOOLEAN,
+             {}, gate="5"),
+    Question("Z5Q2", Z5, "integration_roadmap_12mo", "Approved 12-month integration roadmap", BOOLEAN,
+             {True: {"1": 1, "3": 1}, False: {"5": 3}}),
+    Question("Z5Q3", Z5, "planned_divestiture_12mo", "Planned divestiture within 12 months", BOOLEAN,
+             {True: {"5": 3}, False: {"1": 1, "3": 1}}),
+    Question("Z5Q4", Z5, "adopt_hex_identity_12mo", "Adopts Hex identity within 12 months", BOOLEAN,
+             {True: {"1": 2, "3": 2}, False: {"5": 3}}),
+    Question("Z5Q5", Z5, "pilot_or_poc_stage", "Pilot / proof-of-concept stage", BOOLEAN,
+             {True: {"5": 2}}),
+    Question("Z5Q6", Z5, "approved_time_bound_separation_12mo", "Approved time-bound separation", BOOLEAN,
+             {True: {"5": 3}, False: {"1": 1, "3": 1}}),
+    Question("Z5Q7", Z5, "active_legal_constraints", "Active legal constraint on Hex identity", BOOLEAN,
+             {}, gate="5"),
+    Question("Z5Q8", Z5, "independent_systems_outside_hex", "Operates independent systems", BOOLEAN,
+             {True: {"4": 2}, False: {"5": 3}}),
+    Question("Z5Q9", Z5, "yoy_revenue_growth", "Year-over-year revenue growth",
+             (">15", "flat", "declining"),
+             {">15": {"3": 2}, "flat": {"5": 3}, "declining": {"1": 2}}),
+
+    # STEP 3: Zone 1 (Full Masterbrand Integration)
+    Question("Z1Q1", Z1, "pct_of_division_revenue", "Share of division revenue",
+             ("<20", "20-70", "> 70"),
+             {"<20": {"1": 3}, "20-70": {"3": 2, "3A": 2}}),
+    Question("Z1Q2", Z1, "embedding_mode", "Embedding in Hexagon solutions",
+             ("exclusively_embedded", "partially_embedded", "standalone"),
+             {"exclusively_embedded": {"1": 3}, "partially_embedded": {"3": 2, "1": 1}, "standalone": {"3": 2}}),
+    Question("Z1Q2B", Z1, "customers_recognize_separately_if_embedded", "Recognized separately when embedded", BOOLEAN,
+             {True: {"3": 2, "3B": 2}, False: {"1": 1}}),
+    Question("Z1Q3", Z1, "listed_public_or_internal", "Public listing of the brand",
+             ("public", "limited_legacy", "internal", "none"),
+             {"public": {"3": 2}, "limited_legacy": {"1": 1}, "internal": {"1": 2}, "none": {"1": 2}}),
+    Question("Z1Q4", Z1, "logo_visually_retired", "Logo visually retired", BOOLEAN,
+             {True: {"1": 2}}),
+    Question("Z1Q5", Z1, "customer_confusion_evidence", "Evidence of customer confusion", BOOLEAN,
+             {True: {"1": -1}}),
+    Question("Z1Q6", Z1, "internal_feature_only", "Internal feature only", BOOLEAN,
+             {True: {"1": 2}}),
+    Question("Z1Q7", Z1, "appeared_in_lt25pct_campaigns", "In fewer than 25% of campaigns", BOOLEAN,
+             {True: {"1": 1}}),
+    Question("Z1Q8", Z1, "transition_requires_minimal_comms", "Transition needs minimal comms", BOOLEAN,
+             {True: {"1": 2}}),
+    Question("Z1Q9", Z1, "lacks_digital_presence", "No standalone digital presence", BOOLEAN,
+             {True: {"1": 2}}),
+    Question("Z1Q10", Z1, "name_hard_to_localize", "Name hard to localize", BOOLEAN,
+             {True: {"1": 1}}),
+    Question("Z1Q11", Z1, "primarily_internal_audience", "Primarily internal audience", BOOLEAN,
+             {True: {"1": 2}}),
+    Question("Z1Q12", Z1, "customers_can_use_hex_naming_only", "Customers can use Hex naming only", BOOLEAN,
+             {True: {"1": 2}}),
+    Question("Z1Q13", Z1, "inactive_gt12mo", "Inactive for more than 12 months", BOOLEAN,
+             {True: {"1": 2}}),
+    Question("Z1Q14", Z1, "removing_brand_strengthens_clarity", "Removing brand strengthens clarity", BOOLEAN,
+             {True: {"1": 2}}),
+
+    # STEP 4: Zone 3 (Endorsed Brand Architecture)
+    Question("Z3Q1", Z3, "unaided_awareness_ge20", "Unaided awareness of 20% or more", BOOLEAN,
+             {True: {"3": 2}}),
+    Question("Z3Q2", Z3, "higher_awareness_than_hex", "Higher awareness than Hexagon", BOOLEAN,
+             {True: {"3": 2}}),
+    Question("Z3Q3", Z3, "removal_causes_attrition", "Removal causes attrition", BOOLEAN,
+             {True: {"3": 2, "3A": 2, "3B": 2}}),
+    Question("Z3Q4", Z3, "distinct_customer_base", "Distinct customer base", BOOLEAN,
+             {True: {"3": 2, "3A": 2, "3B": 2}}),
+    Question("Z3Q5", Z3, "expected_to_grow_platform", "Expected to grow as a platform", BOOLEAN,
+             {True: {"3": 2, "3B": 2}}),
+    Question("Z3Q6", Z3, "strong_loyalty_nps", "Strong loyalty / NPS", BOOLEAN,
+             {True: {"3": 2, "3B": 2, "3C": 2}}),
+    Question("Z3Q7", Z3, "recognized_heritage", "Recognized heritage", BOOLEAN,
+             {True: {"3": 2, "3A": 2}}),
+    Question("Z3Q8a", Z3, "removal_risk_in_key_markets", "Removal creates risk in key markets", BOOLEAN,
+             {True: {"3": 2, "3A": 2, "3B": 2}, False: {"1": 1}}),
+    Question("Z3Q8b", Z3, "transition_complexity_gt12mo", "Transition takes more than 12 months", BOOLEAN,
+             {True: {"3": 1, "3A": 1}, False: {"3": 2, "3B": 2}}),
+    Question("Z3Q9", Z3, "expected_multi_division_platform", "Expected multi-division platform", BOOLEAN,
+             {True: {"3": 2, "3B": 2}}),
+    Question("Z3Q10", Z3, "independent_marketing_budget", "Independent marketing budget", BOOLEAN,
+             {True: {"3": 2, "3A": 2}, False: {"3": 2, "3C": 2}}),
+    Question("Z3Q11", Z3, "long_term_plan_to_sunset", "Long-term plan to sunset", BOOLEAN,
+             {True: {"3": 2, "3C": 2}}),
+    Question("Z3Q12", Z3, "dual_logo_confusion", "Dual-logo lockup would confuse", BOOLEAN,
+             {True: {"3": 2, "3C": 2}}),
+    Question("Z3Q13", Z3, "equity_tied_founder_region", "Equity tied to founder or region", BOOLEAN,
+             {True: {"3": 2, "3A": 2}}),
+    Question("Z3Q14", Z3, "hex_visual_reduces_trust", "Hex visual identity reduces trust", BOOLEAN,
+             {True: {"3": 2, "3A": 2}, False: {"3": 2, "3B": 2}}),
+    Question("Z3Q15", Z3, "equity_transferable_18mo", "Equity transferable within 18 months", BOOLEAN,
+             {True: {"3": 2, "3B": 1, "3C": 2}}),
+    Question("Z3Q16", Z3, "public_materials_multi_geo", "Public materials across geographies", BOOLEAN,
+             {True: {"3": 1, "3A": 1}}),
+    Question("Z3Q17", Z3, "non_conforming_visuals", "Non-conforming visual identity", BOOLEAN,
+             {True: {"3": 2, "3C": 2}}),
+    Question("Z3Q18", Z3, "execution_implies_parity", "Execution implies parity with Hexagon", BOOLEAN,
+             {True: {"3": 2, "3C": 2}}),
+    Question("Z3Q19", Z3, "visual_alignment_improves_clarity", "Visual alignment improves clarity", BOOLEAN,
+             {True: {"3": 2, "3A": 2, "3B": 2, "3C": 2}}),
+    Question("Z3Q20", Z3, "partners_resist_hex_branding", "Partners resist visible Hex branding", BOOLEAN,
+             {True: {"3": 2, "3A": 2}, False: {"1": 3}}),
+
+    # STEP 5: Z3 confidence fallback tier (sub-zone resolution only)
+    Question("Z3FQ20", Z3F, "always_associated_with_hex", "Always sold with Hexagon solutions", BOOLEAN,
+             {True: {"3C": 2}}),
+    Question("Z3FQ21", Z3F, "strong_advocates", "Strong internal advocates", BOOLEAN,
+             {True: {"3A": 1, "3B": 1}}),
+    Question("Z3FQ22", Z3F, "jv_oem_ip_requires_identity", "JV/OEM/IP agreement needs identity", BOOLEAN,
+             {True: {"3A": 2, "3B": 2}, False: {"3C": 2}}),
+    Question("Z3FQ23", Z3F, "indirect_sales_access_via_brand", "Brand drives indirect sales access", BOOLEAN,
+             {True: {"3C": 2}}),
+    Question("Z3FQ24", Z3F, "removal_regulatory_partner_concerns", "Removal raises regulatory/partner concerns", BOOLEAN,
+             {True: {"3B": 2}}),
+    Question("Z3FQ25", Z3F, "visually_retired_persists", "Visually retired but persists", BOOLEAN,
+             {True: {"3C": 1}}),
+    Question("Z3FQ26", Z3F, "could_integrate_min_disruption", "Could integrate with minimal disruption", BOOLEAN,
+             {True: {"3C": 2}, False: {"3A": 2, "3B": 2}}),
+    Question("Z3FQ27", Z3F, "legacy_logo_retained_indefinitely", "Legacy logo retained indefinitely", BOOLEAN,
+             {True: {"3A": 2}}),
+    Question("Z3FQ29", Z3F, "post_acq_clause_allows_continued_use", "Post-acquisition clause allows use", BOOLEAN,
+             {True: {"3A": 2, "3B": 2}}),
+    Question("Z3FQ30a", Z3F, "generates_demand_via_own_equity", "Generates demand via own equity", BOOLEAN,
+             {True: {"3A": 3}, False: {"3C": 2}}),
+    Question("Z3FQ31", Z3F, "acquired_for_credibility_access", "Acquired for credibility or access", BOOLEAN,
+             {True: {"3A": 2}}),
+    Question("Z3FQ32", Z3F, "roadmap_pct_brand_led", "Share of roadmap tied to the brand",
+             ("75+", "40-74", "<40"),
+             {"75+": {"3B": 2}, "40-74": {"3B": 1}}),
+    Question("Z3FQ33", Z3F, "dedicated_leadership_budget", "Dedicated leadership and budget", BOOLEAN,
+             {True: {"3B": 2}}),
+    Question("Z3FQ34", Z3F, "awareness_40pct_3yrs_2regions", "40%+ awareness for 3+ years in 2+ regions", BOOLEAN,
+             {True: {"3A": 2}}),
+    Question("Z3FQ35", Z3F, "awareness_declined_one_region", "Awareness declined or single-region", BOOLEAN,
+             {True: {"3B": 2}}),
+    Question("Z3FQ37", Z3F, "analysts_media_refer_independently", "Analysts/media cite the brand alone", BOOLEAN,
+             {True: {"3A": 2}, False: {"3B": 1}}),
+)
+
+# Lookups built once at import
+QUESTIONS_BY_CODE: Dict[str, Question] = {q.code: q for q in QUESTIONS}
+QUESTIONS_BY_PATH: Dict[Tuple[str, ...], Question] = {q.path: q for q in QUESTIONS}
+
+
+def get_answer(assessment: Dict[str, Any], question: Question) -> Any:
+    """Return the answer to a question, or None if it is missing
+
+    Args:
+        assessment: Brand architecture assessment data
+        question: Question to look up
+
+    Returns:
+        The stored answer, or None when any level of the path is absent
+    """
+    node: Any = assessment
+    for part in question.path:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(part)
+        if node is None:
+            return None
+    return node
+
+
+def changed_questions(old: Dict[str, Any], new: Dict[str, Any]) -> List[Question]:
+    """Questions whose answers differ between two versions of an assessment
+
+    Args:
+        old: Previous assessment
+        new: Updated assessment
+
+    Returns:
+        Changed questions in catalog order (added and removed answers count)
+    """
+    return [q for q in QUESTIONS if get_answer(old, q) != get_answer(new, q)]
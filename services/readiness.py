@@ -0,0 +1,194 @@
+"""Readiness state for load-balancer probes
+
+Anything that needs I/O (the upstream API check) runs on a background thread
+and is cached, so /readyz only reads in-memory counters and never blocks.
+Readiness fails while the startup warm-up is still running, when the worker
+is saturated (every scheduler slot busy, model calls queued in the
+interactive or job lanes or too many queued overall, requests queued for the
+threadpool, the results write queue nearly full), when the rules file is
+missing, or when the upstream API has failed several consecutive checks.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class UpstreamMonitor:
+    """Periodically run a reachability check and cache the outcome
+
+    The cached state works like a circuit breaker's: "unknown" until the
+    first check, "closed" while checks pass, and "open" once
+    failure_threshold consecutive checks have failed.
+    """
+
+    def __init__(self, check: Callable[[], None], interval: float = 30.0, failure_threshold: int = 3):
+        """
+        Args:
+            check: Callable that raises if the upstream is unreachable
+            interval: Seconds between checks
+            failure_threshold: Consecutive failures before the state opens
+        """
+        self.check = check
+        self.interval = interval
+        self.failure_threshold = failure_threshold
+        self._lock = threading.Lock()
+        self._status: Dict[str, Any] = {
+            "state": "unknown", "checked_at": None, "latency_ms": None,
+            "consecutive_failures": 0, "error": None,
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Begin checking in a daemon thread (first check runs immediately)"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="upstream-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread"""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            self.run_check()
+            if self._stop.wait(self.interval):
+                return
+
+    def run_check(self) -> Dict[str, Any]:
+        """Run the check now and update the cached status
+
+        Returns:
+            The updated status
+        """
+        started = time.perf_counter()
+        error = None
+        try:
+            self.check()
+        except Exception as e:
+            error = str(e)
+        latency_ms = int((time.perf_counter() - started) * 1000)
+
+        with self._lock:
+            previous = self._status["state"]
+            failures = self._status["consecutive_failures"] + 1 if error else 0
+            state = "open" if failures >= self.failure_threshold else "closed"
+            self._status = {
+                "state": state, "checked_at": time.time(), "latency_ms": latency_ms,
+                "consecutive_failures": failures, "error": error,
+            }
+            status = dict(self._status)
+
+        if state != previous and not (previous == "unknown" and state == "closed"):
+            log = logger.warning if state == "open" else logger.info
+            log("Upstream check state %s -> %s%s", previous, state, f": {error}" if error else "")
+        return status
+
+    def status(self) -> Dict[str, Any]:
+        """Cached status from the last check"""
+        with self._lock:
+            return dict(self._status)
+
+
+class WarmUp:
+    """One-off startup task run in the background; /readyz waits for it
+
+    States: "cold" (not started, e.g. warm-up disabled), "warming", "warm",
+    or "failed". A failed warm-up does not keep the worker out of rotation;
+    the first request then pays the cold start and the upstream monitor
+    reports reachability.
+    """
+
+    def __init__(self, task: Callable[[], None]):
+        """
+        Args:
+            task: Callable that prepares the worker (may raise)
+        """
+        self.task = task
+        self._lock = threading.Lock()
+        self._status: Dict[str, Any] = {"state": "cold", "duration_ms": None, "error": None}
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Run the task in a daemon thread"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._status = {"state": "warming", "duration_ms": None, "error": None}
+            self._thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+        self._thread.start()
+
+    def run(self) -> Dict[str, Any]:
+        """Run the task now and record the outcome
+
+        Returns:
+            The updated status
+        """
+        started = time.perf_counter()
+        error = None
+        try:
+            self.task()
+        except Exception as e:
+            error = str(e)
+        duration_ms = int((time.perf_counter() - started) * 1000)
+
+        with self._lock:
+            self._status = {"state": "failed" if error else "warm", "duration_ms": duration_ms, "error": error}
+            status = dict(self._status)
+        if error:
+            logger.warning("Warm-up failed after %dms: %s", duration_ms, error)
+        else:
+            logger.info("Warm-up finished in %dms", duration_ms)
+        return status
+
+    def status(self) -> Dict[str, Any]:
+        """Current warm-up status"""
+        with self._lock:
+            return dict(self._status)
+
+
+def readiness_problems(snapshot: Dict[str, Any], max_in_flight: int, max_queued: int,
+                       max_queue_fill: float = 0.9) -> List[str]:
+    """Reasons a worker should not receive traffic (empty list when ready)
+
+    Only the interactive and job lanes count towards saturation: batch calls
+    are held below the scheduler budget and give way to the higher lanes, so
+    a bulk upload filling its share does not take the worker out of rotation.
+
+    Args:
+        snapshot: Output of the /readyz snapshot (see app.readyz)
+        max_in_flight: Interactive and job model calls in flight at which the
+            worker is saturated
+        max_queued: Interactive and job model calls waiting for a scheduler
+            slot at which the worker is saturated
+        max_queue_fill: Fraction of the results write queue that counts as full
+    """
+    problems = []
+    if snapshot["warmup"]["state"] == "warming":
+        problems.append("warming up")
+    if not snapshot["rules"]["loaded"]:
+        problems.append("rules file not loaded")
+    if snapshot["upstream"]["state"] == "open":
+        problems.append("upstream API failing checks")
+    lanes = snapshot["scheduler"]["lanes"]
+    in_flight = lanes["interactive"]["in_flight"] + lanes["job"]["in_flight"]
+    if in_flight >= max_in_flight:
+        problems.append(f"{in_flight} interactive/job model calls in flight (limit {max_in_flight})")
+    queued = lanes["interactive"]["queued"] + lanes["job"]["queued"]
+    if queued >= max_queued:
+        problems.append(f"{queued} interactive/job model calls queued (limit {max_queued})")
+    threadpool = snapshot["threadpool"]
+    if threadpool["waiting"] > 0:
+        problems.append(f"threadpool saturated ({threadpool['waiting']} waiting)")
+    store = snapshot["results_queue"]
+    if store["pending"] >= store["capacity"] * max_queue_fill:
+        problems.append(f"results write queue {store['pending']}/{store['capacity']}")
+    return problems
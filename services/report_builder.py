@@ -0,0 +1,265 @@
+"""Report assembly from pre-rendered static parts
+
+Zone overviews, section headings with their anchors and the JSON summary
+fence are rendered once when the builder is created (once per prompt
+bundle), so per-report work is filling slots. In REPORT_MODE=templated the
+model returns only the evidence-specific prose as JSON (TEMPLATED_OUTPUT_FORMAT)
+and the scoring breakdown comes from the deterministic tallies in
+services.scoring; the boilerplate is never generated token by token.
+"""
+import json
+from typing import Any, Dict, List, Tuple
+
+from services.scoring import MAIN_ZONES, SUBZONES, ZONE_NAMES, build_summary, render_scoring_breakdown
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_ZONES_4_AND_5 = """## Zones 4 & 5: Independent and Transitional Brands
+
+### Overview
+
+Zones 4 and 5 cover brands operating outside Hexagon's visual system due to strategic, legal, or market reasons.
+
+### Zone 4 – Independent Brands
+
+- Remain visually separate.
+- Use their own logos and colours.
+- Carry no Hexagon attribution.
+
+### Zone 5 – Transitional Brands
+
+- Newly acquired or incubating brands.
+- Retain their identity temporarily.
+- Evaluated for migration to Zones 1–3.
+"""
+
+# Zone overview definitions, keyed by zone ("3" by sub-zone), inserted verbatim into reports
+ZONE_DEFINITIONS = {
+    "1": """## Zone 1: Fully Masterbranded
+
+### Overview
+
+Zone 1 represents complete alignment with Hexagon.
+Offerings carry no separate logo, colour, or name identity, they are wholly Hexagon.
+
+Zone 1 applies to brands, products, and services that are fully absorbed into the Hexagon masterbrand. These entities no longer carry a separate identity and are represented exclusively using the Hexagon visual system.
+
+This is the most integrated form of brand alignment and the default destination for many newly launched or fully transitioned offerings.
+
+### Visual Identity Principles
+
+- Use only the Hexagon logo.
+- Follow Hexagon typography, colour palette, and layout.
+- Use descriptive names (e.g., "Hexagon Atlas")
+""",
+    "3A": """## Zone 3A: Endorsed by Hexagon (Business Unit Lockups)
+
+### Overview
+
+Zone 3A applies to legacy or business unit brands endorsed by Hexagon.
+The endorsed logo remains but is redrawn in Hexagon Sky Dark Blue and paired in a formal lockup.
+
+### Visual Identity Principles
+
+- Approved lockup: Hexagon logo above or beside endorsed logo with divider.
+- Endorsed logo scaled to 70% of Hexagon size.
+- Original colours retired.
+""",
+    "3B": """## Zone 3B: Sub-brands
+
+### Overview
+
+Zone 3B applies to internal or external initiatives, platforms, and programs that require a distinctive name but not a standalone logo.
+
+### Principles
+
+- Sub-brand names appear in text only.
+- Always accompanied by the Hexagon logo.
+- Use Hexagon typography and colour palette.
+""",
+    "3C": """## Zone 3C: Integrated Products and Solutions
+
+### Overview
+
+Zone 3C covers products, services, and solutions fully integrated within Hexagon.
+They use unified naming and badge systems, never independent logos.
+
+### Badge System
+
+- Marketing Badge: For campaigns and web.
+- Application Badge: For software UI or icons.
+- Colours follow Hexagon's Land, Sea, Sky families.
+
+### Attribution Levels
+
+1. Portfolio/Platform: Text only.
+2. Suite/Solution: Text only.
+3. Product: Badge assigned.
+4. Embedded: Hexagon logo only.
+""",
+    "4": _ZONES_4_AND_5,
+    "5": _ZONES_4_AND_5,
+}
+
+# Overviews as they appear in reports, rendered once at import
+ZONE_OVERVIEWS = {key: definition.strip() for key, definition in ZONE_DEFINITIONS.items()}
+
+
+def zone_overview(zone: str, subzone: str = "") -> str:
+    """Pre-rendered overview for a zone ("" if there is none)"""
+    return ZONE_OVERVIEWS.get(f"{zone}{subzone}" if zone == "3" and subzone else zone, "")
+
+
+# Output instructions for REPORT_MODE=templated: the model writes only the
+# evidence-specific prose; headings, overview, scoring breakdown and the
+# summary fence are assembled by ReportBuilder
+TEMPLATED_OUTPUT_FORMAT = """Return ONLY a JSON object (no markdown fence, no other text) with these keys:
+- "zone": "1", "3", "4" or "5"
+- "subzone": "A", "B" or "C" when zone is "3", otherwise ""
+- "confidence": {"evidence": 0-40, "completeness": 0-30, "conflict_resolution": 0-30}
+- "confidence_notes": {"evidence": "...", "completeness": "...", "conflict_resolution": "..."} (one short clause each)
+- "conclusion": one or two sentences stating the recommendation and the decisive evidence
+- "zone_assessment": a paragraph on how the evidence fits the recommended zone
+- "strategy": list of strategic recommendations
+- "risks": list of risks, each with its mitigation
+- "next_steps": list of concrete actions
+- "drivers": list of the decisive answers
+- "conflicts": list of answers pointing elsewhere
+
+The scoring breakdown, zone definitions and headings are added automatically: do not write them.
+Keep each text field ≤120 words. Cite evidence with (Q#) or (Not provided in assessment).
+"""
+
+# Confidence components: (prose key, label, maximum)
+_CONFIDENCE_PARTS = (
+    ("evidence", "Evidence", 40),
+    ("completeness", "Completeness", 30),
+    ("conflict_resolution", "Conflict Resolution", 30),
+)
+
+# Prose sections after the scoring breakdown: (prose key, anchor, heading)
+_SECTIONS = (
+    ("zone_assessment", "zone-assessment", "Zone-Specific Assessment"),
+    ("strategy", "strategy", "Strategic Recommendations"),
+    ("risks", "risks", "Risk Analysis & Mitigation"),
+    ("next_steps", "next-steps", "Next Steps & Action Items"),
+)
+
+_NOT_PROVIDED = "(Not provided by the model)"
+
+
+def _anchor(anchor: str) -> str:
+    return f'<a id="{anchor}"></a>'
+
+
+def _bounded(value: Any, maximum: int) -> int:
+    return max(0, min(maximum, value)) if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def _as_list(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(item) for item in value if str(item).strip()]
+    if isinstance(value, str) and value.strip():
+        return [value.strip()]
+    return []
+
+
+def parse_prose(content: str) -> Dict[str, Any]:
+    """Parse the model's templated-mode JSON, tolerating a markdown fence
+
+    Returns:
+        Parsed object, or {} if the content is not a JSON object
+    """
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+    try:
+        prose = json.loads(text)
+    except json.JSONDecodeError:
+        logger.warning("Failed to parse templated report JSON")
+        return {}
+    return prose if isinstance(prose, dict) else {}
+
+
+class ReportBuilder:
+    """Assemble complete markdown reports from prose and deterministic tallies"""
+
+    def __init__(self) -> None:
+        # Static fragments rendered once per builder
+        self._section_headings = {key: f"{_anchor(anchor)}\n**{heading}**" for key, anchor, heading in _SECTIONS}
+        self._headlines = {
+            (zone, sub): f"{_anchor('zone-recommendation')}\n# Zone {zone}{sub} — {ZONE_NAMES[zone]} (Recommended)"
+            for zone in MAIN_ZONES for sub in (SUBZONES if zone == "3" else ("",))
+        }
+        self._confidence_heading = _anchor("confidence")
+        self._conclusion_prefix = f"{_anchor('conclusion')}\n**CONCLUSION:** "
+        self._summary_heading = f"{_anchor('summary-json')}\n**Machine-Readable Summary**\n```json\n"
+
+    def _decide(self, prose: Dict[str, Any], score: Dict[str, Any]) -> Tuple[str, str]:
+        """Zone and sub-zone from the model, falling back to the scorer when invalid"""
+        zone = str(prose.get("zone", "")).strip().upper().removeprefix("ZONE").strip()
+        subzone = str(prose.get("subzone", "") or "").strip().upper().removeprefix(zone)
+        if len(zone) == 2 and zone[0] == "3":
+            zone, subzone = "3", zone[1]
+        if zone not in MAIN_ZONES or (zone == "3") != (subzone in SUBZONES):
+            logger.warning("Model returned an invalid zone %r/%r; using the scorer's Zone %s%s",
+                           prose.get("zone"), prose.get("subzone"), score["zone"], score["subzone"])
+            return score["zone"], score["subzone"]
+        return zone, subzone if zone == "3" else ""
+
+    def assemble(self, assessment: Dict[str, Any], prose: Dict[str, Any],
+                 score: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Build the report markdown and machine summary
+
+        Args:
+            assessment: Brand architecture assessment data
+            prose: Model output in the TEMPLATED_OUTPUT_FORMAT shape (see parse_prose)
+            score: services.scoring.score_assessment result for the assessment
+
+        Returns:
+            (markdown, summary) with summary in MACHINE_JSON_SCHEMA shape
+        """
+        zone, subzone = self._decide(prose, score)
+        parts = prose.get("confidence") if isinstance(prose.get("confidence"), dict) else {}
+        notes = prose.get("confidence_notes") if isinstance(prose.get("confidence_notes"), dict) else {}
+        points = {key: _bounded(parts.get(key), maximum) for key, _, maximum in _CONFIDENCE_PARTS}
+        confidence = sum(points.values())
+
+        summary = build_summary(assessment, score)
+        summary.update({
+            "zone": zone,
+            "zone_name": ZONE_NAMES[zone],
+            "subzone": subzone,
+            "confidence": confidence,
+            "drivers": _as_list(prose.get("drivers")) or summary["drivers"],
+            "conflicts": _as_list(prose.get("conflicts")) or summary["conflicts"],
+            "risks": _as_list(prose.get("risks")),
+            "next_steps": _as_list(prose.get("next_steps")),
+        })
+
+        blocks = [
+            self._headlines[(zone, subzone)],
+            self._conclusion_prefix + (str(prose.get("conclusion") or "").strip() or _NOT_PROVIDED),
+            f"{self._confidence_heading}\n**Confidence: {confidence}/100**",
+            "\n".join(
+                f"- {label}: {points[key]}/{maximum}" + (f" ({notes[key]})" if notes.get(key) else "")
+                for key, label, maximum in _CONFIDENCE_PARTS
+            ),
+        ]
+        overview = zone_overview(zone, subzone)
+        if overview:
+            blocks.append(overview)
+        blocks.append(render_scoring_breakdown(score))
+        if (zone, subzone) != (score["zone"], score["subzone"]):
+            blocks.append(f"Note: the tally favours Zone {score['zone']}{score['subzone']}; the recommendation "
+                          "above reflects adjudication under the full rules.")
+        for key, _, _ in _SECTIONS:
+            value = prose.get(key)
+            if isinstance(value, list):
+                body = "\n".join(f"- {item}" for item in _as_list(value))
+            else:
+                body = str(value or "").strip()
+            blocks.append(f"{self._section_headings[key]}\n\n{body or _NOT_PROVIDED}")
+        blocks.append(self._summary_heading + json.dumps(summary, ensure_ascii=False, indent=2) + "\n```")
+        return "\n\n".join(blocks) + "\n", summary
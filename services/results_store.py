@@ -0,0 +1,697 @@
+import base64
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils import codec
+from utils.hashing import assessment_hash
+from utils.http_cache import strong_etag
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResultsStoreError(Exception):
+    """Raised when the results store cannot satisfy a query"""
+    pass
+
+
+# Columns written for every zoning, in insert order
+_COLUMNS = (
+    "id", "created_at", "brand", "division", "zone", "subzone", "confidence",
+    "assessment_hash", "prompt_hash", "model",
+    "prompt_tokens", "completion_tokens", "total_tokens", "latency_ms",
+    "assessment", "summary", "report_markdown",
+)
+
+# Columns returned by list queries (heavy payloads are only served per result)
+_LIST_COLUMNS = (
+    "id", "created_at", "brand", "division", "zone", "subzone", "confidence",
+    "assessment_hash", "prompt_hash", "model",
+    "prompt_tokens", "completion_tokens", "total_tokens", "latency_ms", "summary",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS zonings (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    brand TEXT,
+    division TEXT,
+    zone TEXT,
+    subzone TEXT,
+    confidence INTEGER,
+    assessment_hash TEXT NOT NULL,
+    prompt_hash TEXT,
+    model TEXT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    total_tokens INTEGER,
+    latency_ms INTEGER,
+    assessment TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    report_markdown TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_zonings_created ON zonings (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_zonings_brand ON zonings (brand, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_zonings_division ON zonings (division, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_zonings_zone ON zonings (zone, subzone, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_zonings_hash ON zonings (assessment_hash, prompt_hash, created_at);
+"""
+
+# Materialised aggregates, one row per (day, division, model, zone, subzone),
+# kept in step with zonings by the writer (see _aggregate_deltas). Missing
+# key values are stored as "" so the primary key can upsert them.
+ANALYTICS_DIMENSIONS = ("day", "division", "model", "zone")
+_AGGREGATE_KEYS = ("day", "division", "model", "zone", "subzone")
+# Confidence histogram: 0-9, 10-19, ..., 90-100
+_HISTOGRAM = tuple(f"{10 * i}-{10 * i + 9 if i < 9 else 100}" for i in range(10))
+_AGGREGATE_SUMS = (
+    "zonings", "confidence_n", "confidence_sum",
+    *(f"confidence_{i}" for i in range(len(_HISTOGRAM))),
+    "latency_n", "latency_ms_sum", "prompt_tokens", "completion_tokens", "total_tokens",
+)
+
+_AGGREGATES_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS zoning_aggregates (
+    {", ".join(f"{key} TEXT NOT NULL" for key in _AGGREGATE_KEYS)},
+    {", ".join(f"{column} INTEGER NOT NULL DEFAULT 0" for column in _AGGREGATE_SUMS)},
+    PRIMARY KEY ({", ".join(_AGGREGATE_KEYS)})
+);
+"""
+
+_AGGREGATE_UPSERT = (
+    f"INSERT INTO zoning_aggregates ({', '.join(_AGGREGATE_KEYS + _AGGREGATE_SUMS)}) "
+    f"VALUES ({', '.join('?' for _ in _AGGREGATE_KEYS + _AGGREGATE_SUMS)}) "
+    f"ON CONFLICT ({', '.join(_AGGREGATE_KEYS)}) DO UPDATE SET "
+    + ", ".join(f"{column} = {column} + excluded.{column}" for column in _AGGREGATE_SUMS)
+)
+
+# Same sums computed over the whole zonings table (rebuild_aggregates)
+_AGGREGATE_REBUILD = (
+    f"INSERT INTO zoning_aggregates ({', '.join(_AGGREGATE_KEYS + _AGGREGATE_SUMS)}) "
+    "SELECT substr(created_at, 1, 10), COALESCE(division, ''), COALESCE(model, ''), "
+    "COALESCE(zone, ''), COALESCE(subzone, ''), "
+    "COUNT(*), COUNT(confidence), COALESCE(SUM(confidence), 0), "
+    + "".join(f"SUM(confidence IS NOT NULL AND min(max(confidence / 10, 0), 9) = {i}), "
+              for i in range(len(_HISTOGRAM)))
+    + "COUNT(latency_ms), COALESCE(SUM(latency_ms), 0), COALESCE(SUM(prompt_tokens), 0), "
+    "COALESCE(SUM(completion_tokens), 0), COALESCE(SUM(total_tokens), 0) "
+    "FROM zonings GROUP BY 1, 2, 3, 4, 5"
+)
+
+# Columns of a stored row that its aggregate contribution depends on
+_AGGREGATE_SOURCE = (
+    "id", "created_at", "division", "model", "zone", "subzone", "confidence",
+    "latency_ms", "prompt_tokens", "completion_tokens", "total_tokens",
+)
+
+# Sentinel telling the writer thread to exit
+_STOP = object()
+
+
+def _utc_now() -> str:
+    """Current UTC time as a fixed-width, lexically sortable ISO timestamp"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _normalize_subzone(zone: str, subzone: str) -> str:
+    """Reduce "3A"/"a"/"A" style subzones to a bare upper-case letter"""
+    subzone = (subzone or "").strip().upper()
+    if zone and subzone.startswith(zone):
+        subzone = subzone[len(zone):]
+    return subzone
+
+
+def build_record(assessment: Dict[str, Any], result: Dict[str, Any],
+                 result_id: Optional[str] = None) -> Dict[str, Any]:
+    """Build a store record from an assessment and its zone report
+
+    Args:
+        assessment: Brand architecture assessment data
+        result: Result dict returned by OpenAIService.generate_zone_report
+        result_id: Identifier to store under (generated if omitted)
+
+    Returns:
+        Dict keyed by store column name
+    """
+    summary = result.get("summary", {}) or {}
+    metadata = result.get("metadata", {}) or {}
+    usage = metadata.get("usage", {}) or {}
+    zone = str(summary.get("zone", "") or "")
+    confidence = summary.get("confidence")
+
+    return {
+        "id": result_id or uuid.uuid4().hex,
+        "created_at": _utc_now(),
+        "brand": assessment.get("brand") or summary.get("brand"),
+        "division": assessment.get("division"),
+        "zone": zone or None,
+        "subzone": _normalize_subzone(zone, str(summary.get("subzone", "") or "")) or None,
+        "confidence": confidence if isinstance(confidence, int) else None,
+        "assessment_hash": assessment_hash(assessment),
+        "prompt_hash": metadata.get("prompt_hash"),
+        "model": metadata.get("model"),
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "total_tokens": usage.get("total_tokens"),
+        "latency_ms": metadata.get("latency_ms"),
+        "assessment": codec.dumps(assessment).decode("utf-8"),
+        "summary": codec.dumps(summary).decode("utf-8"),
+        "report_markdown": result.get("report_markdown", ""),
+    }
+
+
+def _aggregate_deltas(added: List[Dict[str, Any]],
+                      removed: List[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    """Upsert rows for zoning_aggregates: added rows count +1, removed rows -1"""
+    deltas: Dict[Tuple[str, ...], List[int]] = {}
+    for sign, rows in ((1, added), (-1, removed)):
+        for row in rows:
+            key = (row["created_at"][:10],) + tuple(row.get(name) or "" for name in _AGGREGATE_KEYS[1:])
+            sums = deltas.get(key)
+            if sums is None:
+                sums = deltas[key] = [0] * len(_AGGREGATE_SUMS)
+            confidence, latency = row.get("confidence"), row.get("latency_ms")
+            sums[0] += sign
+            if confidence is not None:
+                sums[1] += sign
+                sums[2] += sign * confidence
+                sums[3 + min(max(confidence // 10, 0), 9)] += sign
+            offset = 3 + len(_HISTOGRAM)
+            if latency is not None:
+                sums[offset] += sign
+                sums[offset + 1] += sign * latency
+            for i, name in enumerate(("prompt_tokens", "completion_tokens", "total_tokens")):
+                sums[offset + 2 + i] += sign * (row.get(name) or 0)
+    return [key + tuple(sums) for key, sums in deltas.items()]
+
+
+def _summarize(sums: Dict[str, int]) -> Dict[str, Any]:
+    """Public shape of one analytics group from its aggregate sums"""
+    confidence_n, latency_n = sums["confidence_n"], sums["latency_n"]
+    return {
+        "zonings": sums["zonings"],
+        "confidence": {
+            "mean": round(sums["confidence_sum"] / confidence_n, 1) if confidence_n else None,
+            "histogram": {label: sums[f"confidence_{i}"] for i, label in enumerate(_HISTOGRAM)},
+        },
+        "latency_ms": {
+            "mean": round(sums["latency_ms_sum"] / latency_n) if latency_n else None,
+            "total": sums["latency_ms_sum"],
+        },
+        "tokens": {
+            "prompt": sums["prompt_tokens"],
+            "completion": sums["completion_tokens"],
+            "total": sums["total_tokens"],
+        },
+    }
+
+
+def _decode_full(row: Any) -> Optional[Dict[str, Any]]:
+    """Turn a full row (or a queued record) into a result dict, decoding the JSON columns"""
+    if row is None:
+        return None
+    data = dict(row)
+    data["assessment"] = codec.loads(data["assessment"])
+    data["summary"] = codec.loads(data["summary"])
+    return data
+
+
+def result_etag(record: Dict[str, Any]) -> str:
+    """Strong ETag of a stored zoning
+
+    Rows are written once and never updated, so the identifying columns
+    determine the full representation.
+    """
+    return strong_etag(record["id"], record["created_at"], record["assessment_hash"],
+                       record.get("prompt_hash") or "")
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Encode the keyset position of a row as an opaque cursor"""
+    raw = json.dumps([row["created_at"], row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_cursor
+
+    Raises:
+        ResultsStoreError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, result_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(created_at), str(result_id)
+    except (ValueError, TypeError) as e:
+        raise ResultsStoreError(f"Invalid cursor: {cursor!r}") from e
+
+
+class ResultsStore:
+    """SQLite (WAL) store for zoning results with a batching background writer
+
+    Writes are queued by record() and inserted by a single writer thread in
+    batches, so the request path never waits on disk I/O. Reads open their own
+    connection and run concurrently with the writer thanks to WAL mode.
+    get() and get_etag() also see records still waiting to be written, so a
+    result_id can be read back as soon as record() returns it.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 50,
+                 flush_interval: float = 0.5, queue_size: int = 1000):
+        """Open (or create) the results database
+
+        Args:
+            db_path: Path to the SQLite database file
+            batch_size: Maximum records inserted per transaction
+            flush_interval: Maximum seconds a record waits before being written
+            queue_size: Maximum records buffered before new writes are dropped
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.dropped = 0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        # Queued records by id, until the writer has handled them
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA + _AGGREGATES_SCHEMA)
+            # Databases written before the aggregates existed are backfilled once
+            if conn.execute("SELECT 1 FROM zoning_aggregates LIMIT 1").fetchone() is None and \
+                    conn.execute("SELECT 1 FROM zonings LIMIT 1").fetchone() is not None:
+                self._rebuild_aggregates(conn)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the store's pragmas applied"""
+        conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record(self, record: Dict[str, Any]) -> Optional[str]:
+        """Queue a record (see build_record) for insertion
+
+        Never blocks: if the queue is full the record is dropped and counted.
+
+        Returns:
+            The record id, or None if the record was dropped
+        """
+        self._ensure_writer()
+        self._pending[record["id"]] = record
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._forget(record)
+            self.dropped += 1
+            logger.error("Results queue full, dropped zoning %s", record["id"])
+            return None
+        return record["id"]
+
+    def _forget(self, record: Dict[str, Any]) -> None:
+        """Stop serving a record from the pending map (unless a newer one replaced it)"""
+        if self._pending.get(record["id"]) is record:
+            del self._pending[record["id"]]
+
+    def pending(self) -> int:
+        """Number of records waiting to be written"""
+        return self._queue.qsize()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every record queued so far has been written
+
+        Returns:
+            True if the writer caught up within the timeout
+        """
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out queued records and stop the writer thread"""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        self._queue.put(_STOP)
+        writer.join(timeout)
+
+    def _ensure_writer(self) -> None:
+        """Start the writer thread on first use"""
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run_writer, name="results-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _run_writer(self) -> None:
+        """Writer loop: collect up to batch_size records or flush_interval, then insert"""
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                batch: List[Dict[str, Any]] = []
+                markers: List[threading.Event] = []
+                stop = False
+                deadline = time.monotonic() + self.flush_interval
+
+                while True:
+                    if item is _STOP:
+                        stop = True
+                        break
+                    if isinstance(item, threading.Event):
+                        markers.append(item)
+                        break
+                    batch.append(item)
+                    remaining = deadline - time.monotonic()
+                    if len(batch) >= self.batch_size or remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+
+                if batch:
+                    self._write_batch(conn, batch)
+                    for record in batch:
+                        self._forget(record)
+                for marker in markers:
+                    marker.set()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Dict[str, Any]]) -> None:
+        """Insert a batch of records and update the aggregates in a single transaction
+
+        A record whose id is already stored replaces that row, so the old
+        row's contribution is taken out of the aggregates first. If the batch
+        fails, its records are retried one at a time so only the failing
+        ones are dropped.
+        """
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        sql = f"INSERT OR REPLACE INTO zonings ({', '.join(_COLUMNS)}) VALUES ({placeholders})"
+        latest = list({r["id"]: r for r in batch}.values())
+        try:
+            with conn:
+                replaced = [dict(row) for row in conn.execute(
+                    f"SELECT {', '.join(_AGGREGATE_SOURCE)} FROM zonings "
+                    f"WHERE id IN ({', '.join('?' for _ in latest)})",
+                    [r["id"] for r in latest]
+                )]
+                conn.executemany(sql, [tuple(r.get(c) for c in _COLUMNS) for r in batch])
+                conn.executemany(_AGGREGATE_UPSERT, _aggregate_deltas(latest, replaced))
+            logger.debug("Wrote %d zoning(s) to results store", len(batch))
+        except sqlite3.Error as e:
+            if len(batch) > 1:
+                logger.warning("Failed to write %d zonings, retrying one by one: %s", len(batch), e)
+                for record in batch:
+                    self._write_batch(conn, [record])
+                return
+            self.dropped += 1
+            logger.error("Failed to write zoning %s: %s", batch[0]["id"], e, exc_info=True)
+
+    def rebuild_aggregates(self) -> None:
+        """Recompute zoning_aggregates from every stored zoning
+
+        Only needed after zonings were changed outside the store; the writer
+        keeps the aggregates current otherwise.
+        """
+        conn = self._connect()
+        try:
+            self._rebuild_aggregates(conn)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _rebuild_aggregates(conn: sqlite3.Connection) -> None:
+        """Replace the aggregates with sums over the zonings table in one transaction"""
+        with conn:
+            conn.execute("DELETE FROM zoning_aggregates")
+            conn.execute(_AGGREGATE_REBUILD)
+        logger.info("Rebuilt zoning aggregates")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a single stored zoning with its assessment and report
+
+        Returns:
+            Result dict, or None if the id is unknown
+        """
+        # Checked before the table: a record leaves the map only once written
+        pending = self._pending.get(result_id)
+        if pending is not None:
+            return _decode_full(pending)
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM zonings WHERE id = ?", (result_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _decode_full(row)
+
+    def get_etag(self, result_id: str) -> Optional[str]:
+        """ETag of a stored zoning without loading its payload
+
+        Returns:
+            Quoted ETag (see result_etag), or None if the id is unknown
+        """
+        pending = self._pending.get(result_id)
+        if pending is not None:
+            return result_etag(pending)
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, created_at, assessment_hash, prompt_hash FROM zonings WHERE id = ?",
+                (result_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return result_etag(dict(row)) if row is not None else None
+
+    def find_cached(self, assessment_hash: str, prompt_hash: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Fetch the newest zoning of an identical assessment under the same prompt
+
+        Args:
+            assessment_hash: Content hash of the assessment (utils.hashing)
+            prompt_hash: Hash of the prompt (or scorer) that produced the result
+
+        Returns:
+            Result dict as returned by get(), or None if nothing matches
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM zonings "
+                "WHERE assessment_hash = ? AND prompt_hash IS ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (assessment_hash, prompt_hash)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _decode_full(row)
+
+    def iter_zonings(self, brand: Optional[str] = None, division: Optional[str] = None,
+                     zone: Optional[str] = None, since: Optional[str] = None,
+                     until: Optional[str] = None, cursor: Optional[str] = None,
+                     limit: Optional[int] = 50,
+                     full: bool = False) -> Iterator[Dict[str, Any]]:
+        """Iterate stored zonings, newest first, using keyset pagination
+
+        Filters are validated eagerly; rows are fetched lazily. Yields up to
+        limit + 1 rows so callers can tell whether another page
+        exists; the cursor for the next page is encode_cursor(rows[limit - 1]).
+
+        Args:
+            brand: Exact brand name
+            division: Exact division name
+            zone: Zone ("3") or zone with subzone ("3A")
+            since: Inclusive lower bound on created_at (ISO date or timestamp)
+            until: Exclusive upper bound on created_at (ISO date or timestamp)
+            cursor: Cursor from a previous page
+            limit: Page size, or None to iterate every matching row
+            full: Include the assessment and report_markdown in each row
+
+        Raises:
+            ResultsStoreError: If the cursor is malformed
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if brand:
+            clauses.append("brand = ?")
+            params.append(brand)
+        if division:
+            clauses.append("division = ?")
+            params.append(division)
+        if zone:
+            zone = zone.strip().upper()
+            clauses.append("zone = ?")
+            params.append(zone[:1])
+            if len(zone) > 1:
+                clauses.append("subzone = ?")
+                params.append(zone[1:])
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("created_at < ?")
+            params.append(until)
+        if cursor:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        columns = _COLUMNS if full else _LIST_COLUMNS
+        sql = (
+            f"SELECT {', '.join(columns)} FROM zonings {where} "
+            "ORDER BY created_at DESC, id DESC"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        return self._iter_rows(sql, params)
+
+    def analytics(self, group_by: Tuple[str, ...] = ("division", "zone"),
+                  division: Optional[str] = None, model: Optional[str] = None,
+                  zone: Optional[str] = None, since: Optional[str] = None,
+                  until: Optional[str] = None) -> Dict[str, Any]:
+        """Zone counts, confidence, latency and token totals from the aggregates
+
+        Reads zoning_aggregates only, whose size depends on the number of
+        distinct (day, division, model, zone) values and not on how many
+        zonings are stored. Records still queued for writing are not counted.
+
+        Args:
+            group_by: Dimensions to group by (see ANALYTICS_DIMENSIONS); "zone"
+                groups by zone and subzone ("3A")
+            division: Exact division name
+            model: Exact model name
+            zone: Zone ("3") or zone with subzone ("3A")
+            since: Inclusive first day (ISO date; a timestamp is cut to its day)
+            until: Exclusive last day (ISO date; a timestamp is cut to its day)
+
+        Returns:
+            {"group_by", "groups": [{<dimensions>, "zonings", "confidence",
+            "latency_ms", "tokens"}], "totals": {...}}
+
+        Raises:
+            ResultsStoreError: If group_by names an unknown dimension
+        """
+        unknown = [name for name in group_by if name not in ANALYTICS_DIMENSIONS]
+        if unknown:
+            raise ResultsStoreError(
+                f"Unknown group_by {', '.join(unknown)}; use {', '.join(ANALYTICS_DIMENSIONS)}"
+            )
+        group_by = tuple(dict.fromkeys(group_by))
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("division", division), ("model", model)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if zone:
+            zone = zone.strip().upper()
+            clauses.append("zone = ?")
+            params.append(zone[:1])
+            if len(zone) > 1:
+                clauses.append("subzone = ?")
+                params.append(zone[1:])
+        if since:
+            clauses.append("day >= ?")
+            params.append(since[:10])
+        if until:
+            clauses.append("day < ?")
+            params.append(until[:10])
+
+        keys = [key for name in group_by for key in (("zone", "subzone") if name == "zone" else (name,))]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        group = f"GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}" if keys else ""
+        sql = (f"SELECT {', '.join(keys + [f'SUM({c}) AS {c}' for c in _AGGREGATE_SUMS])} "
+               f"FROM zoning_aggregates {where} {group}")
+
+        conn = self._connect()
+        try:
+            rows = [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+        totals = {column: 0 for column in _AGGREGATE_SUMS}
+        groups = []
+        for row in rows:
+            if row["zonings"] is None:  # no aggregate rows matched
+                continue
+            for column in _AGGREGATE_SUMS:
+                totals[column] += row[column]
+            labels = {name: (row["zone"] + row["subzone"] if name == "zone" else row[name]) or None
+                      for name in group_by}
+            groups.append({**labels, **_summarize(row)})
+        return {"group_by": list(group_by), "groups": groups, "totals": _summarize(totals)}
+
+    def _iter_rows(self, sql: str, params: List[Any]) -> Iterator[Dict[str, Any]]:
+        """Lazily run a list query on a dedicated connection"""
+        conn = self._connect()
+        try:
+            for row in conn.execute(sql, params):
+                data = dict(row)
+                data["summary"] = codec.loads(data["summary"])
+                if "assessment" in data:
+                    data["assessment"] = codec.loads(data["assessment"])
+                yield data
+        finally:
+            conn.close()
+
+
+def iter_page_json(rows: Iterator[Dict[str, Any]], limit: int) -> Iterator[bytes]:
+    """Stream a page of rows from iter_zonings as a JSON document
+
+    Produces {"items": [...], "next_cursor": "..."|null} one item at a time so
+    the page is never materialised in memory.
+    """
+    yield b'{"items":['
+    last = None
+    count = 0
+    has_more = False
+    for row in rows:
+        if count == limit:
+            has_more = True
+            break
+        prefix = b"," if count else b""
+        yield prefix + codec.dumps(row)
+        last = row
+        count += 1
+    close = getattr(rows, "close", None)
+    if close is not None:
+        close()
+    next_cursor = encode_cursor(last) if has_more and last else None
+    yield b'],"next_cursor":' + json.dumps(next_cursor).encode("utf-8") + b"}"
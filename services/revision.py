@@ -0,0 +1,95 @@
+"""Diff-based re-zoning of a stored assessment
+
+A revision applies a JSON Patch to a stored assessment, works out which
+questions changed and updates the deterministic tallies incrementally. The
+model is only asked for a new narrative when the revision can change the
+outcome; otherwise the previous report is carried over.
+"""
+from typing import Any, Dict, List, Tuple
+
+from services.question_catalog import changed_questions, get_answer
+from services.scoring import rescore, score_assessment
+from utils.json_patch import apply_patch
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def outcome_unchanged(before: Dict[str, Any], after: Dict[str, Any]) -> bool:
+    """True when a re-score keeps the winner and gates and does not narrow the margin"""
+    return (
+        after["zone"] == before["zone"]
+        and after["subzone"] == before["subzone"]
+        and after["gates"] == before["gates"]
+        and after["margin"] >= before["margin"]
+    )
+
+
+def revise_zoning(stored: Dict[str, Any], operations: List[Dict[str, Any]],
+                  service: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Apply a JSON Patch to a stored zoning and produce the revised result
+
+    Args:
+        stored: Stored zoning as returned by ResultsStore.get
+        operations: RFC 6902 JSON Patch against the stored assessment
+        service: OpenAIService used when a new narrative is needed
+
+    Returns:
+        Tuple of (updated assessment, result dict shaped like
+        generate_zone_report plus a 'revision' block)
+
+    Raises:
+        JSONPatchError: If the patch is malformed or cannot be applied
+        OpenAIServiceError: If a new narrative is needed and the model call fails
+    """
+    previous = stored["assessment"]
+    assessment = apply_patch(previous, operations)
+    changed = changed_questions(previous, assessment)
+    codes = [q.code for q in changed]
+
+    before = score_assessment(previous)
+    after = rescore(before, previous, assessment, codes)
+    # A renamed brand invalidates the narrative even if no answer changed
+    reuse = outcome_unchanged(before, after) and assessment.get("brand") == previous.get("brand")
+
+    if reuse:
+        logger.info("Revision of %s keeps Zone %s%s, reusing report (%d changed question(s))",
+                    stored["id"], after["zone"], after["subzone"], len(codes))
+        result = {
+            "report_markdown": stored["report_markdown"],
+            "summary": dict(stored["summary"]),
+            "metadata": {
+                "model": stored.get("model"),
+                "prompt_hash": stored.get("prompt_hash"),
+                "latency_ms": 0,
+                "usage": {},
+            },
+            # The answers changed even though the outcome held
+            "validation": service.validation_table.validate(assessment, stored["summary"]),
+        }
+    else:
+        logger.info("Revision of %s may change the outcome, requesting updated narrative", stored["id"])
+        descriptions = [
+            f"{q.label} ({q.code}): {_answer(previous, q)} -> {_answer(assessment, q)}" for q in changed
+        ]
+        result = service.revise_zone_report(assessment, stored["report_markdown"], descriptions)
+
+    result["revision"] = {
+        "revised_from": stored["id"],
+        "changed_questions": codes,
+        "llm_called": not reuse,
+        "scores_before": _score_view(before),
+        "scores_after": _score_view(after),
+    }
+    return assessment, result
+
+
+def _answer(assessment: Dict[str, Any], question: Any) -> str:
+    """Printable answer for a change description"""
+    value = get_answer(assessment, question)
+    return "not answered" if value is None else str(value)
+
+
+def _score_view(score: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact score fields returned with a revision"""
+    return {key: score[key] for key in ("zone", "subzone", "runner_up", "margin", "gates", "zones", "subzones")}
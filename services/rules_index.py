@@ -0,0 +1,127 @@
+"""Section index of the HEX 5112 rules file for per-assessment prompts
+
+The rules file is split once into sections: the preamble, each STEP's
+introduction, and one section per question (keyed by its catalog code, e.g.
+"Z4Q1", or "Z3FQ21" in the STEP 5 confidence fallback tier). For an
+assessment, select() returns the preamble plus the sections of the answered
+questions, each with its STEP introduction:
+
+- gated assessments (a Zone 4/5 gate answered Yes) stop at the gates, so
+  only STEPs 1-2 are included
+- the STEP 5 fallback tier is included only when it would be triggered:
+  Zone 3 leads without a gate and scoring confidence is below 90%
+
+Unanswered questions score nothing, so their sections are left out.
+Precedence logic and the quick scoring reference are in the developer
+prompt, which is always sent.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from services.question_catalog import QUESTIONS, get_answer
+from services.scoring import score_assessment
+
+# "## STEP 3: Evaluate for Zone 1 ..." starts a step
+_STEP = re.compile(r"^##\s+STEP\s+(\d+)\b")
+# "### 🔹 Z4 Q1 ...", "### 🔹Z5 Q9 ..." in STEPs 1-4; "🔹 Z3 Q21 ..." in STEP 5
+_QUESTION = re.compile(r"^(?:###\s+)?🔹\s*Z(\d)\s+Q(\d+[A-Za-z]?)\b")
+
+FALLBACK_STEP = 5
+GATE_STEPS = (1, 2)
+FALLBACK_CONFIDENCE = 90
+
+
+class RulesSection(NamedTuple):
+    id: str            # "preamble", "STEP 2" or a question code
+    step: int          # 0 for the preamble
+    text: str
+
+
+def _code(step: int, zone: str, number: str) -> str:
+    """Catalog code of a question heading ("Z3 Q21" in STEP 5 is "Z3FQ21")"""
+    return f"Z{zone}{'F' if step == FALLBACK_STEP else ''}Q{number}"
+
+
+class RulesIndex:
+    """Rules file split into sections, with per-assessment selection"""
+
+    def __init__(self, rules_text: str):
+        """
+        Args:
+            rules_text: Content of the HEX 5112 rules file
+        """
+        sections: List[RulesSection] = []
+        current_id, step, lines = "preamble", 0, []
+        for line in rules_text.splitlines(keepends=True):
+            step_match = _STEP.match(line)
+            question_match = _QUESTION.match(line) if step else None
+            if step_match or question_match:
+                sections.append(RulesSection(current_id, step, "".join(lines)))
+                if step_match:
+                    step = int(step_match.group(1))
+                    current_id = f"STEP {step}"
+                else:
+                    current_id = _code(step, *question_match.groups())
+                lines = []
+            lines.append(line)
+        sections.append(RulesSection(current_id, step, "".join(lines)))
+
+        # A repeated heading (a question continued under a new heading) keeps
+        # both parts, at the position of the first
+        merged: Dict[str, RulesSection] = {}
+        for section in sections:
+            if not section.text.strip():
+                continue
+            previous = merged.get(section.id)
+            merged[section.id] = section if previous is None else \
+                previous._replace(text=previous.text + section.text)
+        self.sections: Tuple[RulesSection, ...] = tuple(merged.values())
+        self._by_id = merged
+
+        # Catalog code -> section id (form codes such as "Z3FQ30a" fall back
+        # to the numbered heading "Z3FQ30")
+        self._section_for: Dict[str, str] = {}
+        for question in QUESTIONS:
+            for candidate in (question.code, question.code.rstrip("abcdefgh")):
+                if candidate in self._by_id:
+                    self._section_for[question.code] = candidate
+                    break
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def section_for(self, code: str) -> Optional[str]:
+        """Section id holding a catalog question, or None if the file lacks it"""
+        return self._section_for.get(code)
+
+    def relevant_ids(self, assessment: Dict[str, Any],
+                     score: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Ids of the sections an assessment needs, in file order
+
+        Args:
+            assessment: Brand architecture assessment data
+            score: score_assessment() result, if already computed
+        """
+        score = score or score_assessment(assessment)
+        gated = bool(score["gates"])
+        fallback = not gated and score["zone"] == "3" and score["confidence"] < FALLBACK_CONFIDENCE
+
+        wanted = {"preamble"}
+        for question in QUESTIONS:
+            section_id = self._section_for.get(question.code)
+            if section_id is None or get_answer(assessment, question) is None:
+                continue
+            step = self._by_id[section_id].step
+            if (gated and step not in GATE_STEPS) or (step == FALLBACK_STEP and not fallback):
+                continue
+            wanted.update((section_id, f"STEP {step}"))
+        return [section.id for section in self.sections if section.id in wanted]
+
+    def select(self, assessment: Dict[str, Any], score: Optional[Dict[str, Any]] = None) -> Tuple[str, List[str]]:
+        """Rules text for an assessment
+
+        Returns:
+            (concatenated section texts, section ids)
+        """
+        ids = self.relevant_ids(assessment, score)
+        return "".join(self._by_id[section_id].text for section_id in ids), ids
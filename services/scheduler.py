@@ -0,0 +1,274 @@
+"""Priority scheduling of upstream model calls
+
+All model calls of a worker share one concurrency budget. Waiting calls are
+queued in three lanes served in strict priority order: interactive (a person
+waiting on /zone or a revision), job, and batch (/zone/bulk). Within a lane,
+API keys get weighted fair shares (start-time fair queuing), so one client's
+400-brand import cannot crowd out another client's calls.
+
+The batch lane's concurrency is adaptive (AIMD): it grows by one per window of
+calls while upstream latency stays within tolerance of the best recently
+observed, and halves when latency degrades or calls fail. At least one slot
+is always left to the higher lanes.
+
+Callers declare their lane with scheduling(); OpenAIService wraps each API
+attempt in Scheduler.slot().
+"""
+import collections
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+LANES = ("interactive", "job", "batch")
+
+# (lane, tenant, weight) of the calls made by the current request
+_current: ContextVar[Tuple[str, str, int]] = ContextVar("scheduling", default=("interactive", "default", 1))
+
+
+class SchedulerTimeout(RuntimeError):
+    """Raised when a call waits longer than the queue timeout for a slot"""
+    pass
+
+
+def lane_for(endpoint_lane: str, key_priority: str) -> str:
+    """The lower-priority of an endpoint's lane and the API key's class"""
+    return LANES[max(LANES.index(endpoint_lane), LANES.index(key_priority))]
+
+
+@contextmanager
+def scheduling(lane: str, tenant: str = "default", weight: int = 1) -> Iterator[None]:
+    """Run model calls made inside the block in a lane, on behalf of a tenant
+
+    Args:
+        lane: One of LANES
+        tenant: Fair-share identity (API key name)
+        weight: Relative share of the lane for this tenant
+    """
+    token = _current.set((lane, tenant, max(1, weight)))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class _Ticket:
+    __slots__ = ("lane", "tenant", "start", "finish", "enqueued", "granted")
+
+    def __init__(self, lane: str, tenant: str, start: float, finish: float):
+        self.lane = lane
+        self.tenant = tenant
+        self.start = start
+        self.finish = finish
+        self.enqueued = time.monotonic()
+        self.granted = False
+
+
+class _Lane:
+    """Queue of one lane with start-time fair queuing between tenants"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queues: Dict[str, Deque[_Ticket]] = {}
+        self.last_finish: Dict[str, float] = {}
+        self.virtual_time = 0.0
+        self.in_flight = 0
+        self.waiting = 0
+        self.granted = 0
+        self.timeouts = 0
+        self.waits: Deque[float] = collections.deque(maxlen=1000)
+
+    def enqueue(self, tenant: str, weight: int) -> _Ticket:
+        start = max(self.virtual_time, self.last_finish.get(tenant, 0.0))
+        ticket = _Ticket(self.name, tenant, start, start + 1.0 / weight)
+        self.last_finish[tenant] = ticket.finish
+        self.queues.setdefault(tenant, collections.deque()).append(ticket)
+        self.waiting += 1
+        return ticket
+
+    def pop(self) -> Optional[_Ticket]:
+        """Remove the head ticket with the smallest start tag"""
+        best: Optional[_Ticket] = None
+        for queue in self.queues.values():
+            if queue and (best is None or queue[0].start < best.start):
+                best = queue[0]
+        if best is None:
+            return None
+        self.virtual_time = max(self.virtual_time, best.start)
+        self._remove(best)
+        return best
+
+    def _remove(self, ticket: _Ticket) -> None:
+        queue = self.queues[ticket.tenant]
+        queue.remove(ticket)
+        if not queue:
+            del self.queues[ticket.tenant]
+            if ticket.tenant in self.last_finish and self.last_finish[ticket.tenant] <= self.virtual_time:
+                del self.last_finish[ticket.tenant]
+        self.waiting -= 1
+
+    def cancel(self, ticket: _Ticket) -> None:
+        self._remove(ticket)
+        self.timeouts += 1
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self.waits)
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.waiting,
+            "granted": self.granted,
+            "timeouts": self.timeouts,
+            "wait_ms_p50": round(waits[len(waits) // 2] * 1000, 1) if waits else 0.0,
+            "wait_ms_p95": round(waits[int(len(waits) * 0.95)] * 1000, 1) if waits else 0.0,
+            "wait_ms_max": round(waits[-1] * 1000, 1) if waits else 0.0,
+        }
+
+
+class Scheduler:
+    """Global upstream concurrency budget shared by priority lanes"""
+
+    def __init__(self, max_concurrency: int = 8, queue_timeout: float = 60.0,
+                 latency_tolerance: float = 2.0, latency_window: int = 50,
+                 batch_queue_timeout: Optional[float] = None):
+        """
+        Args:
+            max_concurrency: Model calls allowed in flight at once
+            queue_timeout: Seconds an interactive or job call may wait for a
+                slot before SchedulerTimeout
+            latency_tolerance: Batch concurrency shrinks when a call takes longer
+                than this multiple of the best recent latency
+            latency_window: Recent latencies the baseline is taken from
+            batch_queue_timeout: Seconds a batch call may wait for a slot, or
+                None to wait indefinitely (offline runs with no caller waiting)
+        """
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.batch_queue_timeout = batch_queue_timeout
+        self.latency_tolerance = latency_tolerance
+        self._lanes = {name: _Lane(name) for name in LANES}
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        # AIMD window for the batch lane (one slot always left to higher lanes)
+        self._batch_max = max(1, max_concurrency - 1)
+        self.batch_limit = float(max(1, self._batch_max // 2))
+        self._latencies: Deque[float] = collections.deque(maxlen=latency_window)
+        self._last_decrease = 0.0
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a concurrency slot for one model call in the current lane
+
+        Raises:
+            SchedulerTimeout: If the call was not granted a slot within its
+                lane's timeout
+        """
+        lane_name, tenant, weight = _current.get()
+        self._acquire(lane_name, tenant, weight)
+        started = time.monotonic()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._release(lane_name, time.monotonic() - started, failed)
+
+    def _acquire(self, lane_name: str, tenant: str, weight: int) -> None:
+        timeout = self.batch_queue_timeout if lane_name == "batch" else self.queue_timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            lane = self._lanes[lane_name]
+            ticket = lane.enqueue(tenant, weight)
+            self._dispatch()
+            while not ticket.granted:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    lane.cancel(ticket)
+                    logger.warning("Scheduler queue timeout in %s lane for %s", lane_name, tenant)
+                    raise SchedulerTimeout(
+                        f"No upstream capacity for {timeout:.0f}s ({lane_name} lane)"
+                    )
+                self._cond.wait(remaining)
+            lane.waits.append(time.monotonic() - ticket.enqueued)
+
+    def _lane_has_room(self, lane: _Lane) -> bool:
+        if lane.name == "batch":
+            return lane.in_flight < int(self.batch_limit)
+        return True
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting tickets, highest lane first (lock held)"""
+        granted = False
+        while self._in_flight < self.max_concurrency:
+            for name in LANES:
+                lane = self._lanes[name]
+                if lane.waiting and self._lane_has_room(lane):
+                    ticket = lane.pop()
+                    ticket.granted = True
+                    lane.in_flight += 1
+                    lane.granted += 1
+                    self._in_flight += 1
+                    granted = True
+                    break
+            else:
+                break
+        if granted:
+            self._cond.notify_all()
+
+    def _release(self, lane_name: str, latency: float, failed: bool) -> None:
+        with self._cond:
+            self._lanes[lane_name].in_flight -= 1
+            self._in_flight -= 1
+            self._adapt(latency, failed)
+            self._dispatch()
+
+    # ------------------------------------------------------------------
+    # AIMD
+    # ------------------------------------------------------------------
+
+    def _adapt(self, latency: float, failed: bool) -> None:
+        """Adjust the batch window from one finished call (lock held)"""
+        baseline = min(self._latencies) if self._latencies else latency
+        if not failed:
+            self._latencies.append(latency)
+        congested = failed or latency > baseline * self.latency_tolerance
+        now = time.monotonic()
+        if congested:
+            # At most one decrease per baseline latency, so a burst of slow
+            # calls from the same episode halves the window only once
+            if now - self._last_decrease >= baseline:
+                self._last_decrease = now
+                previous = self.batch_limit
+                self.batch_limit = max(1.0, self.batch_limit / 2)
+                if int(previous) != int(self.batch_limit):
+                    logger.info("Batch concurrency decreased to %d (latency %.1fs, baseline %.1fs%s)",
+                                int(self.batch_limit), latency, baseline, ", failed" if failed else "")
+        else:
+            self.batch_limit = min(float(self._batch_max), self.batch_limit + 1.0 / self.batch_limit)
+
+    # ------------------------------------------------------------------
+    # Observability
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-lane queue depth and wait times plus the batch window"""
+        with self._cond:
+            lanes: Dict[str, Any] = {name: lane.stats() for name, lane in self._lanes.items()}
+            latencies: List[float] = list(self._latencies)
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "batch_limit": int(self.batch_limit),
+                "latency_baseline_ms": round(min(latencies) * 1000) if latencies else None,
+                "lanes": lanes,
+            }
@@ -0,0 +1,269 @@
+"""Deterministic zone scorer
+
+Applies the precedence rules from the developer prompt (gates, then
+accumulative scoring, then Zone 3 sub-zones) to an assessment using the
+point values in services.question_catalog. No model call is involved, so
+the result is reproducible and fast enough for offline batch runs, replay
+checks and incremental re-scoring.
+"""
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from services.question_catalog import QUESTIONS, QUESTIONS_BY_CODE, get_answer
+from utils.hashing import canonical_json, sha256_hex
+
+MAIN_ZONES = ("1", "3", "4", "5")
+SUBZONES = ("A", "B", "C")
+
+# Ties on points go to the earlier zone: endorsement is the least disruptive call
+ZONE_TIE_ORDER = ("3", "1", "4", "5")
+
+ZONE_NAMES = {
+    "1": "Full Masterbrand Integration",
+    "3": "Endorsed Brand",
+    "4": "High-Stakes Independence",
+    "5": "Legal/Accounting/Integration Hold",
+}
+
+# Identifies the scoring table, so cached deterministic results are
+# invalidated whenever point values or gates change
+SCORER_HASH = sha256_hex(canonical_json([
+    [q.code, q.gate, [[str(answer), points] for answer, points in q.scoring.items()]]
+    for q in QUESTIONS
+]))
+
+
+def _contribution(question, answer: Any) -> Dict[str, int]:
+    """Points a single answer contributes, keyed by zone/sub-zone target"""
+    if answer is None:
+        return {}
+    if question.is_bracket:
+        answer = str(answer).strip()
+    elif not isinstance(answer, bool):
+        return {}
+    return dict(question.scoring.get(answer, {}))
+
+
+def _apply(tallies: Dict[str, int], subtallies: Dict[str, int],
+           points: Dict[str, int], sign: int = 1) -> None:
+    """Add (or with sign=-1 remove) a contribution to the running tallies"""
+    for target, value in points.items():
+        if target in tallies:
+            tallies[target] += sign * value
+        else:
+            subtallies[target[-1]] += sign * value
+
+
+def _decide(tallies: Dict[str, int], subtallies: Dict[str, int],
+            gates: List[str], answered: int) -> Dict[str, Any]:
+    """Pick the winning zone/sub-zone from tallies and gates"""
+    gate_zones = {QUESTIONS_BY_CODE[code].gate for code in gates}
+    if "5" in gate_zones:
+        zone = "5"
+    elif "4" in gate_zones:
+        zone = "4"
+    else:
+        zone = max(ZONE_TIE_ORDER, key=lambda z: (tallies[z], -ZONE_TIE_ORDER.index(z)))
+
+    runner_up = max(
+        (z for z in ZONE_TIE_ORDER if z != zone),
+        key=lambda z: (tallies[z], -ZONE_TIE_ORDER.index(z))
+    )
+    margin = tallies[zone] - tallies[runner_up]
+
+    subzone = ""
+    if zone == "3":
+        subzone = max(SUBZONES, key=lambda s: (subtallies[s], -SUBZONES.index(s)))
+
+    # Same structure as the prompt's confidence block, from deterministic signals
+    gated = bool(gates)
+    evidence = 40 if gated else round(40 * min(1.0, max(0, tallies[zone]) / 20))
+    completeness = round(30 * answered / len(QUESTIONS))
+    conflict_resolution = 30 if gated else min(30, max(0, margin) * 3)
+
+    return {
+        "zone": zone,
+        "subzone": subzone,
+        "zone_name": ZONE_NAMES[zone],
+        "runner_up": runner_up,
+        "margin": margin,
+        "confidence": evidence + completeness + conflict_resolution,
+    }
+
+
+def score_assessment(assessment: Dict[str, Any]) -> Dict[str, Any]:
+    """Score an assessment deterministically
+
+    Args:
+        assessment: Brand architecture assessment data
+
+    Returns:
+        Dict with the winning zone, subzone, zone_name, runner_up, margin,
+        confidence, triggered gates, main-zone and sub-zone tallies, the
+        number of answered questions and per-question contributions
+    """
+    tallies = {z: 0 for z in MAIN_ZONES}
+    subtallies = {s: 0 for s in SUBZONES}
+    contributions: Dict[str, Dict[str, int]] = {}
+    gates: List[str] = []
+    answered = 0
+
+    for question in QUESTIONS:
+        answer = get_answer(assessment, question)
+        if answer is None:
+            continue
+        answered += 1
+        if question.gate and answer is True:
+            gates.append(question.code)
+        points = _contribution(question, answer)
+        if points:
+            contributions[question.code] = points
+            _apply(tallies, subtallies, points)
+
+    return {
+        **_decide(tallies, subtallies, gates, answered),
+        "gates": gates,
+        "zones": tallies,
+        "subzones": subtallies,
+        "answered": answered,
+        "contributions": contributions,
+    }
+
+
+def rescore(previous: Dict[str, Any], old_assessment: Dict[str, Any],
+            assessment: Dict[str, Any], changed_codes: Iterable[str]) -> Dict[str, Any]:
+    """Incrementally update a previous score after some answers changed
+
+    Only the changed questions are re-evaluated: their old contributions are
+    subtracted from the previous tallies and the new ones added.
+
+    Args:
+        previous: Result of score_assessment (or rescore) for old_assessment
+        old_assessment: The assessment previous was computed from
+        assessment: The updated assessment
+        changed_codes: Question codes whose answers may have changed
+
+    Returns:
+        A new score dict, identical to score_assessment(assessment)
+    """
+    tallies = dict(previous["zones"])
+    subtallies = dict(previous["subzones"])
+    contributions = {code: dict(points) for code, points in previous["contributions"].items()}
+    gates = set(previous["gates"])
+    answered = previous["answered"]
+
+    for code in changed_codes:
+        question = QUESTIONS_BY_CODE.get(code)
+        if question is None:
+            continue
+        old_points = contributions.pop(code, {})
+        _apply(tallies, subtallies, old_points, sign=-1)
+
+        answer = get_answer(assessment, question)
+        was_answered = get_answer(old_assessment, question) is not None
+        gates.discard(code)
+        if question.gate and answer is True:
+            gates.add(code)
+        points = _contribution(question, answer)
+        if points:
+            contributions[code] = points
+            _apply(tallies, subtallies, points)
+        answered += (answer is not None) - was_answered
+
+    ordered_gates = [q.code for q in QUESTIONS if q.code in gates]
+    return {
+        **_decide(tallies, subtallies, ordered_gates, answered),
+        "gates": ordered_gates,
+        "zones": tallies,
+        "subzones": subtallies,
+        "answered": answered,
+        "contributions": contributions,
+    }
+
+
+def _top_questions(score: Dict[str, Any], target: str, limit: int = 5) -> List[str]:
+    """Codes of the questions contributing most to a target, highest first"""
+    ranked = sorted(
+        ((points.get(target, 0), code) for code, points in score["contributions"].items()),
+        key=lambda item: -item[0]
+    )
+    return [code for points, code in ranked if points > 0][:limit]
+
+
+def render_scoring_breakdown(score: Dict[str, Any]) -> str:
+    """Render the SCORING BREAKDOWN section in the developer prompt's format"""
+    lines = ["**SCORING BREAKDOWN**", "", "Main Zones:"]
+    for zone in MAIN_ZONES:
+        marker = " ← WINNER" if zone == score["zone"] else ""
+        top = ", ".join(_top_questions(score, zone)) or "no contributing answers"
+        lines.append(f"- Zone {zone}: {score['zones'][zone]} points{marker} ({top})")
+
+    if score["zone"] == "3":
+        lines += ["", "Zone 3 Sub-zones:"]
+        names = {"A": "Lockup", "B": "Sub-brand", "C": "Integrated"}
+        for sub in SUBZONES:
+            marker = " ← WINNER" if sub == score["subzone"] else ""
+            top = ", ".join(_top_questions(score, f"3{sub}", 3)) or "no indicators"
+            lines.append(f"- 3{sub} ({names[sub]}): {score['subzones'][sub]} points{marker} ({top})")
+
+    if score["gates"]:
+        lines += ["", f"Gating: {', '.join(score['gates'])} → Zone {score['zone']}"]
+    lines += ["", f"Winner Margin: {score['margin']} points ahead of Zone {score['runner_up']}"]
+    return "\n".join(lines)
+
+
+def build_summary(assessment: Dict[str, Any], score: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a machine-readable summary (MACHINE_JSON_SCHEMA shape) from a score"""
+    winner = f"3{score['subzone']}" if score["subzone"] else score["zone"]
+    return {
+        "brand": str(assessment.get("brand", "Unknown")),
+        "zone": score["zone"],
+        "zone_name": score["zone_name"],
+        "subzone": score["subzone"],
+        "confidence": score["confidence"],
+        "drivers": [QUESTIONS_BY_CODE[c].label + f" ({c})" for c in score["gates"] or _top_questions(score, winner)],
+        "conflicts": [QUESTIONS_BY_CODE[c].label + f" ({c})" for c in _top_questions(score, score["runner_up"], 3)],
+        "risks": [],
+        "next_steps": [],
+    }
+
+
+def build_deterministic_report(assessment: Dict[str, Any],
+                               score: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Produce a report without a model call
+
+    Args:
+        assessment: Brand architecture assessment data
+        score: Precomputed score (computed if omitted)
+
+    Returns:
+        Dict with 'report_markdown', 'summary', 'metadata' and 'scores' keys,
+        shaped like OpenAIService.generate_zone_report results
+    """
+    score = score or score_assessment(assessment)
+    summary = build_summary(assessment, score)
+    label = f"{score['zone']}{score['subzone']}"
+
+    markdown = "\n".join([
+        f"# Zone {label} — {score['zone_name']} (Recommended)",
+        "",
+        f"**CONCLUSION:** {summary['brand']} scores highest for Zone {label} under the deterministic "
+        "HEX 5112 tally; no model narrative was generated.",
+        "",
+        f"**Confidence: {score['confidence']}/100** (deterministic estimate)",
+        "",
+        render_scoring_breakdown(score),
+        "",
+        "**Machine-Readable Summary**",
+        "```json",
+        json.dumps(summary, ensure_ascii=False, indent=2),
+        "```",
+        "",
+    ])
+
+    return {
+        "report_markdown": markdown,
+        "summary": summary,
+        "metadata": {"model": "deterministic", "prompt_hash": SCORER_HASH, "latency_ms": 0, "usage": {}},
+        "scores": score,
+    }
@@ -0,0 +1,220 @@
+"""Seeded synthetic assessments for load, fuzz and scorer testing
+
+Answers are drawn from the question catalog (services.question_catalog), so
+every generated assessment uses the form's keys and answer domains. The
+samples/ folder holds one real assessment, and sending it over and over
+mostly exercises caches.
+
+Item i of seed s is always the same assessment, whatever the count or start
+offset, so a run can be split across workers (start=k * n) or resumed. The
+mix of answers is set by a SyntheticProfile:
+
+- true_rate: chance a yes/no question is answered Yes
+- missing_rate: chance a question is left unanswered
+- gate_rate: chance an item has exactly one Zone 4/5 gate answered Yes;
+  every other item answers its gates No (or leaves them unanswered). Drawing
+  gates like other Yes/No questions would gate almost every item.
+- weights: per-question answer weights, e.g. {"Z4Q1": {">70": 3}};
+  answers left out keep weight 1
+
+gate_cases() adds edge cases the random mix rarely produces: each gate alone,
+Zone 4 and Zone 5 gates together, and gates left unanswered.
+"""
+import bisect
+import datetime
+import random
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from services.question_catalog import BOOLEAN, QUESTIONS, Question
+
+DIVISIONS = (
+    "Autonomy & Positioning",
+    "Geosystems",
+    "Manufacturing Intelligence",
+    "Asset Lifecycle Intelligence",
+    "Safety, Infrastructure & Geospatial",
+)
+
+FIRST_DATE = datetime.date(2025, 1, 1)
+GATES: Tuple[Question, ...] = tuple(q for q in QUESTIONS if q.gate)
+
+
+@dataclass(frozen=True)
+class SyntheticProfile:
+    """Answer distribution of generated assessments"""
+    true_rate: float = 0.3
+    missing_rate: float = 0.02
+    gate_rate: float = 0.05
+    weights: Dict[str, Dict[Any, float]] = field(default_factory=dict)
+    divisions: Tuple[str, ...] = DIVISIONS
+    days: int = 365  # date_completed falls within this many days of FIRST_DATE
+
+
+DEFAULT_PROFILE = SyntheticProfile()
+
+
+def _sampler(question: Question, profile: SyntheticProfile) -> Callable[[random.Random], Any]:
+    """Draw one answer to a non-gate question (None: unanswered)"""
+    weights = profile.weights.get(question.code, {})
+    if question.domain == BOOLEAN and not weights:
+        true_rate, missing_rate = profile.true_rate, profile.missing_rate
+
+        def draw(rng: random.Random) -> Any:
+            if rng.random() < missing_rate:
+                return None
+            return rng.random() < true_rate
+        return draw
+
+    answers = list(question.domain)
+    cumulative: List[float] = []
+    total = 0.0
+    for answer in answers:
+        total += weights.get(answer, 1.0)
+        cumulative.append(total)
+    missing_rate = profile.missing_rate
+
+    def draw(rng: random.Random) -> Any:
+        if rng.random() < missing_rate:
+            return None
+        return answers[bisect.bisect_right(cumulative, rng.random() * total)]
+    return draw
+
+
+class SyntheticGenerator:
+    """Assessments drawn from the catalog under one profile and seed"""
+
+    def __init__(self, seed: int = 0, profile: SyntheticProfile = DEFAULT_PROFILE):
+        """
+        Args:
+            seed: Base seed; item i is drawn from (seed, i) alone
+            profile: Answer distribution
+
+        Raises:
+            ValueError: If the profile has a rate outside [0, 1], an empty
+                division list, weights for an unknown question or answer, a
+                negative weight or a question whose weights are all zero
+        """
+        for name in ("true_rate", "missing_rate", "gate_rate"):
+            if not 0.0 <= getattr(profile, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if not profile.divisions:
+            raise ValueError("divisions must not be empty")
+        by_code = {q.code: q for q in QUESTIONS}
+        for code, answers in profile.weights.items():
+            if code not in by_code:
+                raise ValueError(f"Unknown question {code!r} in weights")
+            unknown = set(answers) - set(by_code[code].domain)
+            if unknown:
+                raise ValueError(f"Answers {sorted(map(str, unknown))} are not in the domain of {code}")
+            values = [answers.get(answer, 1.0) for answer in by_code[code].domain]
+            if any(not isinstance(v, (int, float)) or isinstance(v, bool) or v < 0 for v in values):
+                raise ValueError(f"Weights of {code} must be non-negative numbers")
+            if not sum(values) > 0:
+                raise ValueError(f"Weights of {code} must not all be zero")
+        self.seed = seed
+        self.profile = profile
+        self._rng = random.Random()
+        # (question, sampler or None for gates), in catalog (form) order
+        self._plan = [(q, None if q.gate else _sampler(q, profile)) for q in QUESTIONS]
+
+    def assessment(self, index: int) -> Dict[str, Any]:
+        """Item index of this generator's sequence"""
+        rng = self._rng
+        rng.seed((self.seed << 32) ^ index)
+        profile = self.profile
+        gate = rng.choice(GATES) if rng.random() < profile.gate_rate else None
+        date = FIRST_DATE + datetime.timedelta(days=rng.randrange(profile.days))
+        assessment: Dict[str, Any] = {
+            "brand": f"Synthetic {index:07d}",
+            "division": rng.choice(profile.divisions),
+            "contact": "Synthetic generator",
+            "date_completed": date.isoformat(),
+        }
+        nodes: Dict[Tuple[str, ...], Dict[str, Any]] = {(): assessment}
+        for question, draw in self._plan:
+            if draw is None:
+                if question is gate:
+                    answer = True
+                else:
+                    answer = None if rng.random() < profile.missing_rate else False
+            else:
+                answer = draw(rng)
+            if answer is None:
+                continue
+            node = nodes.get(question.section)
+            if node is None:
+                node = nodes[question.section] = {}
+                nodes[question.section[:-1]][question.section[-1]] = node
+            node[question.key] = answer
+        return assessment
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.generate()
+
+    def generate(self, count: Optional[int] = None, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """Items start, start + 1, ... (endless when count is None)"""
+        index = start
+        while count is None or index < start + count:
+            yield self.assessment(index)
+            index += 1
+
+
+def generate_assessments(count: Optional[int] = None, seed: int = 0,
+                         profile: SyntheticProfile = DEFAULT_PROFILE,
+                         start: int = 0) -> Iterator[Dict[str, Any]]:
+    """Stream synthetic assessments
+
+    Args:
+        count: Number of assessments, or None for an endless stream
+        seed: Base seed
+        profile: Answer distribution
+        start: Index of the first item
+
+    Returns:
+        Iterator of assessment dicts, built one at a time
+    """
+    return SyntheticGenerator(seed, profile).generate(count, start)
+
+
+def gate_cases(seed: int = 0, profile: SyntheticProfile = DEFAULT_PROFILE) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Edge cases around the Zone 4/5 gates, as (case, assessment)
+
+    Each case starts from an ungated random assessment:
+
+    - "gate:<code>": that gate alone is answered Yes (forces its zone)
+    - "gate:<Z4 code>+<Z5 code>": one gate of each zone (Zone 5 wins)
+    - "gates-unanswered": no gate question answered (no gate fires)
+    """
+    generator = SyntheticGenerator(seed, replace(profile, gate_rate=0.0))
+
+    def base(index: int, case: str) -> Dict[str, Any]:
+        assessment = generator.assessment(index)
+        assessment["brand"] = f"Edge {case}"
+        return assessment
+
+    def set_answer(assessment: Dict[str, Any], question: Question, answer: Any) -> None:
+        node = assessment
+        for part in question.section:
+            node = node.setdefault(part, {})
+        node[question.key] = answer
+
+    for index, gate in enumerate(GATES):
+        case = f"gate:{gate.code}"
+        assessment = base(index, case)
+        set_answer(assessment, gate, True)
+        yield case, assessment
+
+    zone4 = next(q for q in GATES if q.gate == "4")
+    zone5 = next(q for q in GATES if q.gate == "5")
+    case = f"gate:{zone4.code}+{zone5.code}"
+    assessment = base(len(GATES), case)
+    set_answer(assessment, zone4, True)
+    set_answer(assessment, zone5, True)
+    yield case, assessment
+
+    case = "gates-unanswered"
+    assessment = base(len(GATES) + 1, case)
+    for gate in GATES:
+        assessment.get(gate.section[0], {}).pop(gate.key, None)
+    yield case, assessment
@@ -0,0 +1,203 @@
+"""Consistency checks between a model's zone call and the assessment answers
+
+The checks are declared as data in VALIDATION_RULES, referring to questions
+by their catalog code. compile_validation_table() resolves them once into a
+flat table: every key path any rule reads is listed once, with an accessor,
+and each rule becomes a list of (path index, accepted answers) signals. A
+validation then reads each path once and evaluates the rules in one loop,
+with no nested dict walking per rule.
+
+The rules are declared here, not read from the HEX 5112 file, so a table is
+compiled once per rule set. The rules-file hash only labels the results:
+each validation block names the rules file of the prompt that produced the
+zone call it checked.
+"""
+import copy
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional, Sequence, Tuple
+
+from services.question_catalog import QUESTIONS_BY_CODE
+from utils.hashing import canonical_json, sha256_hex
+
+# Strong indicators that a Zone 3 brand belongs in 3A rather than 3B/3C
+Z3A_INDICATORS = ("Z3Q3", "Z3Q8a", "Z3Q8b", "Z3FQ30a", "Z3Q2", ("Z1Q1", ("20-70",)))
+
+# Each rule fires when the assigned zone matches "zones" (or does not match
+# "except_zones") and the number of signals present is within [min, max].
+# A signal is a question code (present when answered True) or a
+# (code, accepted answers) pair.
+VALIDATION_RULES: Tuple[Dict[str, Any], ...] = (
+    {"id": "z5_gate_ignored", "severity": "error", "except_zones": ("5",),
+     "signals": ("Z5Q1",), "min": 1,
+     "message": "Zone 5 gating condition present but Zone {assigned} assigned: {present}"},
+    {"id": "z4_triggers_ignored", "severity": "warning", "except_zones": ("4",),
+     "signals": ("Z4Q2", "Z4Q3", "Z4Q8", "Z4Q9"), "min": 1,
+     "message": "{count} Zone 4 trigger(s) present but Zone {assigned} assigned: {present}"},
+    {"id": "z3a_thin_evidence", "severity": "warning", "zones": ("3A",),
+     "signals": Z3A_INDICATORS, "max": 1,
+     "message": "Zone 3A assigned but only {count} strong Zone 3A indicator(s) found"},
+    {"id": "z3b_may_be_3a", "severity": "warning", "zones": ("3B",),
+     "signals": Z3A_INDICATORS, "min": 3,
+     "message": "Zone 3B assigned but {count} Zone 3A indicators present (may warrant 3A): {present}"},
+    {"id": "z3c_independent_budget", "severity": "warning", "zones": ("3C",),
+     "signals": ("Z3Q10",), "min": 1,
+     "message": "Zone 3C assigned but brand has an independent marketing budget (usually 3A/3B)"},
+    {"id": "z1_revenue_share", "severity": "warning", "zones": ("1",),
+     "signals": (("Z1Q1", ("20-70", "> 70")),), "min": 1,
+     "message": "Zone 1 assigned but revenue contribution is {answers} (usually 3A)"},
+)
+
+_SEVERITY_ORDER = {"ok": 0, "warning": 1, "error": 2}
+
+
+class ValidationRuleError(ValueError):
+    """Raised when a rule declaration cannot be compiled"""
+    pass
+
+
+def _accessor(path: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Any]:
+    """Getter for a key path; missing or non-dict levels read as None"""
+    if len(path) == 2:
+        first, second = path
+
+        def get(assessment: Dict[str, Any]) -> Any:
+            section = assessment.get(first)
+            return section.get(second) if isinstance(section, dict) else None
+        return get
+
+    def get_deep(assessment: Dict[str, Any]) -> Any:
+        node: Any = assessment
+        for part in path:
+            if not isinstance(node, dict):
+                return None
+            node = node.get(part)
+        return node
+    return get_deep
+
+
+class _Rule(NamedTuple):
+    id: str
+    severity: str
+    zones: Optional[FrozenSet[str]]
+    except_zones: FrozenSet[str]
+    signals: Tuple[Tuple[int, FrozenSet[Any], str], ...]  # (path index, accepted, code)
+    min: int
+    max: Optional[int]
+    message: str
+
+
+class ValidationTable:
+    """Compiled validation rules"""
+
+    def __init__(self, rules: Sequence[Dict[str, Any]], rules_hash: Optional[str] = None):
+        """
+        Args:
+            rules: Rule declarations (see VALIDATION_RULES)
+            rules_hash: Hash of the rules file whose results the table labels
+
+        Raises:
+            ValidationRuleError: If a rule refers to an unknown question
+        """
+        self.rules_hash = rules_hash
+        paths: Dict[Tuple[str, ...], int] = {}
+        compiled = []
+        for rule in rules:
+            signals = []
+            for signal in rule["signals"]:
+                code, accepted = (signal, (True,)) if isinstance(signal, str) else signal
+                question = QUESTIONS_BY_CODE.get(code)
+                if question is None:
+                    raise ValidationRuleError(f"Rule {rule['id']!r}: unknown question {code!r}")
+                index = paths.setdefault(question.path, len(paths))
+                signals.append((index, frozenset(accepted), code))
+            compiled.append(_Rule(
+                id=rule["id"],
+                severity=rule["severity"],
+                zones=frozenset(rule["zones"]) if "zones" in rule else None,
+                except_zones=frozenset(rule.get("except_zones", ())),
+                signals=tuple(signals),
+                min=rule.get("min", 0),
+                max=rule.get("max"),
+                message=rule["message"],
+            ))
+        self.paths = tuple(paths)
+        self._accessors = tuple(_accessor(path) for path in self.paths)
+        self._rules = tuple(compiled)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def labelled(self, rules_hash: Optional[str]) -> "ValidationTable":
+        """Same compiled rules under another rules-file label (nothing is recompiled)"""
+        table = copy.copy(self)
+        table.rules_hash = rules_hash
+        return table
+
+    def validate(self, assessment: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Check a zone call against the assessment
+
+        Args:
+            assessment: Brand architecture assessment data
+            summary: Parsed report summary (zone, subzone)
+
+        Returns:
+            {"status": "ok" | "warning" | "error", "rules_hash", "findings":
+            [{"rule", "severity", "message", "questions"}]}
+        """
+        zone = str(summary.get("zone") or "")
+        assigned = zone + (str(summary.get("subzone") or "").upper() if zone == "3" else "")
+        values = [get(assessment) for get in self._accessors]
+
+        findings = []
+        status = "ok"
+        for rule in self._rules:
+            if rule.zones is not None and assigned not in rule.zones and zone not in rule.zones:
+                continue
+            if assigned in rule.except_zones or zone in rule.except_zones:
+                continue
+            present = [code for index, accepted, code in rule.signals
+                       if _hashable(values[index]) in accepted]
+            count = len(present)
+            if count < rule.min or (rule.max is not None and count > rule.max):
+                continue
+            answers = ", ".join(str(values[index]) for index, accepted, code in rule.signals if code in present)
+            findings.append({
+                "rule": rule.id,
+                "severity": rule.severity,
+                "message": rule.message.format(assigned=assigned or "?", count=count,
+                                               present=", ".join(present), answers=answers),
+                "questions": present,
+            })
+            if _SEVERITY_ORDER[rule.severity] > _SEVERITY_ORDER[status]:
+                status = rule.severity
+        return {"status": status, "rules_hash": self.rules_hash, "findings": findings}
+
+
+def _hashable(value: Any) -> Any:
+    """Answers are compared by set membership; unhashable answers never match"""
+    return value if isinstance(value, (str, int, float, bool, type(None))) else None
+
+
+_TABLES: Dict[str, ValidationTable] = {}
+
+
+def compile_validation_table(rules_text: str,
+                             rules: Sequence[Dict[str, Any]] = VALIDATION_RULES) -> ValidationTable:
+    """Validation table for a rule set, labelled with a rules file's hash
+
+    The compiled rules are shared by every table of the same rule set; the
+    rules file does not change them.
+
+    Args:
+        rules_text: Content of the HEX 5112 rules file ("" when absent), used
+            only for the rules_hash label of validation results
+        rules: Rule declarations
+
+    Returns:
+        Table sharing the cached compiled rules, labelled with the file's hash
+    """
+    key = sha256_hex(canonical_json([dict(rule) for rule in rules]))
+    table = _TABLES.get(key)
+    if table is None:
+        table = _TABLES.setdefault(key, ValidationTable(rules))
+    rules_hash = sha256_hex(rules_text) if rules_text else None
+    return table if table.rules_hash == rules_hash else table.labelled(rules_hash)
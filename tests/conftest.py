@@ -1,6 +1,21 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def results_db(tmp_path_factory):
+    """Point the results database (shared by the idempotency keys) at a temporary file
+
+    Runs before any test imports app, so the suite never writes data/zonings.db
+    and runs never share stored results.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        path = tmp_path_factory.mktemp("results") / "zonings.db"
+        mp.setenv("RESULTS_DB_PATH", str(path))
+        yield path
@@ -85,6 +85,25 @@ def test_zone_endpoint_returns_report_and_summary(mock_env):
     assert data["summary"]["brand"] == "Test"
 
 
+def test_zone_endpoint_passes_votes_and_bounds_them(mock_env):
+    """POST /zone?votes=N should request N samples; out-of-range values are rejected"""
+    from app import app
+    client = TestClient(app)
+
+    mock_result = {"report_markdown": "# Zone 1", "summary": {"brand": "Test", "zone": "1"}}
+
+    with patch("app.openai_service.generate_zone_report", return_value=mock_result) as generate, \
+            patch("app.results_store.record", return_value="r1"):
+        response = client.post("/zone?votes=5", json={"brand": "Votes Brand"},
+                               headers={"X-API-Key": "test-api-key-123"})
+        rejected = client.post("/zone?votes=50", json={"brand": "Votes Brand"},
+                               headers={"X-API-Key": "test-api-key-123"})
+
+    assert response.status_code == 200
+    assert generate.call_args.args[1] == 5
+    assert rejected.status_code == 422
+
+
 def test_zone_endpoint_handles_openai_errors(mock_env):
     """POST /zone should return 503 on OpenAI service errors"""
     from app import app
@@ -120,3 +139,22 @@ def test_zone_endpoint_requires_api_key(mock_env):
     )
     assert response.status_code == 401
     assert "Invalid API key" in response.json()["detail"]
+
+
+def test_oversized_request_bodies_are_rejected_with_413(mock_env):
+    """Bodies above MAX_REQUEST_BYTES should get 413, whether declared or streamed"""
+    from app import app, config
+    client = TestClient(app)
+    body = b'{"brand": "' + b"x" * config.max_request_bytes + b'"}'
+
+    with patch("app.openai_service.generate_zone_report") as generate:
+        declared = client.post("/zone", content=body, headers={"X-API-Key": "test-api-key-123",
+                                                               "Content-Type": "application/json"})
+        streamed = client.post("/zone", content=iter([body[:1000], body[1000:]]),
+                               headers={"X-API-Key": "test-api-key-123",
+                                        "Content-Type": "application/json"})
+
+    assert declared.status_code == 413
+    assert streamed.status_code == 413
+    assert "exceeds" in streamed.json()["detail"]
+    generate.assert_not_called()
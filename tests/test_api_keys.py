@@ -0,0 +1,126 @@
+import json
+import os
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from services.api_keys import APIKeyError, KeyRegistry, key_digest, parse_registry
+
+
+def _write(path, *entries):
+    path.write_text(json.dumps({"keys": list(entries)}))
+
+
+def _entry(name, secret, **limits):
+    return {"name": name, "key_sha256": key_digest(secret), **limits}
+
+
+def test_parse_registry_rejects_invalid_entries():
+    """Bad digests, priorities, limits, duplicates and reserved names should be rejected"""
+    with pytest.raises(APIKeyError):
+        parse_registry({"keys": [{"name": "a", "key_sha256": "abc"}]})
+    with pytest.raises(APIKeyError):
+        parse_registry({"keys": [_entry("a", "s1", priority="urgent")]})
+    with pytest.raises(APIKeyError):
+        parse_registry({"keys": [_entry("a", "s1", rate_limit="lots")]})
+    with pytest.raises(APIKeyError):
+        parse_registry({"keys": [_entry("a", "s1", weight=0)]})
+    with pytest.raises(APIKeyError):
+        parse_registry({"keys": [_entry("a", "s1"), _entry("a", "s2")]})
+    with pytest.raises(APIKeyError):
+        parse_registry({"keys": [_entry("default", "s1")]})
+
+
+def test_registry_authenticates_file_and_env_keys(monkeypatch, tmp_path):
+    """Keys from the file and the legacy env var should both authenticate"""
+    monkeypatch.setenv("API_KEY", "legacy-secret")
+    path = tmp_path / "keys.json"
+    _write(path, _entry("importer", "hbz_import", priority="batch", max_concurrent=2, weight=3))
+
+    registry = KeyRegistry(str(path))
+
+    assert registry.authenticate("hbz_import").priority == "batch"
+    assert registry.authenticate("hbz_import").weight == 3
+    assert registry.authenticate("legacy-secret").name == "default"
+    assert registry.authenticate("wrong") is None
+    assert registry.authenticate(None) is None
+
+
+def test_registry_hot_reloads_and_keeps_keys_on_bad_edit(monkeypatch, tmp_path):
+    """A changed file should be picked up; an invalid one should be ignored"""
+    monkeypatch.delenv("API_KEY", raising=False)
+    path = tmp_path / "keys.json"
+    _write(path, _entry("one", "s1"))
+    registry = KeyRegistry(str(path), reload_interval=0)
+
+    _write(path, _entry("one", "s1"), _entry("two", "s2"))
+    os.utime(path, (1, 1))
+    assert registry.authenticate("s2").name == "two"
+
+    path.write_text("{not json")
+    os.utime(path, (2, 2))
+    assert registry.authenticate("s2").name == "two"
+
+    monkeypatch.setenv("API_KEY", "legacy-secret")
+    assert registry.authenticate("legacy-secret").name == "default"
+
+
+def test_registry_reads_env_key_once_per_interval(monkeypatch, tmp_path):
+    """The env var should only be re-read with the periodic reload"""
+    monkeypatch.setenv("API_KEY", "old-secret")
+    registry = KeyRegistry(str(tmp_path / "missing.json"), reload_interval=3600)
+
+    monkeypatch.setenv("API_KEY", "new-secret")
+    assert registry.authenticate("old-secret").name == "default"
+    assert registry.authenticate("new-secret") is None
+    registry.refresh(force=True)
+    assert registry.authenticate("new-secret").name == "default"
+
+
+def test_rate_concurrency_and_budget_limits(monkeypatch, tmp_path):
+    """Per-key limits should be enforced independently of other keys"""
+    monkeypatch.delenv("API_KEY", raising=False)
+    path = tmp_path / "keys.json"
+    _write(path, _entry("dash", "s1", rate_limit="2/minute", max_concurrent=1, daily_token_budget=100))
+    registry = KeyRegistry(str(path))
+    key = registry.authenticate("s1")
+
+    assert registry.allow_request(key) is None
+    assert registry.allow_request(key) is None
+    assert registry.allow_request(key) > 0
+
+    assert registry.acquire(key)
+    assert not registry.acquire(key)
+    registry.release(key)
+    assert registry.acquire(key)
+
+    registry.record_tokens(key, 60)
+    assert registry.budget_remaining(key) == 40
+    registry.record_tokens(key, 60)
+    assert registry.budget_remaining(key) == 0
+
+
+def test_zone_endpoint_enforces_key_budget_and_charges_tokens(monkeypatch, tmp_path):
+    """/zone should charge usage to the key and refuse it once the budget is spent"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+
+    path = tmp_path / "keys.json"
+    _write(path, _entry("dash", "hbz_dash", daily_token_budget=150))
+    registry = KeyRegistry(str(path))
+    result = {"report_markdown": "# Zone 1", "summary": {"zone": "1"},
+              "metadata": {"usage": {"total_tokens": 150}}}
+
+    with patch("app.api_keys", registry), \
+            patch("app.openai_service.generate_zone_report", return_value=result), \
+            patch("app.results_store.record", side_effect=lambda record: record["id"]):
+        first = client.post("/zone", json={"brand": "A"}, headers={"X-API-Key": "hbz_dash"})
+        second = client.post("/zone", json={"brand": "B"}, headers={"X-API-Key": "hbz_dash"})
+        stats = client.get("/metrics", headers={"X-API-Key": "hbz_dash"}).json()
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert "budget" in second.json()["detail"]
+    assert stats["api_keys"]["dash"]["tokens_today"] == 150
+    assert stats["api_keys"]["dash"]["in_flight"] == 0
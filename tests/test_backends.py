@@ -0,0 +1,70 @@
+import pytest
+from benchmarks.stub_upstream import StubUpstream
+from config import Config, ConfigError
+from services.backends import Backend, BackendProfile, profile_from_config
+from services.openai_service import OpenAIService
+
+
+def test_local_profiles_fold_the_developer_prompt_and_need_no_api_key(monkeypatch):
+    """A llama.cpp backend should default to its local URL, one system message and one slot"""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("BACKEND", "llama.cpp")
+    monkeypatch.setenv("OPENAI_MODEL", "qwen2.5-7b-instruct")
+
+    profile = profile_from_config(Config())
+
+    assert profile.base_url == "http://localhost:8080/v1"
+    assert profile.model == "qwen2.5-7b-instruct"
+    assert profile.max_concurrency == 1
+    assert [m["role"] for m in Backend(profile).messages("S", "D", "U")] == ["system", "user"]
+    assert Backend(profile).messages("S", "D", "U")[0]["content"] == "S\n\nD"
+    assert [m["role"] for m in Backend(BackendProfile("openai")).messages("S", "D", "U")] == \
+        ["system", "developer", "user"]
+
+
+def test_invalid_backend_settings_are_rejected(monkeypatch):
+    """Unknown backends and roles should fail at startup"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("BACKEND", "ollama")
+    with pytest.raises(ConfigError, match="BACKEND"):
+        Config()
+
+    monkeypatch.setenv("BACKEND", "vllm")
+    monkeypatch.setenv("BACKEND_DEVELOPER_ROLE", "assistant")
+    with pytest.raises(ConfigError, match="BACKEND_DEVELOPER_ROLE"):
+        Config()
+
+
+def test_service_zones_through_a_compatible_server(monkeypatch):
+    """OpenAIService should call a local server through the adapter and count its tokens"""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("BACKEND", "vllm")
+    monkeypatch.setenv("OPENAI_MODEL", "local-model")
+
+    with StubUpstream() as stub:
+        monkeypatch.setenv("BACKEND_BASE_URL", stub.base_url)
+        service = OpenAIService(Config())
+        result = service.generate_zone_report({"brand": "Stub"})
+
+    assert result["summary"]["zone"] == "3"
+    assert stub.last_request["model"] == "local-model"
+    assert [m["role"] for m in stub.last_request["messages"]] == ["system", "user"]
+    stats = service.backend.stats()
+    assert stats["name"] == "vllm"
+    assert stats["calls"] == 1
+    assert stats["total_tokens"] == result["metadata"]["usage"]["total_tokens"] > 0
+
+
+def test_health_reports_the_backend(monkeypatch):
+    """/health should name a self-hosted backend and report it configured, keeping the openai field"""
+    from unittest.mock import patch
+    from fastapi.testclient import TestClient
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    from app import app
+
+    local = Backend(BackendProfile("vllm", model="local-model", base_url="http://localhost:8000/v1"))
+    with patch("app.backend", local):
+        data = TestClient(app).get("/health").json()
+
+    assert (data["backend"], data["backend_status"]) == ("vllm", "configured")
+    assert data["openai"] == "configured"
@@ -0,0 +1,101 @@
+import asyncio
+import io
+import json
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from services.bulk import iter_bulk_results
+from services.openai_service import OpenAIServiceError
+from utils.ndjson import aiter_lines, iter_lines
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def _collect(aiterator):
+    return [item async for item in aiterator]
+
+
+def test_aiter_lines_handles_lines_split_across_chunks():
+    """aiter_lines should reassemble lines split between chunks and skip blanks"""
+    lines = asyncio.run(_collect(aiter_lines(_chunks(b'{"a":', b'1}\n\n{"b"', b':2}'), 100)))
+
+    assert lines == [(0, b'{"a":1}'), (1, b'{"b":2}')]
+
+
+def test_line_readers_replace_oversized_lines_with_placeholder():
+    """Oversized lines should keep their index but carry no payload"""
+    data = b'{"a":1}\n' + b"x" * 50 + b'\n{"b":2}\n'
+
+    sync_lines = list(iter_lines(io.BytesIO(data), 20))
+    async_lines = asyncio.run(_collect(aiter_lines(_chunks(data[:30], data[30:]), 20)))
+
+    assert sync_lines == [(0, b'{"a":1}'), (1, b""), (2, b'{"b":2}')]
+    assert async_lines == sync_lines
+
+
+def test_iter_bulk_results_yields_in_completion_order_with_bounded_concurrency():
+    """Results should stream as they complete, never exceeding the concurrency limit"""
+    active = 0
+    peak = 0
+
+    async def handler(assessment):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(assessment["delay"])
+        active -= 1
+        return {"brand": assessment["brand"]}
+
+    async def lines():
+        for index, delay in enumerate([0.2, 0.02, 0.05]):
+            yield index, json.dumps({"brand": f"B{index}", "delay": delay}).encode()
+
+    results = asyncio.run(_collect(iter_bulk_results(lines(), handler, concurrency=2)))
+
+    assert [r["index"] for r in results] == [1, 2, 0]
+    assert peak == 2
+
+
+def test_iter_bulk_results_maps_failures_to_error_records():
+    """Invalid lines and service errors should become per-item error records"""
+    async def handler(assessment):
+        raise OpenAIServiceError("upstream down")
+
+    async def lines():
+        yield 0, b"not json"
+        yield 1, b"[1, 2]"
+        yield 2, b'{"brand": "X"}'
+
+    results = sorted(asyncio.run(_collect(iter_bulk_results(lines(), handler, 4))), key=lambda r: r["index"])
+
+    assert [r["status"] for r in results] == [422, 422, 503]
+    assert "upstream down" in results[2]["error"]
+
+
+def test_zone_bulk_endpoint_streams_ndjson(monkeypatch):
+    """POST /zone/bulk should return one NDJSON line per input line"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+
+    def fake_report(assessment, votes=1):
+        return {"report_markdown": "# Zone 1", "summary": {"brand": assessment["brand"], "zone": "1"}}
+
+    body = b'{"brand": "A"}\n{"brand": "B"}\nnot json\n'
+    with patch("app.openai_service.generate_zone_report", side_effect=fake_report), \
+            patch("app.results_store.record", side_effect=lambda record: record["id"]):
+        response = client.post(
+            "/zone/bulk",
+            content=body,
+            headers={"X-API-Key": "test-api-key-123", "Content-Type": "application/x-ndjson"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda r: r["index"])
+    assert [r.get("summary", {}).get("brand") for r in records[:2]] == ["A", "B"]
+    assert all("result_id" in r for r in records[:2])
+    assert records[2]["status"] == 422
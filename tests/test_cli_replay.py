@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from cli.__main__ import main
+from cli.replay import compare
+from services.results_store import ResultsStore
+
+SAMPLE = Path(__file__).parent.parent / "samples" / "novatel_assessment.json"
+
+
+def _outcome(label, confidence=80, latency_ms=1000, total_tokens=2000):
+    return {"label": label, "confidence": confidence, "latency_ms": latency_ms,
+            "total_tokens": total_tokens, "replayed": False}
+
+
+def _corpus(tmp_path):
+    assessment = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    lines = [
+        json.dumps({"assessment": {**assessment, "brand": "Alpha"}, "expected": "3B"}),
+        json.dumps({"assessment": {**assessment, "brand": "Beta"}, "expected": {"zone": "1", "subzone": ""}}),
+        json.dumps({**assessment, "brand": "Gamma"}),
+    ]
+    path = tmp_path / "corpus.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_compare_builds_confusion_drift_and_deltas():
+    """Two bundles should be compared on zones, subzones, confidence, latency and tokens"""
+    baseline = [_outcome("3A", 80), _outcome("1", 90), _outcome("4", 70)]
+    candidate = [_outcome("3B", 70, 1500, 1500), _outcome("1", 94, 1500, 1500), _outcome("3A", 60, 1500, 1500)]
+
+    report = compare(["a", "b", "c"], ["3B", "1", None], baseline, candidate)
+
+    assert report["zone_agreement"] == 2
+    assert report["label_agreement"] == 1
+    assert report["zone_matrix"] == {"3": {"3": 1}, "1": {"1": 1}, "4": {"3": 1}}
+    assert report["label_matrix"]["3A"] == {"3B": 1}
+    assert report["confidence_drift"] == {"mean": -5.3, "mean_abs": 8.0, "max_abs": 10}
+    assert report["latency_ms_delta"] == 500.0
+    assert report["total_tokens_delta"] == -500.0
+    assert [f["source"] for f in report["flips"]] == ["a", "c"]
+    assert report["baseline"]["vs_expected"]["label_correct"] == 1
+    assert report["candidate"]["vs_expected"]["label_correct"] == 2
+
+
+def test_replay_deterministic_mode_compares_with_labels(tmp_path, capsys):
+    """--deterministic should score the corpus locally and report label mismatches"""
+    corpus = _corpus(tmp_path)
+
+    code = main(["replay", str(corpus), "--deterministic", "--json", str(tmp_path / "report.json")])
+
+    report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    assert code == 0
+    assert report["bundles"] == {"baseline": "deterministic", "candidate": None}
+    assert report["items"] == 3
+    assert report["baseline"]["vs_expected"]["labelled"] == 2
+    assert "Labels vs baseline" in capsys.readouterr().out
+
+
+def test_replay_records_and_replays_model_responses(monkeypatch, tmp_path):
+    """A second run should replay recorded model responses instead of calling the API"""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    corpus = _corpus(tmp_path)
+    result = {
+        "report_markdown": "# Zone 1",
+        "summary": {"zone": "1", "subzone": "", "confidence": 85},
+        "metadata": {"model": "gpt-test", "latency_ms": 1200, "usage": {"total_tokens": 3000}},
+    }
+
+    def generate(service, assessment):
+        return {**result, "metadata": {**result["metadata"], "prompt_hash": service.prompt_hash}}
+
+    args = ["replay", str(corpus), "--baseline", "deterministic", "--candidate", "llm",
+            "--db", str(tmp_path / "zonings.db"), "--json", str(tmp_path / "report.json")]
+    with patch("services.openai_service.OpenAIService.generate_zone_report", autospec=True,
+               side_effect=generate) as mock_generate:
+        main(args)
+        assert mock_generate.call_count == 3
+        main(args)
+        assert mock_generate.call_count == 3
+
+    report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    assert report["candidate"]["replayed"] == 3
+    assert report["baseline"]["replayed"] == 0
+    assert report["candidate"]["latency_ms"]["mean"] == 1200
+    assert report["label_matrix"]
+    # Only the model responses are recorded, not the scorer's results
+    store = ResultsStore(str(tmp_path / "zonings.db"))
+    assert {row["model"] for row in store.iter_zonings(limit=None)} == {"gpt-test"}
+
+
+def test_replay_reports_invalid_bundle_configuration(monkeypatch, tmp_path, capsys):
+    """A bundle override that fails config validation should be reported, not raised"""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    corpus = _corpus(tmp_path)
+
+    code = main(["replay", str(corpus), "--candidate", "llm:REPORT_MODE=x", "--db", str(tmp_path / "zonings.db")])
+
+    assert code == 1
+    assert "REPORT_MODE" in capsys.readouterr().err
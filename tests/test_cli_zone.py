@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+import pytest
+from cli.__main__ import main
+
+SAMPLE = Path(__file__).parent.parent / "samples" / "novatel_assessment.json"
+
+
+@pytest.fixture
+def portfolio(tmp_path):
+    """JSONL file with two brands and one invalid line"""
+    assessment = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    lines = [json.dumps({**assessment, "brand": name}) for name in ("Alpha", "Beta")] + ["not json"]
+    path = tmp_path / "portfolio.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _run(tmp_path, portfolio, output, *extra):
+    return main([
+        "zone", str(portfolio), "--mode", "deterministic", "--workers", "2",
+        "--db", str(tmp_path / "zonings.db"), "-o", str(tmp_path / output), *extra
+    ])
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_zone_cli_writes_jsonl_and_markdown(tmp_path, portfolio):
+    """Each line should produce a result or error record, plus a markdown file per brand"""
+    code = _run(tmp_path, portfolio, "out.jsonl", "--markdown-dir", str(tmp_path / "md"))
+
+    records = sorted(_read(tmp_path / "out.jsonl"), key=lambda r: r["source"])
+    assert code == 1
+    assert [r.get("brand") for r in records] == ["Alpha", "Beta", None]
+    assert "error" in records[2]
+    assert sorted(p.name for p in (tmp_path / "md").iterdir()) == ["alpha.md", "beta.md"]
+
+
+def test_zone_cli_serves_repeat_runs_from_cache(tmp_path, portfolio):
+    """A second run against the same database should not re-zone anything"""
+    _run(tmp_path, portfolio, "first.jsonl")
+    _run(tmp_path, portfolio, "second.jsonl")
+
+    first = {r["source"]: r for r in _read(tmp_path / "first.jsonl") if "error" not in r}
+    second = {r["source"]: r for r in _read(tmp_path / "second.jsonl") if "error" not in r}
+    assert all(r["cached"] for r in second.values())
+    assert {k: r["result_id"] for k, r in second.items()} == {k: r["result_id"] for k, r in first.items()}
+
+
+def test_zone_cli_resumes_from_checkpoint(tmp_path, portfolio):
+    """Items listed in the checkpoint should be skipped and output appended"""
+    checkpoint = tmp_path / "zone.ckpt"
+    _run(tmp_path, portfolio, "out.jsonl", "--checkpoint", str(checkpoint), "--no-cache")
+    assert len(checkpoint.read_text().split()) == 2
+
+    _run(tmp_path, portfolio, "out.jsonl", "--checkpoint", str(checkpoint), "--no-cache")
+
+    records = _read(tmp_path / "out.jsonl")
+    assert sum("error" not in r for r in records) == 2
@@ -0,0 +1,50 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from utils import codec
+from utils.hashing import canonical_json
+
+
+def test_dumps_is_compact_utf8():
+    """dumps should produce compact JSON without ASCII escaping"""
+    assert codec.dumps({"brand": "Zürich", "n": [1, 2]}) == '{"brand":"Zürich","n":[1,2]}'.encode("utf-8")
+
+
+def test_dumps_canonical_matches_hashing_form():
+    """Canonical output should equal utils.hashing.canonical_json for typical assessments"""
+    assessment = {"zone3": {"b": True, "a": "20-70"}, "brand": "NovAtel", "scores": [1.5, None]}
+
+    assert codec.dumps_canonical(assessment) == canonical_json(assessment)
+
+
+def test_dumps_falls_back_for_values_the_fast_backend_rejects():
+    """Integers beyond 64 bits should still encode"""
+    assert json.loads(codec.dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+def test_loads_raises_decode_errors():
+    """Invalid input should raise one of DECODE_ERRORS"""
+    with pytest.raises(codec.DECODE_ERRORS):
+        codec.loads(b"not json")
+
+
+def test_zone_body_parsing_and_response(monkeypatch):
+    """POST /zone should reject non-object bodies and serve results with the fast response class"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+    headers = {"X-API-Key": "test-api-key-123"}
+
+    assert client.post("/zone", json=["array"], headers=headers).status_code == 422
+    assert client.post("/zone", content=b"{bad", headers=headers).status_code == 422
+
+    result = {"report_markdown": "# Zone 1 — Zürich", "summary": {"zone": "1"}}
+    with patch("app.openai_service.generate_zone_report", return_value=result), \
+            patch("app.results_store.record", side_effect=lambda record: record["id"]):
+        response = client.post("/zone", json={"brand": "Codec"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["report_markdown"] == "# Zone 1 — Zürich"
+    assert "Zürich".encode("utf-8") in response.content
@@ -0,0 +1,93 @@
+import gzip
+import zlib
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from utils.compression import CompressionMiddleware, choose_encoding, compress
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse("zone report " * 200)
+
+    @app.get("/tagged")
+    def tagged():
+        return PlainTextResponse("zone report " * 200, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("tiny", headers={"ETag": '"small"'})
+
+    @app.get("/not-modified")
+    def not_modified():
+        return Response(status_code=304, headers={"ETag": '"small"'})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f'{{"index":{i}}}\n' for i in range(50)), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def test_choose_encoding_honours_q_values_and_server_preference():
+    """The preferred encoding with q > 0 should win; q=0 excludes it"""
+    assert choose_encoding("gzip, br", ["zstd", "br", "gzip"]) == "br"
+    assert choose_encoding("br;q=0, gzip;q=0.5", ["zstd", "br", "gzip"]) == "gzip"
+    assert choose_encoding("*", ["gzip"]) == "gzip"
+    assert choose_encoding("identity", ["gzip"]) is None
+    assert choose_encoding("gzip;q=0", ["gzip"]) is None
+
+
+def test_large_responses_are_gzipped_and_small_ones_are_not():
+    """Bodies at or above minimum_size should be compressed with matching headers"""
+    client = _client()
+
+    big = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/big", headers={"Accept-Encoding": "identity"})
+
+    assert big.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in big.headers["vary"]
+    assert int(big.headers["content-length"]) < len(plain.content)
+    assert big.text == plain.text
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in plain.headers
+
+
+def test_strong_etags_become_weak_when_an_encoding_is_accepted():
+    """A strong validator must not survive a change of content coding, and a 304 must match its 200"""
+    client = _client()
+
+    compressed = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    not_modified = client.get("/not-modified", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/tagged", headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["etag"] == 'W/"abc"'
+    assert small.headers["etag"] == not_modified.headers["etag"] == 'W/"small"'
+    assert not_modified.status_code == 304
+    assert plain.headers["etag"] == '"abc"'
+    for response in (compressed, small, not_modified, plain):
+        assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_streaming_responses_are_compressed_chunk_by_chunk():
+    """Streams should decode to the original lines"""
+    client = _client()
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = zlib.decompress(raw, 31).decode().splitlines()
+    assert lines[0] == '{"index":0}' and len(lines) == 50
+
+
+def test_compress_gzip_round_trips():
+    """compress should produce a valid gzip stream"""
+    assert gzip.decompress(compress(b"abc" * 100, "gzip")) == b"abc" * 100
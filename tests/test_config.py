@@ -126,3 +126,17 @@ def test_config_uses_default_log_level(monkeypatch):
     config = Config()
 
     assert config.log_level == "INFO"
+
+
+@pytest.mark.parametrize("name,value", [
+    ("SCHEDULER_CONCURRENCY", "0"),
+    ("SCHEDULER_CONCURRENCY", "-2"),
+    ("BACKEND_MAX_CONCURRENCY", "-1"),
+])
+def test_config_rejects_concurrency_that_grants_no_slots(monkeypatch, name, value):
+    """Concurrency limits that would never grant a model call a slot should fail at startup"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key-123")
+    monkeypatch.setenv(name, value)
+
+    with pytest.raises(ConfigError, match=name):
+        Config()
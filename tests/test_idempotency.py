@@ -0,0 +1,57 @@
+import time
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from services.idempotency import IdempotencyStore
+
+
+def test_claim_complete_and_replay(tmp_path):
+    """A claimed key should block retries until completed, then replay the stored response"""
+    store = IdempotencyStore(str(tmp_path / "zonings.db"))
+
+    assert store.claim("client", "key-1", "hash-a").state == "new"
+    assert store.claim("client", "key-1", "hash-a").state == "in_flight"
+    assert store.claim("client", "key-1", "hash-b").state == "conflict"
+    assert store.claim("other-client", "key-1", "hash-b").state == "new"
+
+    store.complete("client", "key-1", 200, b'{"result_id":"r1"}')
+    replay = store.claim("client", "key-1", "hash-a")
+
+    assert replay == ("replay", 200, b'{"result_id":"r1"}')
+    assert store.claim("client", "key-1", "hash-b").state == "conflict"
+
+
+def test_released_and_expired_claims_free_the_key(tmp_path):
+    """A failed request's claim, or an expired response, should not block the key"""
+    store = IdempotencyStore(str(tmp_path / "zonings.db"), ttl=0.05)
+
+    store.claim("client", "key-1", "hash-a")
+    store.release("client", "key-1")
+    assert store.claim("client", "key-1", "hash-a").state == "new"
+
+    store.complete("client", "key-1", 200, b"{}")
+    time.sleep(0.1)
+    assert store.claim("client", "key-1", "hash-b").state == "new"
+
+
+def test_zone_replays_by_idempotency_key(monkeypatch, tmp_path):
+    """Retries with the same Idempotency-Key should not call the model; a new body is 422"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+    headers = {"X-API-Key": "test-api-key-123", "Idempotency-Key": "retry-me"}
+    result = {"report_markdown": "# Zone 1", "summary": {"brand": "Idem", "zone": "1"}}
+
+    with patch("app.idempotency_keys", IdempotencyStore(str(tmp_path / "zonings.db"))), \
+            patch("app.openai_service.generate_zone_report", return_value=result) as generate, \
+            patch("app.results_store.record", side_effect=lambda record: record["id"]):
+        first = client.post("/zone", json={"brand": "Idem"}, headers=headers)
+        retry = client.post("/zone", json={"brand": "Idem"}, headers=headers)
+        changed = client.post("/zone", json={"brand": "Other"}, headers=headers)
+
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json()["result_id"] == first.json()["result_id"]
+    assert changed.status_code == 422
+    assert generate.call_count == 1
@@ -1,3 +1,4 @@
+import json
 import logging
 from utils.logging_config import setup_logging, get_logger
 
@@ -30,3 +31,76 @@ def test_get_logger_returns_configured_logger():
 
     assert logger.name == "api"
     assert isinstance(logger, logging.Logger)
+
+
+def test_json_formatter_includes_structured_fields():
+    """JSONFormatter should emit one JSON object carrying extra structured fields"""
+    import json
+    from utils.logging_config import JSONFormatter
+
+    record = logging.LogRecord("api", logging.INFO, __file__, 1, "Zone %s chosen", ("3",), None)
+    record.zone = "3"
+    record.total_tokens = 1200
+
+    data = json.loads(JSONFormatter().format(record))
+
+    assert data["message"] == "Zone 3 chosen"
+    assert data["zone"] == "3"
+    assert data["total_tokens"] == 1200
+    assert "brand" not in data
+
+
+def test_context_filter_tags_records_and_samples_info():
+    """Records should carry the request context; unsampled requests keep only warnings"""
+    from utils.logging_config import (
+        ContextFilter, bind_log_context, end_request_context, start_request_context
+    )
+    context_filter = ContextFilter()
+
+    def make(level):
+        return logging.LogRecord("api", level, __file__, 1, "msg", None, None)
+
+    token = start_request_context("req-1", sample_rate=1.0)
+    bind_log_context(brand="NovAtel")
+    record = make(logging.INFO)
+    assert context_filter.filter(record)
+    assert (record.request_id, record.brand) == ("req-1", "NovAtel")
+    end_request_context(token)
+
+    token = start_request_context("req-2", sample_rate=0.0)
+    assert not context_filter.filter(make(logging.INFO))
+    assert context_filter.filter(make(logging.WARNING))
+    end_request_context(token)
+
+
+def test_queue_handler_defers_formatting_to_the_listener():
+    """Records should be queued unformatted and keep their message and traceback"""
+    import queue
+    from utils.logging_config import JSONFormatter, _StructuredQueueHandler
+
+    handler = _StructuredQueueHandler(queue.SimpleQueue())
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        import sys
+        record = logging.LogRecord("api", logging.ERROR, __file__, 1, "failed %s", ("x",), sys.exc_info())
+
+    handler.emit(record)
+    queued = handler.queue.get_nowait()
+
+    assert (queued.msg, queued.args) == ("failed %s", ("x",))
+    assert queued.exc_text is None
+    formatted = json.loads(JSONFormatter().format(queued))
+    assert formatted["message"] == "failed x"
+    assert "ValueError: boom" in formatted["exc_info"]
+
+
+def test_request_id_header_is_echoed(monkeypatch):
+    """Responses should carry the caller's X-Request-ID, or a generated one"""
+    from fastapi.testclient import TestClient
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    from app import app
+    client = TestClient(app)
+
+    assert client.get("/health", headers={"X-Request-ID": "abc-123"}).headers["X-Request-ID"] == "abc-123"
+    assert len(client.get("/health").headers["X-Request-ID"]) == 32
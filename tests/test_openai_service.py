@@ -54,6 +54,7 @@ def test_generate_zone_report_success(mock_config):
     assert "Zone 1" in result["report_markdown"]
     assert result["summary"]["brand"] == "Test Brand"
     assert result["summary"]["zone"] == "1"
+    assert result["validation"] == {"status": "ok", "rules_hash": service.rules_hash, "findings": []}
 
 
 def test_generate_zone_report_retries_on_timeout(mock_config):
@@ -127,3 +128,104 @@ def test_extract_summary_returns_empty_dict_on_invalid_json():
     summary = _extract_summary(markdown)
 
     assert summary == {}
+
+
+def test_revise_zone_report_sends_previous_report_and_changes(mock_config):
+    """revise_zone_report should include the previous report and changed answers"""
+    service = OpenAIService(mock_config)
+
+    mock_choice = Mock()
+    mock_choice.message.content = "# Zone 5 — Legal/Accounting/Integration Hold (Recommended)"
+    mock_response = Mock()
+    mock_response.choices = [mock_choice]
+
+    with patch.object(service.client.chat.completions, 'create', return_value=mock_response) as create:
+        result = service.revise_zone_report({"brand": "Test"}, "# Zone 3B old report", ["Legal restriction (Z5Q1): False -> True"])
+
+    user_msg = create.call_args.kwargs["messages"][-1]["content"]
+    assert "# Zone 3B old report" in user_msg
+    assert "Z5Q1" in user_msg
+    assert "Zone 5" in result["report_markdown"]
+
+
+def test_compact_prompt_encoding_moves_legend_to_system_prompt(mock_config, monkeypatch):
+    """PROMPT_ENCODING=compact should send question codes and change the prompt hash"""
+    json_service = OpenAIService(mock_config)
+    monkeypatch.setenv("PROMPT_ENCODING", "compact")
+    service = OpenAIService(Config())
+
+    mock_choice = Mock()
+    mock_choice.message.content = "# Zone 3B — Endorsed Brand (Recommended)"
+    mock_response = Mock()
+    mock_response.choices = [mock_choice]
+
+    assessment = {"brand": "Test", "zone4": {"legal_forbids_hex_branding": True}}
+    with patch.object(service.client.chat.completions, 'create', return_value=mock_response) as create:
+        service.generate_zone_report(assessment)
+
+    messages = create.call_args.kwargs["messages"]
+    assert "COMPACT ASSESSMENT ENCODING" in messages[0]["content"]
+    assert "YES: Z4Q5" in messages[-1]["content"]
+    assert "legal_forbids_hex_branding" not in messages[-1]["content"]
+    assert service.prompt_hash != json_service.prompt_hash
+
+
+def test_votes_request_n_samples_and_return_majority(mock_config):
+    """votes=N should sample N reports in one call and keep the majority zone/subzone"""
+    service = OpenAIService(mock_config)
+
+    def choice(subzone, confidence):
+        mock_choice = Mock()
+        mock_choice.message.content = (
+            f"# Zone 3{subzone} — Endorsed Brand (Recommended)\n\n```json\n"
+            f'{{"zone": "3", "subzone": "{subzone}", "confidence": {confidence}}}\n```\n'
+        )
+        return mock_choice
+
+    mock_response = Mock()
+    mock_response.choices = [choice("A", 70), choice("B", 80), choice("B", 90)]
+    mock_response.usage = Mock(prompt_tokens=3000, completion_tokens=2400, total_tokens=5400)
+
+    with patch.object(service.client.chat.completions, 'create', return_value=mock_response) as create:
+        result = service.generate_zone_report({"brand": "Test"}, votes=3)
+
+    assert create.call_count == 1
+    assert create.call_args.kwargs["n"] == 3
+    assert result["summary"]["subzone"] == "B"
+    assert "Zone 3B" in result["report_markdown"]
+    # The summary matches the winning report; the vote-scaled figure is metadata
+    assert result["summary"]["confidence"] == 90
+    assert '"confidence": 90' in result["report_markdown"]
+    assert result["metadata"]["votes"]["confidence"] == 57  # mean 85, 2 of 3 samples agree
+    assert result["metadata"]["votes"]["tally"] == {"3A": 1, "3B": 2}
+    assert result["metadata"]["usage"]["total_tokens"] == 5400
+
+
+def test_oversized_model_report_is_rejected(mock_config):
+    """A report longer than MAX_REPORT_CHARS should fail without retrying"""
+    mock_config.max_report_chars = 100
+    service = OpenAIService(mock_config)
+
+    mock_choice = Mock()
+    mock_choice.message.content = "# Zone 1\n" + "x" * 200
+    mock_response = Mock()
+    mock_response.choices = [mock_choice]
+
+    with patch.object(service.client.chat.completions, 'create', return_value=mock_response) as create:
+        with pytest.raises(OpenAIServiceError, match="MAX_REPORT_CHARS"):
+            service.generate_zone_report({"brand": "Test"})
+
+    assert create.call_count == 1
+
+
+def test_client_is_built_lazily_and_warm_up_prepares_it(mock_config):
+    """The client should wait for first use; warm_up should build it and make the requests"""
+    service = OpenAIService(mock_config)
+    assert service.backend._client is None
+
+    with patch.object(service.client, 'with_options') as with_options:
+        service.warm_up(completion=True)
+
+    client = with_options.return_value
+    client.models.retrieve.assert_called_once_with(mock_config.openai_model)
+    assert client.chat.completions.create.call_args.kwargs["max_tokens"] == 1
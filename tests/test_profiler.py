@@ -0,0 +1,57 @@
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from utils.profiler import ProfilerBusyError, SamplingProfiler
+
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiler_captures_busy_thread_in_collapsed_format():
+    """Collapsed output should contain the busy function with integer counts"""
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="spinner")
+    worker.start()
+    try:
+        with SamplingProfiler(interval=0.002) as profiler:
+            time.sleep(0.2)
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = profiler.collapsed().splitlines()
+    assert profiler.samples > 10
+    assert any(line.startswith("spinner;") and "_spin (test_profiler.py)" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_only_one_profiler_runs_at_a_time():
+    """Starting a second profiler while one runs should fail"""
+    with SamplingProfiler():
+        with pytest.raises(ProfilerBusyError):
+            SamplingProfiler().start()
+    SamplingProfiler().start().stop()
+
+
+def test_profile_endpoints(monkeypatch):
+    """/debug/profile should return collapsed stacks; X-Profile should capture one request"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+    headers = {"X-API-Key": "test-api-key-123"}
+
+    assert client.get("/debug/profile?seconds=0.1").status_code == 401
+    response = client.get("/debug/profile?seconds=0.1", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert int(response.headers["X-Profile-Samples"]) > 0
+
+    assert "X-Profile-Id" not in client.get("/health", headers={"X-Profile": "1"}).headers
+    profiled = client.get("/health", headers={**headers, "X-Profile": "1", "X-Request-ID": "prof-1"})
+    assert profiled.headers["X-Profile-Id"] == "prof-1"
+    assert client.get("/debug/profile/prof-1", headers=headers).status_code == 200
+    assert client.get("/debug/profile/unknown", headers=headers).status_code == 404
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+from services.prompt_encoding import build_legend, decode_compact, encode_compact
+from services.question_catalog import QUESTIONS
+from services.scoring import score_assessment
+
+SAMPLE = Path(__file__).parent.parent / "samples" / "novatel_assessment.json"
+
+
+def _sample():
+    return json.loads(SAMPLE.read_text(encoding="utf-8"))
+
+
+def test_encode_compact_lists_yes_answers_and_values_by_code():
+    """True answers go on the YES line, bracket answers on VALUES, False answers are omitted"""
+    assessment = _sample()
+    assessment["zone4"]["legal_forbids_hex_branding"] = True
+    assessment["zone5"]["yoy_revenue_growth"] = "> 10%"
+
+    encoded = encode_compact(assessment)
+
+    assert "brand: NovAtel" in encoded
+    assert "YES: Z4Q5" in encoded
+    assert "Z4Q1=50-70" in encoded
+    assert "Z5Q9=> 10%" in encoded
+    assert "Z4Q2" not in encoded
+    assert "hex_branding_reduces_trust" not in encoded
+
+
+def test_encode_compact_marks_unanswered_questions_missing():
+    """Missing and null answers should be listed under MISSING"""
+    assessment = _sample()
+    del assessment["zone5"]
+    assessment["zone4"]["hex_branding_reduces_trust"] = None
+
+    encoded = encode_compact(assessment)
+    missing = next(line for line in encoded.splitlines() if line.startswith("MISSING: ")).split()[1:]
+
+    assert "Z4Q2" in missing
+    assert {q.code for q in QUESTIONS if q.section == ("zone5",)} <= set(missing)
+
+
+def test_decode_compact_round_trips_scored_content():
+    """Decoding the compact text should score exactly like the original"""
+    assessment = _sample()
+    assessment["zone3"]["extra_notes"] = {"free_text": "kept"}
+    assessment["zone4"]["tm_dispute_key_markets"] = True
+
+    encoded = encode_compact(assessment)
+    decoded = decode_compact(encoded)
+
+    assert "OTHER: " in encoded
+    assert decoded["zone3"]["extra_notes"] == {"free_text": "kept"}
+    assert score_assessment(decoded) == score_assessment(assessment)
+
+
+def test_compact_encoding_is_much_smaller_than_json():
+    """The compact form should be a fraction of the JSON size"""
+    assessment = _sample()
+
+    assert len(encode_compact(assessment)) * 5 < len(json.dumps(assessment, separators=(",", ":")))
+
+
+def test_legend_covers_every_question():
+    """Every question code should be explained in the legend"""
+    legend = build_legend()
+
+    for q in QUESTIONS:
+        assert f"{q.code} | {q.label} |" in legend
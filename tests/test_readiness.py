@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from services.readiness import UpstreamMonitor, WarmUp, readiness_problems
+
+
+def _scheduler(in_flight=None, **queued):
+    in_flight = in_flight or {}
+    return {
+        "max_concurrency": 8,
+        "in_flight": sum(in_flight.values()),
+        "lanes": {lane: {"in_flight": in_flight.get(lane, 0), "queued": queued.get(lane, 0)}
+                  for lane in ("interactive", "job", "batch")},
+    }
+
+
+def _snapshot(**overrides):
+    snapshot = {
+        "in_flight": 0,
+        "scheduler": _scheduler(),
+        "threadpool": {"busy": 1, "size": 40, "waiting": 0},
+        "results_queue": {"pending": 0, "capacity": 1000},
+        "upstream": {"state": "closed"},
+        "warmup": {"state": "warm"},
+        "rules": {"loaded": True, "hash": "abc"},
+    }
+    snapshot.update(overrides)
+    return snapshot
+
+
+def test_upstream_monitor_opens_after_consecutive_failures_and_recovers():
+    """The cached state should open after failure_threshold failures and close on success"""
+    outcomes = [ConnectionError("down")] * 3 + [None]
+
+    def check():
+        outcome = outcomes.pop(0)
+        if outcome:
+            raise outcome
+
+    monitor = UpstreamMonitor(check, failure_threshold=3)
+    assert monitor.status()["state"] == "unknown"
+
+    states = [monitor.run_check()["state"] for _ in range(4)]
+
+    assert states == ["closed", "closed", "open", "closed"]
+    assert monitor.status()["consecutive_failures"] == 0
+
+
+def test_readiness_problems_reports_each_saturation_signal():
+    """Each overload or dependency signal should produce a reason"""
+    assert readiness_problems(_snapshot(), max_in_flight=8, max_queued=16) == []
+
+    problems = readiness_problems(_snapshot(
+        scheduler=_scheduler(in_flight={"interactive": 6, "job": 2}, interactive=10, job=6, batch=13),
+        threadpool={"busy": 40, "size": 40, "waiting": 3},
+        results_queue={"pending": 950, "capacity": 1000},
+        upstream={"state": "open"},
+        warmup={"state": "warming"},
+        rules={"loaded": False, "hash": None},
+    ), max_in_flight=8, max_queued=16)
+
+    assert len(problems) == 7
+    assert "8 interactive/job model calls in flight (limit 8)" in problems
+    assert "16 interactive/job model calls queued (limit 16)" in problems
+    assert readiness_problems(_snapshot(warmup={"state": "failed"}), max_in_flight=8, max_queued=16) == []
+
+
+def test_readiness_ignores_batch_load_and_short_queues():
+    """Bulk calls filling their share, or one waiting interactive call, should keep the worker ready"""
+    batch = _scheduler(in_flight={"interactive": 1, "batch": 7}, batch=200)
+    assert readiness_problems(_snapshot(scheduler=batch), max_in_flight=8, max_queued=16) == []
+    one_waiting = _scheduler(in_flight={"interactive": 8}, interactive=1)
+    assert readiness_problems(_snapshot(scheduler=one_waiting), max_in_flight=9, max_queued=2) == []
+
+
+def test_warm_up_reports_warming_until_the_task_finishes():
+    """The warm-up should be warming while its task runs, then warm or failed"""
+    release = threading.Event()
+    warm_up = WarmUp(lambda: release.wait(5))
+    assert warm_up.status()["state"] == "cold"
+
+    warm_up.start()
+    assert warm_up.status()["state"] == "warming"
+    release.set()
+    warm_up._thread.join(5)
+    assert warm_up.status()["state"] == "warm"
+
+    def fail():
+        raise ConnectionError("unreachable")
+
+    failed = WarmUp(fail).run()
+    assert failed["state"] == "failed"
+    assert failed["error"] == "unreachable"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    return TestClient(app)
+
+
+def test_livez_is_unauthenticated_and_constant(client):
+    """GET /livez should answer 200 without an API key"""
+    response = client.get("/livez")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_readyz_reflects_cached_upstream_state(client):
+    """GET /readyz should be 200 when ready and 503 when the upstream check is open"""
+    with patch("app.config.rules_file_exists", True):
+        ready = client.get("/readyz")
+        with patch("app.upstream_monitor.status", return_value={"state": "open"}):
+            failing = client.get("/readyz")
+
+    assert ready.status_code == 200
+    assert ready.json()["status"] == "ready"
+    assert ready.json()["threadpool"]["size"] > 0
+    assert failing.status_code == 503
+    assert failing.json()["problems"] == ["upstream API failing checks"]
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+from config import Config
+from services.openai_service import OpenAIService, _extract_summary
+from services.report_builder import ZONE_DEFINITIONS, ReportBuilder, parse_prose, zone_overview
+from services.scoring import score_assessment
+
+SAMPLE = Path(__file__).parent.parent / "samples" / "novatel_assessment.json"
+
+PROSE = {
+    "zone": "3",
+    "subzone": "B",
+    "confidence": {"evidence": 30, "completeness": 25, "conflict_resolution": 20},
+    "confidence_notes": {"evidence": "clear transition data"},
+    "conclusion": "NovAtel fits Zone 3B (Z3Q8b).",
+    "zone_assessment": "Sub-brand equity without a standalone logo.",
+    "strategy": ["Retain the name in text only"],
+    "risks": ["Partner confusion; mitigate with co-branded notices"],
+    "next_steps": ["Draft the naming guideline"],
+    "drivers": ["Easier transition (Z3Q8b)"],
+    "conflicts": [],
+}
+
+
+def _sample():
+    return json.loads(SAMPLE.read_text(encoding="utf-8"))
+
+
+def test_zone_4_and_5_share_one_definition():
+    """Zones 4 and 5 should reuse the same pre-rendered overview"""
+    assert ZONE_DEFINITIONS["4"] is ZONE_DEFINITIONS["5"]
+    assert zone_overview("3", "B").startswith("## Zone 3B")
+    assert zone_overview("3") == ""
+
+
+def test_assemble_fills_static_sections_from_prose_and_tallies():
+    """The assembled report should contain anchors, overview, breakdown and a parseable summary"""
+    assessment = _sample()
+    score = score_assessment(assessment)
+
+    markdown, summary = ReportBuilder().assemble(assessment, PROSE, score)
+
+    assert markdown.startswith('<a id="zone-recommendation"></a>\n# Zone 3B — Endorsed Brand (Recommended)')
+    assert "**Confidence: 75/100**" in markdown
+    assert "- Evidence: 30/40 (clear transition data)" in markdown
+    assert "## Zone 3B: Sub-brands" in markdown
+    assert "**SCORING BREAKDOWN**" in markdown
+    assert '<a id="next-steps"></a>\n**Next Steps & Action Items**\n\n- Draft the naming guideline' in markdown
+    assert _extract_summary(markdown) == summary
+    assert summary["confidence"] == 75
+    assert summary["drivers"] == ["Easier transition (Z3Q8b)"]
+    assert summary["conflicts"]  # falls back to the scorer's runner-up questions
+
+
+def test_assemble_falls_back_to_scorer_zone_for_invalid_output():
+    """Missing or invalid model output should still produce a complete report"""
+    assessment = _sample()
+    score = score_assessment(assessment)
+
+    markdown, summary = ReportBuilder().assemble(assessment, parse_prose("not json"), score)
+
+    assert (summary["zone"], summary["subzone"]) == (score["zone"], score["subzone"])
+    assert "(Not provided by the model)" in markdown
+
+
+def test_templated_mode_requests_json_prose(monkeypatch):
+    """REPORT_MODE=templated should ask for JSON and return an assembled report"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("REPORT_MODE", "templated")
+    service = OpenAIService(Config())
+
+    mock_choice = Mock()
+    mock_choice.message.content = json.dumps(PROSE)
+    mock_response = Mock()
+    mock_response.choices = [mock_choice]
+
+    with patch.object(service.client.chat.completions, 'create', return_value=mock_response) as create:
+        result = service.generate_zone_report(_sample())
+
+    assert create.call_args.kwargs["response_format"] == {"type": "json_object"}
+    assert "Return ONLY a JSON object" in create.call_args.kwargs["messages"][1]["content"]
+    assert result["summary"]["zone"] == "3"
+    assert "**SCORING BREAKDOWN**" in result["report_markdown"]
@@ -0,0 +1,283 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from services.results_store import (
+    ResultsStore, ResultsStoreError, build_record, iter_page_json
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Results store backed by a temporary database"""
+    store = ResultsStore(str(tmp_path / "zonings.db"), batch_size=10, flush_interval=0.05)
+    yield store
+    store.close()
+
+
+def _result(zone="3", subzone="A", confidence=80):
+    return {
+        "report_markdown": f"# Zone {zone}{subzone}",
+        "summary": {"brand": "Test", "zone": zone, "subzone": subzone, "confidence": confidence},
+        "metadata": {
+            "model": "gpt-4o",
+            "prompt_hash": "abc123",
+            "latency_ms": 1500,
+            "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+        }
+    }
+
+
+def test_build_record_extracts_indexed_fields():
+    """build_record should flatten summary, metadata and usage into columns"""
+    record = build_record({"brand": "NovAtel", "division": "Autonomy"}, _result(subzone="3A"))
+
+    assert record["brand"] == "NovAtel"
+    assert record["division"] == "Autonomy"
+    assert record["zone"] == "3"
+    assert record["subzone"] == "A"
+    assert record["total_tokens"] == 150
+    assert record["prompt_hash"] == "abc123"
+    assert len(record["assessment_hash"]) == 64
+
+
+def test_record_is_written_by_background_writer(store):
+    """Queued records should be readable after flush"""
+    result_id = store.record(build_record({"brand": "NovAtel"}, _result()))
+
+    assert store.flush(timeout=5)
+    stored = store.get(result_id)
+
+    assert stored["brand"] == "NovAtel"
+    assert stored["assessment"] == {"brand": "NovAtel"}
+    assert stored["summary"]["zone"] == "3"
+    assert stored["report_markdown"] == "# Zone 3A"
+
+
+def test_queued_records_are_readable_before_they_are_written(tmp_path):
+    """get and get_etag should serve a record while it waits for the writer"""
+    store = ResultsStore(str(tmp_path / "zonings.db"), flush_interval=60)
+    try:
+        result_id = store.record(build_record({"brand": "NovAtel"}, _result()))
+
+        assert store.get(result_id)["assessment"] == {"brand": "NovAtel"}
+        etag = store.get_etag(result_id)
+        assert store.flush(timeout=5)
+        assert store.get_etag(result_id) == etag
+        assert store._pending == {}
+    finally:
+        store.close()
+
+
+def test_dropped_records_get_no_result_id(monkeypatch, tmp_path):
+    """A record that cannot be queued, or fails to write, should never be served"""
+    store = ResultsStore(str(tmp_path / "zonings.db"), queue_size=1)
+    monkeypatch.setattr(store, "_ensure_writer", lambda: None)
+    kept = store.record(build_record({"brand": "A"}, _result()))
+    dropped = build_record({"brand": "B"}, _result())
+
+    assert kept is not None
+    assert store.record(dropped) is None
+    assert store.get(dropped["id"]) is None
+    assert store.dropped == 1
+
+    # A bad row only costs itself, not the rest of its batch
+    good, bad = build_record({"brand": "C"}, _result()), {**build_record({"brand": "D"}, _result()), "assessment": None}
+    conn = store._connect()
+    try:
+        store._write_batch(conn, [good, bad])
+    finally:
+        conn.close()
+    assert store.get(good["id"])["brand"] == "C"
+    assert store.dropped == 2
+
+
+def test_get_returns_none_for_unknown_id(store):
+    """get should return None when nothing is stored under the id"""
+    assert store.get("missing") is None
+
+
+def test_iter_zonings_filters_by_division_and_zone(store):
+    """Filters should match division, zone and zone+subzone"""
+    store.record(build_record({"brand": "A", "division": "Geo"}, _result("3", "A")))
+    store.record(build_record({"brand": "B", "division": "Geo"}, _result("3", "B")))
+    store.record(build_record({"brand": "C", "division": "Geo"}, _result("1", "")))
+    store.record(build_record({"brand": "D", "division": "Mining"}, _result("3", "A")))
+    store.flush(timeout=5)
+
+    zone3 = list(store.iter_zonings(division="Geo", zone="3"))
+    zone3a = list(store.iter_zonings(division="Geo", zone="3A"))
+
+    assert sorted(r["brand"] for r in zone3) == ["A", "B"]
+    assert [r["brand"] for r in zone3a] == ["A"]
+    assert "report_markdown" not in zone3a[0]
+
+
+def test_cursor_pagination_walks_all_rows_once(store):
+    """Following next_cursor should visit every row exactly once"""
+    for i in range(7):
+        store.record(build_record({"brand": f"Brand {i}"}, _result()))
+    store.flush(timeout=5)
+
+    seen = []
+    cursor = None
+    while True:
+        page = json.loads(b"".join(iter_page_json(store.iter_zonings(cursor=cursor, limit=3), 3)))
+        seen.extend(item["brand"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(f"Brand {i}" for i in range(7))
+
+
+def test_invalid_cursor_raises(store):
+    """A malformed cursor should raise ResultsStoreError before any query runs"""
+    with pytest.raises(ResultsStoreError, match="Invalid cursor"):
+        store.iter_zonings(cursor="not-a-cursor")
+
+
+def test_zonings_endpoint_streams_page(monkeypatch, tmp_path, store):
+    """GET /zonings should stream stored results as a JSON page"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+
+    store.record(build_record({"brand": "NovAtel", "division": "Geo"}, _result()))
+    store.flush(timeout=5)
+
+    with patch("app.results_store", store):
+        response = client.get(
+            "/zonings",
+            params={"division": "Geo", "zone": "3"},
+            headers={"X-API-Key": "test-api-key-123"}
+        )
+        bad_cursor = client.get(
+            "/zonings",
+            params={"cursor": "???"},
+            headers={"X-API-Key": "test-api-key-123"}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["brand"] for item in data["items"]] == ["NovAtel"]
+    assert data["next_cursor"] is None
+    assert bad_cursor.status_code == 400
+
+
+def test_zone_flags_results_the_store_dropped(monkeypatch):
+    """/zone should answer with a null result_id and X-Result-Stored: false when the record was dropped"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+
+    with patch("app.openai_service.generate_zone_report", return_value=_result()), \
+            patch("app.results_store.record", return_value=None):
+        response = client.post("/zone", json={"brand": "Dropped"}, headers={"X-API-Key": "test-api-key-123"})
+
+    assert response.status_code == 200
+    assert response.json()["result_id"] is None
+    assert response.headers["X-Result-Stored"] == "false"
+
+
+def test_get_zoning_sends_etag_and_answers_304(monkeypatch, store):
+    """GET /zonings/{id} should carry a strong ETag (weak when an encoding is accepted) and honour If-None-Match"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+    headers = {"X-API-Key": "test-api-key-123"}
+
+    result_id = store.record(build_record({"brand": "NovAtel"}, _result()))
+    store.flush(timeout=5)
+
+    with patch("app.results_store", store):
+        first = client.get(f"/zonings/{result_id}", headers={**headers, "Accept-Encoding": "identity"})
+        etag = first.headers["etag"]
+        cached = client.get(f"/zonings/{result_id}", headers={**headers, "If-None-Match": etag,
+                                                                "Accept-Encoding": "identity"})
+        gzip_cached = client.get(f"/zonings/{result_id}", headers={**headers, "If-None-Match": etag,
+                                                                     "Accept-Encoding": "gzip"})
+        stale = client.get(f"/zonings/{result_id}", headers={**headers, "If-None-Match": '"other"'})
+
+    assert first.status_code == 200
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert etag == store.get_etag(result_id)
+    assert cached.status_code == gzip_cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert gzip_cached.headers["etag"] == "W/" + etag
+    assert stale.status_code == 200
+    assert stale.json()["brand"] == "NovAtel"
+
+
+def test_analytics_are_updated_as_results_are_written(store):
+    """Aggregates should count each write once, including replaced rows"""
+    first = build_record({"brand": "A", "division": "Geo"}, _result(confidence=85))
+    store.record(first)
+    store.record(build_record({"brand": "B", "division": "Geo"}, _result(subzone="B", confidence=40)))
+    store.record(build_record({"brand": "C", "division": "Mining"}, _result(zone="1", subzone="")))
+    store.flush(timeout=5)
+    # Re-recording an id replaces the row, and its old contribution with it
+    store.record({**first, "confidence": 95})
+    store.flush(timeout=5)
+
+    data = store.analytics()
+    groups = {(g["division"], g["zone"]): g for g in data["groups"]}
+    assert list(groups) == [("Geo", "3A"), ("Geo", "3B"), ("Mining", "1")]
+    assert groups[("Geo", "3A")]["zonings"] == 1
+    assert groups[("Geo", "3A")]["confidence"]["histogram"]["90-100"] == 1
+    assert groups[("Geo", "3A")]["confidence"]["histogram"]["80-89"] == 0
+    assert data["totals"]["zonings"] == 3
+    assert data["totals"]["tokens"]["total"] == 450
+    assert data["totals"]["latency_ms"] == {"mean": 1500, "total": 4500}
+
+    by_model = store.analytics(group_by=("model",), zone="3")
+    assert by_model["groups"] == [{**by_model["totals"], "model": "gpt-4o"}]
+    assert by_model["totals"]["confidence"]["mean"] == 67.5
+    assert store.analytics(since="2999-01-01")["totals"]["zonings"] == 0
+    with pytest.raises(ResultsStoreError):
+        store.analytics(group_by=("brand",))
+
+
+def test_analytics_are_backfilled_for_existing_databases(store, tmp_path):
+    """Opening a database with zonings but no aggregates should rebuild them"""
+    for brand in ("A", "B"):
+        store.record(build_record({"brand": brand, "division": "Geo"}, _result()))
+    store.flush(timeout=5)
+    expected = store.analytics(group_by=("day", "division", "model", "zone"))
+
+    conn = store._connect()
+    with conn:
+        conn.execute("DELETE FROM zoning_aggregates")
+    conn.close()
+    reopened = ResultsStore(store.db_path)
+
+    assert reopened.analytics(group_by=("day", "division", "model", "zone")) == expected
+    assert expected["totals"]["zonings"] == 2
+
+
+def test_analytics_endpoint_groups_and_validates(monkeypatch, store):
+    """GET /analytics should serve grouped aggregates and reject unknown dimensions"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+    headers = {"X-API-Key": "test-api-key-123"}
+
+    store.record(build_record({"brand": "NovAtel", "division": "Geo"}, _result()))
+    store.flush(timeout=5)
+
+    with patch("app.results_store", store):
+        response = client.get("/analytics", params={"group_by": "division,zone"}, headers=headers)
+        totals = client.get("/analytics", params={"group_by": ""}, headers=headers)
+        bad = client.get("/analytics", params={"group_by": "brand"}, headers=headers)
+
+    assert response.status_code == 200
+    group = response.json()["groups"][0]
+    assert (group["division"], group["zone"], group["zonings"]) == ("Geo", "3A", 1)
+    assert group["confidence"]["mean"] == 80
+    assert totals.json()["groups"] == [totals.json()["totals"]]
+    assert bad.status_code == 400
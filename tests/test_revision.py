@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import pytest
+from fastapi.testclient import TestClient
+from services.revision import revise_zoning
+from services.scoring import score_assessment
+from utils.json_patch import JSONPatchError, apply_patch
+
+SAMPLE = Path(__file__).parent.parent / "samples" / "novatel_assessment.json"
+
+
+@pytest.fixture
+def stored():
+    """A stored zoning of the sample assessment"""
+    assessment = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    score = score_assessment(assessment)
+    return {
+        "id": "prev123",
+        "assessment": assessment,
+        "summary": {"brand": "NovAtel", "zone": score["zone"], "subzone": score["subzone"]},
+        "report_markdown": "# Zone 3B — Endorsed Brand (Recommended)",
+        "model": "gpt-4o",
+        "prompt_hash": "abc123",
+    }
+
+
+def test_apply_patch_supports_rfc6902_operations():
+    """add/remove/replace/move/copy/test should apply in order without mutating input"""
+    doc = {"a": {"b": 1}, "list": [1, 2]}
+    result = apply_patch(doc, [
+        {"op": "test", "path": "/a/b", "value": 1},
+        {"op": "replace", "path": "/a/b", "value": 2},
+        {"op": "add", "path": "/list/-", "value": 3},
+        {"op": "copy", "from": "/a", "path": "/c"},
+        {"op": "move", "from": "/list/0", "path": "/first"},
+        {"op": "remove", "path": "/a"},
+    ])
+
+    assert result == {"list": [2, 3], "c": {"b": 2}, "first": 1}
+    assert doc == {"a": {"b": 1}, "list": [1, 2]}
+
+
+@pytest.mark.parametrize("operations", [
+    {"op": "add"},
+    [{"op": "replace", "path": "/missing", "value": 1}],
+    [{"op": "test", "path": "/a", "value": 2}],
+    [{"op": "frobnicate", "path": "/a"}],
+])
+def test_apply_patch_rejects_invalid_patches(operations):
+    """Malformed patches, missing paths and failed tests should raise"""
+    with pytest.raises(JSONPatchError):
+        apply_patch({"a": 1}, operations)
+
+
+def test_revision_reuses_report_when_outcome_holds(stored):
+    """A change that keeps winner, gates and margin should not call the model"""
+    service = MagicMock()
+    _, result = revise_zoning(stored, [
+        {"op": "replace", "path": "/contact", "value": "Someone Else"}
+    ], service)
+
+    service.revise_zone_report.assert_not_called()
+    assert result["report_markdown"] == stored["report_markdown"]
+    assert result["revision"]["llm_called"] is False
+    assert result["revision"]["changed_questions"] == []
+
+
+def test_revision_requests_narrative_when_gate_triggers(stored):
+    """A newly triggered gate should ask the model to update the previous report"""
+    service = MagicMock()
+    service.revise_zone_report.return_value = {"report_markdown": "# Zone 5", "summary": {"zone": "5"}}
+
+    assessment, result = revise_zoning(stored, [
+        {"op": "replace", "path": "/zone5/active_restriction_preventing_hex", "value": True}
+    ], service)
+
+    args = service.revise_zone_report.call_args.args
+    assert args[0] is assessment
+    assert args[1] == stored["report_markdown"]
+    assert "Z5Q1" in args[2][0]
+    assert result["revision"]["scores_after"]["zone"] == "5"
+    assert result["revision"]["llm_called"] is True
+
+
+def test_revise_endpoint(monkeypatch, stored):
+    """POST /zone/{id}/revise should 404 on unknown ids, 422 on bad patches and store results"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+    headers = {"X-API-Key": "test-api-key-123"}
+
+    with patch("app.results_store.get", side_effect=lambda rid: stored if rid == "prev123" else None), \
+            patch("app.results_store.record", side_effect=lambda record: record["id"]):
+        missing = client.post("/zone/unknown/revise", json=[], headers=headers)
+        invalid = client.post("/zone/prev123/revise", json=[{"op": "remove", "path": "/nope"}], headers=headers)
+        response = client.post("/zone/prev123/revise", json=[
+            {"op": "replace", "path": "/contact", "value": "Someone Else"}
+        ], headers=headers)
+
+    assert missing.status_code == 404
+    assert invalid.status_code == 422
+    assert response.status_code == 200
+    data = response.json()
+    assert data["result_id"] != "prev123"
+    assert data["revision"]["revised_from"] == "prev123"
@@ -0,0 +1,51 @@
+from pathlib import Path
+from config import Config
+from services.openai_service import OpenAIService
+from services.question_catalog import QUESTIONS
+from services.rules_index import RulesIndex
+
+RULES = next((Path(__file__).parent.parent / "rules").glob("*.md"))
+
+ZONE3 = {
+    "zone4": {"hex_branding_reduces_trust": False},
+    "zone3": {"higher_awareness_than_hex": True, "z3_confidence_fallback": {"strong_advocates": True}},
+}
+
+
+def test_every_catalog_question_has_a_section():
+    """The index should cover every catalog question and lose no text"""
+    text = RULES.read_text(encoding="utf-8")
+    index = RulesIndex(text)
+
+    assert all(index.section_for(q.code) for q in QUESTIONS)
+    assert index.section_for("Z3FQ30a") == "Z3FQ30"
+    assert "".join(s.text for s in index.sections) == text
+
+
+def test_selection_follows_gates_and_the_fallback_trigger():
+    """Gated cases stop after STEP 2; STEP 5 only comes with a low-confidence Zone 3 lead"""
+    index = RulesIndex(RULES.read_text(encoding="utf-8"))
+
+    gated = index.relevant_ids({**ZONE3, "zone5": {"active_restriction_preventing_hex": True}})
+    assert gated == ["preamble", "STEP 1", "Z4Q2", "STEP 2", "Z5Q1"]
+
+    ids = index.relevant_ids(ZONE3)
+    assert ids == ["preamble", "STEP 1", "Z4Q2", "STEP 4", "Z3Q2", "STEP 5", "Z3FQ21"]
+    assert "Z1Q1" not in ids  # unanswered
+
+
+def test_chunked_mode_sends_sections_with_the_assessment(monkeypatch):
+    """RULES_MODE=chunked should keep rules out of the system prompt and change the prompt hash"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("SYSTEM_RULES_PATH", str(RULES))
+    full = OpenAIService(Config())
+    monkeypatch.setenv("RULES_MODE", "chunked")
+    chunked = OpenAIService(Config())
+
+    message = chunked.user_message(ZONE3)
+
+    assert "STEP 1" not in chunked.system_prompt
+    assert message.startswith("=== RULES FILE SECTIONS ===\n")
+    assert "Z3 Q2" in message and "STEP 3" not in message
+    assert chunked.prompt_hash != full.prompt_hash
+    assert len(chunked.system_prompt) + len(message) < len(full.system_prompt) + len(full.user_message(ZONE3))
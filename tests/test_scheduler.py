@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+from services.scheduler import Scheduler, SchedulerTimeout, lane_for, scheduling
+
+
+def _hold(scheduler, lane, tenant, started, release, order=None, weight=1):
+    """Thread body: take a slot in a lane, record the grant, wait for release"""
+    with scheduling(lane, tenant, weight):
+        with scheduler.slot():
+            if order is not None:
+                order.append((lane, tenant))
+            started.release()
+            release.wait(5)
+
+
+def _wait_queued(scheduler, lane, count):
+    deadline = time.monotonic() + 5
+    while scheduler.stats()["lanes"][lane]["queued"] < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_lane_for_demotes_to_key_priority():
+    """A batch key's /zone calls should run in the batch lane, never the reverse"""
+    assert lane_for("interactive", "interactive") == "interactive"
+    assert lane_for("interactive", "batch") == "batch"
+    assert lane_for("batch", "interactive") == "batch"
+    assert lane_for("interactive", "job") == "job"
+
+
+def test_higher_lanes_are_served_first_and_fair_within_a_lane():
+    """Freed slots should go to interactive before batch, alternating between keys"""
+    scheduler = Scheduler(max_concurrency=1)
+    started, release, order = threading.Semaphore(0), threading.Event(), []
+
+    blocker_release = threading.Event()
+    blocker = threading.Thread(target=_hold, args=(scheduler, "interactive", "a", started, blocker_release))
+    blocker.start()
+    started.acquire()
+
+    threads, queued = [], {"interactive": 0, "batch": 0}
+    for lane, tenant in [("batch", "importer"), ("interactive", "a"), ("interactive", "a"), ("interactive", "b")]:
+        thread = threading.Thread(target=_hold, args=(scheduler, lane, tenant, started, release, order))
+        thread.start()
+        threads.append(thread)
+        queued[lane] += 1
+        _wait_queued(scheduler, lane, queued[lane])
+
+    release.set()
+    blocker_release.set()
+    for thread in [blocker] + threads:
+        thread.join(5)
+
+    # "a" already had a call in service, so "b" goes before a's queued calls
+    assert order == [("interactive", "b"), ("interactive", "a"), ("interactive", "a"), ("batch", "importer")]
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 0
+    assert stats["lanes"]["interactive"]["granted"] == 4
+    assert stats["lanes"]["batch"]["wait_ms_max"] > 0
+
+
+def test_interactive_call_times_out_when_budget_is_held():
+    """An interactive call should give up after queue_timeout instead of waiting forever"""
+    scheduler = Scheduler(max_concurrency=1, queue_timeout=0.05)
+    started, release = threading.Semaphore(0), threading.Event()
+    holder = threading.Thread(target=_hold, args=(scheduler, "interactive", "a", started, release))
+    holder.start()
+    started.acquire()
+
+    with pytest.raises(SchedulerTimeout):
+        with scheduler.slot():
+            pass
+
+    release.set()
+    holder.join(5)
+    assert scheduler.stats()["lanes"]["interactive"]["timeouts"] == 1
+
+
+def test_batch_window_grows_additively_and_halves_on_slow_calls():
+    """AIMD: fast calls widen the batch window, a latency spike or failure halves it"""
+    scheduler = Scheduler(max_concurrency=9)
+    assert scheduler.stats()["batch_limit"] == 4
+
+    for _ in range(40):
+        scheduler._adapt(1.0, failed=False)
+    assert scheduler.stats()["batch_limit"] == 8  # capped one below the budget
+
+    scheduler._adapt(5.0, failed=False)
+    assert scheduler.stats()["batch_limit"] == 4
+
+    scheduler._last_decrease = 0.0
+    scheduler._adapt(1.0, failed=True)
+    assert scheduler.stats()["batch_limit"] == 2
+
+
+def test_batch_call_times_out_when_a_batch_timeout_is_set():
+    """Batch calls should wait indefinitely only when no batch timeout is configured"""
+    scheduler = Scheduler(max_concurrency=1, batch_queue_timeout=0.05)
+    started, release = threading.Semaphore(0), threading.Event()
+    holder = threading.Thread(target=_hold, args=(scheduler, "interactive", "a", started, release))
+    holder.start()
+    started.acquire()
+
+    with pytest.raises(SchedulerTimeout, match="batch lane"):
+        with scheduling("batch", "importer"):
+            with scheduler.slot():
+                pass
+
+    release.set()
+    holder.join(5)
+    assert scheduler.stats()["lanes"]["batch"]["timeouts"] == 1
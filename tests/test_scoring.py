@@ -0,0 +1,64 @@
+import copy
+import json
+from pathlib import Path
+import pytest
+from services.question_catalog import QUESTIONS, QUESTIONS_BY_CODE
+from services.scoring import build_deterministic_report, rescore, score_assessment
+
+SAMPLE = Path(__file__).parent.parent / "samples" / "novatel_assessment.json"
+
+
+@pytest.fixture
+def assessment():
+    """The bundled NovAtel sample assessment"""
+    return json.loads(SAMPLE.read_text(encoding="utf-8"))
+
+
+def test_catalog_codes_are_unique():
+    """Every question should have a distinct code and form path"""
+    assert len(QUESTIONS_BY_CODE) == len(QUESTIONS)
+    assert len({q.path for q in QUESTIONS}) == len(QUESTIONS)
+
+
+def test_score_assessment_picks_highest_zone_and_subzone(assessment):
+    """Without gates the winner is the zone with most points"""
+    score = score_assessment(assessment)
+
+    assert score["gates"] == []
+    assert score["zone"] == max(score["zones"], key=score["zones"].get)
+    assert score["margin"] == score["zones"][score["zone"]] - score["zones"][score["runner_up"]]
+    assert 0 <= score["confidence"] <= 100
+
+
+def test_gates_override_points(assessment):
+    """A Zone 5 gate should win over a Zone 4 gate and over any tally"""
+    assessment["zone4"]["legal_forbids_hex_branding"] = True
+    assert score_assessment(assessment)["zone"] == "4"
+
+    assessment["zone5"]["active_restriction_preventing_hex"] = True
+    score = score_assessment(assessment)
+    assert score["zone"] == "5"
+    assert score["subzone"] == ""
+
+
+def test_rescore_matches_full_score(assessment):
+    """Incremental re-scoring should equal scoring the updated assessment"""
+    previous = score_assessment(assessment)
+    updated = copy.deepcopy(assessment)
+    updated["zone3"]["removal_causes_attrition"] = not updated["zone3"]["removal_causes_attrition"]
+    updated["zone4"]["legal_forbids_hex_branding"] = True
+    del updated["zone1"]["pct_of_division_revenue"]
+
+    result = rescore(previous, assessment, updated, ["Z3Q3", "Z4Q5", "Z1Q1"])
+
+    assert result == score_assessment(updated)
+
+
+def test_deterministic_report_has_summary_and_metadata(assessment):
+    """The deterministic report should be shaped like a model report"""
+    result = build_deterministic_report(assessment)
+
+    assert result["report_markdown"].startswith("# Zone ")
+    assert "**SCORING BREAKDOWN**" in result["report_markdown"]
+    assert result["summary"]["brand"] == assessment["brand"]
+    assert result["metadata"]["model"] == "deterministic"
@@ -0,0 +1,125 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from utils.singleflight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers=5):
+    """Call flight.do from several threads at once, returning results or exceptions"""
+    barrier = threading.Barrier(callers)
+
+    def call():
+        barrier.wait()
+        try:
+            return flight.do(key, fn)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(callers) as pool:
+        return list(pool.map(lambda _: call(), range(callers)))
+
+
+def test_concurrent_calls_share_one_execution():
+    """Concurrent callers with one key should run fn once and get equal, independent copies"""
+    flight = SingleFlight()
+    runs = []
+
+    def work():
+        runs.append(1)
+        time.sleep(0.2)
+        return {"zone": "3"}
+
+    results = _run_concurrently(flight, "k", work)
+
+    assert len(runs) == 1
+    assert all(r == {"zone": "3"} for r in results)
+    assert len({id(r) for r in results}) == len(results)
+    assert flight.stats()["coalesced"] == len(results) - 1
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_errors_propagate_to_all_waiters_and_are_not_cached():
+    """Every concurrent caller should see the leader's exception; the next call retries"""
+    flight = SingleFlight()
+
+    def fail():
+        time.sleep(0.2)
+        raise RuntimeError("upstream down")
+
+    results = _run_concurrently(flight, "k", fail, callers=3)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.do("k", lambda: "ok") == "ok"
+    assert flight.stats()["executions"] == 2
+
+
+def test_waiter_timeout_does_not_affect_leader():
+    """A waiter giving up should not cancel or break the in-flight call"""
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.3)
+        return "done"
+
+    with ThreadPoolExecutor(1) as pool:
+        leader = pool.submit(flight.do, "k", slow)
+        started.wait()
+        with pytest.raises(TimeoutError):
+            flight.do("k", slow, timeout=0.05)
+        assert leader.result() == "done"
+
+
+def test_duplicate_zone_requests_are_coalesced(monkeypatch):
+    """Simultaneous identical POST /zone requests should make one model call and share the result"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    from app import app
+    client = TestClient(app)
+    headers = {"X-API-Key": "test-api-key-123"}
+    calls = []
+
+    def fake_report(assessment, votes=1):
+        calls.append(assessment)
+        time.sleep(0.3)
+        return {"report_markdown": "# Zone 1", "summary": {"brand": assessment["brand"], "zone": "1"}}
+
+    with patch("app.openai_service.generate_zone_report", side_effect=fake_report), \
+            patch("app.results_store.record", side_effect=lambda record: record["id"]):
+        with ThreadPoolExecutor(3) as pool:
+            responses = list(pool.map(
+                lambda _: client.post("/zone", json={"brand": "Dup"}, headers=headers), range(3)
+            ))
+        metrics = client.get("/metrics", headers=headers).json()
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert len(calls) == 1
+    assert len({r.json()["result_id"] for r in responses}) == 1
+    assert metrics["single_flight"]["coalesced"] >= 2
+
+
+def test_interactive_request_does_not_join_a_batch_call(monkeypatch):
+    """Coalescing should only join callers in the same scheduler lane"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    import app
+    lanes = []
+
+    def fake_report(assessment, votes=1):
+        from services.scheduler import _current
+        lanes.append(_current.get()[0])
+        time.sleep(0.3)
+        return {"report_markdown": "# Zone 1", "summary": {"brand": assessment["brand"], "zone": "1"}}
+
+    with patch("app.openai_service.generate_zone_report", side_effect=fake_report), \
+            patch("app.results_store.record", side_effect=lambda record: record["id"]):
+        with ThreadPoolExecutor(3) as pool:
+            results = list(pool.map(lambda lane: app._zone_and_store({"brand": "Dup"}, lane=lane),
+                                    ["batch", "batch", "interactive"]))
+
+    assert sorted(lanes) == ["batch", "interactive"]
+    assert results[0]["result_id"] == results[1]["result_id"] != results[2]["result_id"]
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from cli.__main__ import main
+from services.question_catalog import QUESTIONS, get_answer
+from services.scoring import score_assessment
+from services.synthetic import (GATES, SyntheticGenerator, SyntheticProfile, gate_cases,
+                                generate_assessments)
+
+
+def test_generator_is_seeded_per_item():
+    """Item i should not depend on count or start, and other seeds should differ"""
+    first = list(generate_assessments(20, seed=3))
+    assert list(generate_assessments(5, seed=3, start=15)) == first[15:]
+    assert SyntheticGenerator(3).assessment(7) == first[7]
+    assert list(generate_assessments(20, seed=4)) != first
+
+
+def test_generator_follows_catalog_and_profile():
+    """Answers should stay in their domains and follow the profile's rates and weights"""
+    profile = SyntheticProfile(true_rate=0.0, missing_rate=0.0, gate_rate=0.0,
+                               weights={"Z1Q1": {"<20": 1, "20-70": 0, "> 70": 0}})
+    for assessment in generate_assessments(50, profile=profile):
+        for question in QUESTIONS:
+            answer = get_answer(assessment, question)
+            assert answer in question.domain
+            if not question.is_bracket:
+                assert answer is False
+        assert assessment["zone1"]["pct_of_division_revenue"] == "<20"
+        assert not score_assessment(assessment)["gates"]
+
+    gated = sum(bool(score_assessment(a)["gates"])
+                for a in generate_assessments(400, profile=SyntheticProfile(gate_rate=0.5)))
+    assert 150 < gated < 250
+
+    for weights in ({"half": 1}, {"<20": -1}, {"<20": 0, "20-70": 0, "> 70": 0}):
+        with pytest.raises(ValueError):
+            SyntheticGenerator(profile=SyntheticProfile(weights={"Z1Q1": weights}))
+
+
+def test_gate_cases_force_their_zone(tmp_path):
+    """Every gate should have an edge case, and the CLI should write them as NDJSON"""
+    cases = dict(gate_cases(seed=1))
+    for gate in GATES:
+        score = score_assessment(cases[f"gate:{gate.code}"])
+        assert (score["gates"], score["zone"]) == ([gate.code], gate.gate)
+    both = next(a for case, a in cases.items() if "+" in case)
+    assert score_assessment(both)["zone"] == "5"
+    assert not score_assessment(cases["gates-unanswered"])["gates"]
+
+    output = tmp_path / "synthetic.ndjson"
+    assert main(["generate", "-n", "10", "--seed", "1", "--edge-cases", "-o", str(output)]) == 0
+    lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert len(lines) == len(cases) + 10
+    assert lines[len(cases):] == list(generate_assessments(10, seed=1))
@@ -0,0 +1,115 @@
+import json
+import time
+from unittest.mock import Mock, patch
+import pytest
+from fastapi.testclient import TestClient
+from utils.tracing import Tracer, parse_traceparent, span, traced, untraced
+
+
+def test_spans_are_noops_outside_a_trace():
+    """span() and @traced should do nothing when no trace is active"""
+    @traced()
+    def work():
+        return 42
+
+    with span("orphan") as current:
+        current.set_attribute("ignored", True)
+
+    assert work() == 42
+
+
+def test_trace_records_nested_spans_and_errors():
+    """Child spans should nest under the root and record failures"""
+    tracer = Tracer(slow_threshold_ms=0)
+
+    @traced("inner")
+    def inner():
+        raise ValueError("bad")
+
+    with tracer.start_trace("POST /zone", request_id="req-1"):
+        with span("outer", step=1):
+            with pytest.raises(ValueError):
+                inner()
+
+    trace = tracer.get("req-1")
+    spans = {s["name"]: s for s in trace["spans"]}
+    assert spans["outer"]["parentSpanId"] == spans["POST /zone"]["spanId"]
+    assert spans["inner"]["parentSpanId"] == spans["outer"]["spanId"]
+    assert spans["inner"]["status"]["code"] == "ERROR"
+    assert spans["outer"]["attributes"] == {"step": 1}
+    assert {s["traceId"] for s in trace["spans"]} == {trace["trace_id"]}
+
+
+def test_tracer_keeps_only_slow_traces_and_exports_them(tmp_path):
+    """Fast traces are dropped; slow ones are kept and exported as JSONL"""
+    export = tmp_path / "traces.jsonl"
+    tracer = Tracer(slow_threshold_ms=50, export_path=str(export))
+    parent = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+
+    with tracer.start_trace("fast", request_id="fast"):
+        pass
+    with tracer.start_trace("slow", request_id="slow", traceparent=parent):
+        time.sleep(0.06)
+
+    assert tracer.get("fast") is None
+    assert [t["request_id"] for t in tracer.recent()] == ["slow"]
+    assert tracer.get("slow")["trace_id"] == "a" * 32
+
+    for _ in range(50):
+        if export.exists() and export.read_text():
+            break
+        time.sleep(0.02)
+    exported = json.loads(export.read_text().splitlines()[0])
+    assert exported["spans"][0]["parentSpanId"] == "b" * 16
+
+
+def test_trace_caps_its_spans_and_untraced_blocks_add_none():
+    """Spans past max_spans should be dropped and counted on the root"""
+    tracer = Tracer(slow_threshold_ms=0, max_spans=3)
+
+    with tracer.start_trace("POST /zone/bulk", request_id="capped"):
+        for i in range(5):
+            with span("item", i=i):
+                with span("model"):
+                    pass
+        with untraced():
+            with span("hidden"):
+                pass
+
+    trace = tracer.get("capped")
+    assert [s["name"] for s in trace["spans"]] == ["POST /zone/bulk", "item", "model"]
+    assert trace["spans"][0]["attributes"]["dropped_spans"] == 8
+
+
+def test_parse_traceparent_rejects_invalid_headers():
+    """Only well-formed, non-zero traceparent headers should be accepted"""
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent("00-" + "0" * 32 + "-" + "b" * 16 + "-01") is None
+
+
+def test_zone_request_is_traced_end_to_end(monkeypatch):
+    """A /zone call should produce spans for auth, parsing, the model call and post-processing"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setenv("API_KEY", "test-api-key-123")
+    import app as app_module
+    monkeypatch.setattr(app_module.tracer, "slow_threshold_ms", 0)
+    client = TestClient(app_module.app)
+    headers = {"X-API-Key": "test-api-key-123", "X-Request-ID": "trace-me"}
+
+    mock_choice = Mock()
+    mock_choice.message.content = '# Zone 1\n\n```json\n{"brand": "T", "zone": "1", "subzone": ""}\n```'
+    mock_response = Mock(choices=[mock_choice], usage=None)
+
+    with patch.object(app_module.openai_service.client.chat.completions, "create", return_value=mock_response), \
+            patch("app.results_store.record", side_effect=lambda record: record["id"]):
+        assert client.post("/zone", json={"brand": "Traced"}, headers=headers).status_code == 200
+
+    trace = client.get("/debug/trace/trace-me", headers=headers).json()
+    names = {s["name"] for s in trace["spans"]}
+    assert {"POST /zone", "verify_api_key", "parse_body", "generate_zone_report", "serialize_assessment",
+            "openai.chat_completion", "_extract_summary", "_inject_zone_overview",
+            "_validate_zone_assignment"} <= names
+    assert client.get("/debug/trace/unknown", headers=headers).status_code == 404
+
+    invalid = client.post("/zone", content=b"not json", headers=headers)
+    assert invalid.status_code == 422
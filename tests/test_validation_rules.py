@@ -0,0 +1,57 @@
+import pytest
+from services.validation_rules import (
+    VALIDATION_RULES, ValidationRuleError, ValidationTable, compile_validation_table
+)
+
+
+def _table():
+    return compile_validation_table("# Rules v1")
+
+
+def test_gates_and_triggers_ignored_by_the_model_are_reported():
+    """A Zone 5 gate and Zone 4 triggers should be flagged when another zone is assigned"""
+    assessment = {
+        "zone5": {"active_restriction_preventing_hex": True},
+        "zone4": {"hex_link_creates_risk": True, "rebrand_invalidates_contracts": True},
+    }
+
+    validation = _table().validate(assessment, {"zone": "3", "subzone": "B"})
+
+    assert validation["status"] == "error"
+    assert [f["rule"] for f in validation["findings"]] == ["z5_gate_ignored", "z4_triggers_ignored"]
+    assert validation["findings"][1]["questions"] == ["Z4Q3", "Z4Q9"]
+    assert "Zone 3B assigned" in validation["findings"][1]["message"]
+    assert _table().validate(assessment, {"zone": "5"})["findings"][0]["rule"] == "z4_triggers_ignored"
+
+
+def test_subzone_and_revenue_checks():
+    """3A/3B indicator counts and the Zone 1 revenue share should be checked per assigned label"""
+    table = _table()
+    strong = {
+        "zone3": {"removal_causes_attrition": True, "transition_complexity_gt12mo": True,
+                  "z3_confidence_fallback": {"generates_demand_via_own_equity": True}},
+        "zone1": {"pct_of_division_revenue": "20-70"},
+    }
+
+    assert table.validate(strong, {"zone": "3", "subzone": "A"})["status"] == "ok"
+    finding = table.validate(strong, {"zone": "3", "subzone": "B"})["findings"][0]
+    assert finding["rule"] == "z3b_may_be_3a"
+    assert finding["questions"] == ["Z3Q3", "Z3Q8b", "Z3FQ30a", "Z1Q1"]
+    assert table.validate({}, {"zone": "3", "subzone": "A"})["findings"][0]["rule"] == "z3a_thin_evidence"
+    revenue = table.validate(strong, {"zone": "1"})["findings"]
+    assert [f["rule"] for f in revenue] == ["z1_revenue_share"]
+    assert "20-70" in revenue[0]["message"]
+
+
+def test_tables_are_compiled_once_and_labelled_per_rules_file():
+    """Every rules file should share one compiled rule set; the hash only labels results"""
+    first = compile_validation_table("# Rules v1")
+    edited = compile_validation_table("# Rules v2")
+
+    assert edited._rules is first._rules
+    assert edited.rules_hash != first.rules_hash
+    assert edited.validate({}, {"zone": "1"})["rules_hash"] == edited.rules_hash
+    assert len(first.paths) < sum(len(rule["signals"]) for rule in VALIDATION_RULES)
+
+    with pytest.raises(ValidationRuleError):
+        ValidationTable([{"id": "bad", "severity": "warning", "signals": ("Z9Q99",), "message": ""}])
@@ -0,0 +1,100 @@
+"""JSON encode/decode with an optional fast backend
+
+Uses orjson when installed, otherwise msgspec, otherwise the standard
+library, so the fast libraries stay optional dependencies. All backends
+produce compact UTF-8 JSON (no ASCII escaping). Values a fast backend
+cannot encode (e.g. integers beyond 64 bits) fall back to the standard
+library.
+"""
+import json
+from typing import Any, Tuple, Type
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:  # pragma: no cover - depends on the environment
+    BACKEND = "msgspec"
+else:  # pragma: no cover - depends on the environment
+    BACKEND = "json"
+
+# Exceptions raised by loads() for malformed input
+DECODE_ERRORS: Tuple[Type[BaseException], ...] = (ValueError, UnicodeDecodeError) + (
+    (msgspec.DecodeError,) if msgspec is not None else ()
+)
+
+
+def _stdlib_dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
+
+
+if orjson is not None:
+    def _fast_dumps(obj: Any, sort_keys: bool) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option)
+
+    _fast_loads = orjson.loads
+elif msgspec is not None:  # pragma: no cover - depends on the environment
+    _encoder = msgspec.json.Encoder()
+    _sorted_encoder = msgspec.json.Encoder(order="sorted")
+
+    def _fast_dumps(obj: Any, sort_keys: bool) -> bytes:
+        return (_sorted_encoder if sort_keys else _encoder).encode(obj)
+
+    _fast_loads = msgspec.json.decode
+else:  # pragma: no cover - depends on the environment
+    _fast_dumps = None
+    _fast_loads = json.loads
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Encode a value as compact UTF-8 JSON
+
+    Args:
+        obj: JSON-serializable value
+        sort_keys: Sort object keys (canonical output)
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if _fast_dumps is not None:
+        try:
+            return _fast_dumps(obj, sort_keys)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return _stdlib_dumps(obj, sort_keys)
+
+
+def dumps_canonical(obj: Any) -> str:
+    """Compact JSON text with sorted keys; equal values give equal text"""
+    return dumps(obj, sort_keys=True).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str
+
+    Raises:
+        One of DECODE_ERRORS if the input is not valid JSON
+    """
+    return _fast_loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fast codec
+
+    Returning an instance from an endpoint also skips FastAPI's
+    jsonable_encoder pass over the content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
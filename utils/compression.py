@@ -0,0 +1,224 @@
+"""Content-Encoding negotiation and response compression
+
+gzip is always available; zstd and brotli are used when the zstandard and
+brotli packages are installed, so both stay optional dependencies. The
+middleware is plain ASGI like the others in utils.middleware: complete
+responses are compressed in one go when they reach a size threshold, and
+streaming responses (NDJSON, paged lists) are compressed chunk by chunk with
+a flush after each chunk, so lines still reach the client as they are
+produced.
+"""
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+from utils.middleware import Message, Receive, Scope, Send
+
+# Levels tuned for dynamic responses: most of the size win for little CPU
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+
+class _GzipCompressor:
+    def __init__(self) -> None:
+        self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:  # pragma: no cover - depends on the environment
+    def __init__(self) -> None:
+        self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdCompressor:  # pragma: no cover - depends on the environment
+    def __init__(self) -> None:
+        self._obj = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+# Available encodings in server preference order
+COMPRESSORS: Dict[str, Callable[[], object]] = {}
+if zstandard is not None:  # pragma: no cover - depends on the environment
+    COMPRESSORS["zstd"] = _ZstdCompressor
+if brotli is not None:  # pragma: no cover - depends on the environment
+    COMPRESSORS["br"] = _BrotliCompressor
+COMPRESSORS["gzip"] = _GzipCompressor
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a complete body with one of COMPRESSORS"""
+    compressor = COMPRESSORS[encoding]()
+    return compressor.compress(data) + compressor.finish()
+
+
+def choose_encoding(accept_encoding: str, available: Optional[List[str]] = None) -> Optional[str]:
+    """Pick the preferred available encoding the client accepts
+
+    Args:
+        accept_encoding: Accept-Encoding request header value
+        available: Candidate encodings in preference order (default: COMPRESSORS)
+
+    Returns:
+        Encoding name, or None to send the body uncompressed
+    """
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+
+    for encoding in available if available is not None else list(COMPRESSORS):
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0:
+            return encoding
+    return None
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _weaken_etag(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Headers with a strong ETag made weak (W/"...")
+
+    RFC 9110 (8.8.1) requires a strong validator to change with the content
+    coding. A weak one may stay the same, and If-None-Match compares weakly.
+    """
+    return [(k, b"W/" + v if k.lower() == b"etag" and not v.startswith(b"W/") else v) for k, v in headers]
+
+
+def _vary_on_encoding(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Headers with Accept-Encoding added to Vary (once)"""
+    vary = _header(headers, b"vary")
+    if vary is not None and (b"accept-encoding" in vary.lower() or vary.strip() == b"*"):
+        return headers
+    headers = [(k, v) for k, v in headers if k.lower() != b"vary"]
+    headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+    return headers
+
+
+class CompressionMiddleware:
+    """Compress response bodies according to the request's Accept-Encoding
+
+    Complete responses smaller than minimum_size are sent as they are (the
+    framing overhead outweighs the saving). Responses that already carry a
+    Content-Encoding, and 204s, are left untouched; every other response
+    gets Vary: Accept-Encoding, so caches do not mix encodings.
+
+    When the request accepts an encoding, a strong ETag is made weak on
+    every such response, compressed or not. A 304 cannot tell whether the
+    full response would have been compressed, so this keeps the validator of
+    a 200 and of the 304 revalidating it the same. If-None-Match compares
+    weakly, so the W/ form still matches.
+    """
+
+    def __init__(self, app: Callable, minimum_size: int = 1024):
+        """
+        Args:
+            app: Downstream ASGI application
+            minimum_size: Smallest complete body, in bytes, that is compressed
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = _header(scope.get("headers", []), b"accept-encoding")
+        encoding = choose_encoding(accept.decode("latin-1")) if accept else None
+
+        start: Optional[Message] = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                if message["status"] == 204 or _header(headers, b"content-encoding") is not None:
+                    passthrough = True
+                    await send(message)
+                    return
+                headers = _vary_on_encoding(headers)
+                if encoding is not None:
+                    headers = _weaken_etag(headers)
+                if encoding is None or message["status"] == 304:
+                    passthrough = True
+                    await send({**message, "headers": headers})
+                    return
+                # Held back until the first body chunk shows whether to compress
+                start = {**message, "headers": headers}
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = [(k, v) for k, v in start["headers"] if k.lower() != b"content-length"]
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                headers.append((b"content-encoding", encoding.encode("ascii")))
+                compressor = COMPRESSORS[encoding]()
+                if not more_body:
+                    data = compressor.compress(body) + compressor.finish()
+                    headers.append((b"content-length", str(len(data)).encode("ascii")))
+                    await send({**start, "headers": headers})
+                    start = None
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                await send({**start, "headers": headers})
+                start = None
+
+            data = compressor.compress(body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,32 @@
+import hashlib
+import json
+from typing import Any
+
+
+def canonical_json(data: Any) -> str:
+    """Serialize data to canonical JSON (sorted keys, compact separators)
+
+    Args:
+        data: JSON-serializable value
+
+    Returns:
+        Canonical JSON string; equal inputs always produce equal output
+    """
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def sha256_hex(text: str) -> str:
+    """Return the hex SHA-256 digest of a UTF-8 string"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def assessment_hash(assessment: Any) -> str:
+    """Content hash of an assessment, independent of key order and whitespace
+
+    Args:
+        assessment: Brand architecture assessment data
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON form
+    """
+    return sha256_hex(canonical_json(assessment))
@@ -0,0 +1,33 @@
+"""HTTP validators for conditional GET (ETag / If-None-Match)"""
+from typing import Optional
+
+from utils.hashing import sha256_hex
+
+
+def strong_etag(*parts: str) -> str:
+    """Quoted strong ETag derived from the given identifying parts"""
+    return '"' + sha256_hex("\n".join(parts))[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so
+    W/"x" matches "x". "*" matches any current representation.
+
+    Args:
+        if_none_match: Request header value (None if absent)
+        etag: Current ETag of the resource, quoted
+    """
+    if not if_none_match:
+        return False
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
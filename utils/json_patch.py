@@ -0,0 +1,135 @@
+import copy
+from typing import Any, Dict, List, Tuple
+
+
+class JSONPatchError(ValueError):
+    """Raised when a JSON Patch is malformed or cannot be applied"""
+    pass
+
+
+def _parse_pointer(pointer: Any) -> List[str]:
+    """Split an RFC 6901 JSON Pointer into unescaped reference tokens"""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise JSONPatchError(f"Invalid JSON pointer: {pointer!r}")
+    if pointer == "":
+        return []
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _array_index(container: List[Any], token: str, allow_end: bool) -> int:
+    """Resolve an array reference token ("-" meaning past the end)"""
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JSONPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JSONPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve_parent(document: Any, tokens: List[str]) -> Tuple[Any, str]:
+    """Walk to the container holding the last token"""
+    if not tokens:
+        raise JSONPatchError("Operation cannot target the document root")
+    node = document
+    for token in tokens[:-1]:
+        if isinstance(node, dict) and token in node:
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_array_index(node, token, allow_end=False)]
+        else:
+            raise JSONPatchError(f"Path not found: /{'/'.join(tokens)}")
+    if not isinstance(node, (dict, list)):
+        raise JSONPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return node, tokens[-1]
+
+
+def _get(document: Any, tokens: List[str]) -> Any:
+    """Value at a path"""
+    if not tokens:
+        return document
+    parent, token = _resolve_parent(document, tokens)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JSONPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent[token]
+    return parent[_array_index(parent, token, allow_end=False)]
+
+
+def _add(document: Any, tokens: List[str], value: Any) -> None:
+    parent, token = _resolve_parent(document, tokens)
+    if isinstance(parent, dict):
+        parent[token] = value
+    else:
+        parent.insert(_array_index(parent, token, allow_end=True), value)
+
+
+def _remove(document: Any, tokens: List[str]) -> Any:
+    parent, token = _resolve_parent(document, tokens)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JSONPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent.pop(token)
+    return parent.pop(_array_index(parent, token, allow_end=False))
+
+
+def apply_patch(document: Dict[str, Any], operations: Any) -> Dict[str, Any]:
+    """Apply an RFC 6902 JSON Patch to a copy of a document
+
+    Supports add, remove, replace, move, copy and test. Operations apply in
+    order and the patch is atomic: on any error the input is left untouched.
+
+    Args:
+        document: JSON object to patch (not modified)
+        operations: List of patch operation objects
+
+    Returns:
+        The patched document
+
+    Raises:
+        JSONPatchError: If the patch is malformed, a path does not exist,
+            a test fails, or the result is not a JSON object
+    """
+    if not isinstance(operations, list):
+        raise JSONPatchError("Patch must be a JSON array of operations")
+
+    result = copy.deepcopy(document)
+    for number, operation in enumerate(operations):
+        if not isinstance(operation, dict) or "op" not in operation or "path" not in operation:
+            raise JSONPatchError(f"Operation {number} must be an object with 'op' and 'path'")
+        op = operation["op"]
+        tokens = _parse_pointer(operation["path"])
+
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JSONPatchError(f"Operation {number} ({op}) requires 'value'")
+        if op in ("move", "copy") and "from" not in operation:
+            raise JSONPatchError(f"Operation {number} ({op}) requires 'from'")
+
+        if op == "add":
+            _add(result, tokens, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(result, tokens)
+        elif op == "replace":
+            _get(result, tokens)
+            parent, token = _resolve_parent(result, tokens)
+            if isinstance(parent, dict):
+                parent[token] = copy.deepcopy(operation["value"])
+            else:
+                parent[_array_index(parent, token, allow_end=False)] = copy.deepcopy(operation["value"])
+        elif op == "move":
+            source = _parse_pointer(operation["from"])
+            if tokens[:len(source)] == source and tokens != source:
+                raise JSONPatchError(f"Operation {number} moves a value into itself")
+            _add(result, tokens, _remove(result, source))
+        elif op == "copy":
+            _add(result, tokens, copy.deepcopy(_get(result, _parse_pointer(operation["from"]))))
+        elif op == "test":
+            if _get(result, tokens) != operation["value"]:
+                raise JSONPatchError(f"Test failed at {operation['path']}")
+        else:
+            raise JSONPatchError(f"Unsupported operation: {op!r}")
+
+    if not isinstance(result, dict):
+        raise JSONPatchError("Patched document must be a JSON object")
+    return result
@@ -1,26 +1,155 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
 
+# Per-request logging context (request_id, brand, sampled), set by the
+# request middleware and read by ContextFilter on the logging thread's caller
+_request_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar("log_request_context", default=None)
 
-def setup_logging(level: str = "INFO") -> None:
+# Record attributes copied into JSON output when present (pass via extra=)
+STRUCTURED_FIELDS = (
+    "request_id", "client", "brand", "zone", "subzone", "confidence", "attempt",
+    "latency_ms", "prompt_tokens", "completion_tokens", "total_tokens", "status_code",
+)
+
+# Background listener draining the log queue (None until setup_logging)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def start_request_context(request_id: str, sample_rate: float = 1.0) -> Any:
+    """Begin a logging context for one request
+
+    Args:
+        request_id: Identifier attached to every record logged for the request
+        sample_rate: Probability that this request's INFO/DEBUG records are kept
+
+    Returns:
+        Token for end_request_context
+    """
+    sampled = sample_rate >= 1.0 or random.random() < sample_rate
+    return _request_context.set({"request_id": request_id, "sampled": sampled})
+
+
+def end_request_context(token: Any) -> None:
+    """Restore the logging context that was active before start_request_context"""
+    _request_context.reset(token)
+
+
+def bind_log_context(**fields: Any) -> None:
+    """Attach fields (e.g. brand) to every later record of the current request"""
+    context = _request_context.get()
+    if context is not None:
+        context.update(fields)
+
+
+def get_request_id() -> Optional[str]:
+    """Request id of the current logging context, if any"""
+    context = _request_context.get()
+    return context.get("request_id") if context else None
+
+
+class ContextFilter(logging.Filter):
+    """Copy request context onto records and drop INFO chatter of unsampled requests
+
+    Runs in the logging caller's thread, where the request context is visible.
+    WARNING and above are always kept.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _request_context.get()
+        if context is None:
+            return True
+        if record.levelno < logging.WARNING and not context["sampled"]:
+            return False
+        for key, value in context.items():
+            if key != "sampled" and not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records untouched
+
+    The stock prepare() merges the message with its args and renders the
+    traceback on the caller's thread (records may be pickled to another
+    process). The queue here stays in-process, so msg, args and exc_info
+    travel as they are and all formatting happens in the listener thread.
+    Request context fields are already on the record (ContextFilter).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(level: str = "INFO", fmt: str = "json") -> None:
     """Configure structured logging for the application
 
+    Records are put on an in-memory queue by the calling thread and
+    formatted and written to stdout by a background listener thread, so the
+    request path never formats messages or waits on I/O. Request-scoped
+    fields and INFO sampling come from start_request_context.
+
+    If the root logger already has handlers (pytest's log capture, or a host
+    application that configured logging first), they are kept and only
+    their level is set: no queue handler, context filter or listener is
+    installed.
+
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR)
+        fmt: Output format, "json" (one object per line) or "text"
     """
+    global _listener
     numeric_level = getattr(logging, level.upper(), logging.INFO)
 
     # Get root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
 
-    # Only add handler if none exist (preserves pytest's caplog handler)
+    # Logging configured elsewhere is left in place (see docstring)
     if not root_logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(numeric_level)
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        handler.setFormatter(formatter)
-        root_logger.addHandler(handler)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        if fmt == "text":
+            stream_handler.setFormatter(
+                logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+            )
+        else:
+            stream_handler.setFormatter(JSONFormatter())
+
+        queue_handler = _StructuredQueueHandler(queue.SimpleQueue())
+        queue_handler.setLevel(numeric_level)
+        queue_handler.addFilter(ContextFilter())
+        root_logger.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler)
+        _listener.start()
+        atexit.register(shutdown_logging)
     else:
         # Update existing handlers' level
         for handler in root_logger.handlers:
@@ -32,6 +161,14 @@ def setup_logging(level: str = "INFO") -> None:
     logging.getLogger("openai").setLevel(logging.INFO)
 
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a configured logger instance
 
@@ -0,0 +1,208 @@
+import uuid
+from typing import Any, Awaitable, Callable, Collection, Dict
+
+from starlette.exceptions import HTTPException
+
+from utils.logging_config import end_request_context, get_request_id, start_request_context
+from utils.profiler import ProfilerBusyError, RecentProfiles, SamplingProfiler
+from utils.tracing import Tracer
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+
+class RequestContextMiddleware:
+    """Give every HTTP request a request id and a logging context
+
+    Uses the caller's X-Request-ID header when present, otherwise generates
+    one, and echoes it on the response. Plain ASGI (rather than
+    BaseHTTPMiddleware) so streaming responses pass through untouched.
+    """
+
+    def __init__(self, app: Callable, sample_rate: float = 1.0):
+        """
+        Args:
+            app: Downstream ASGI application
+            sample_rate: Fraction of requests whose INFO/DEBUG records are logged
+        """
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = ""
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        token = start_request_context(request_id, self.sample_rate)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            end_request_context(token)
+
+
+class TracingMiddleware:
+    """Open a root tracing span for every HTTP request
+
+    Joins the caller's trace when a W3C traceparent header is present. Must
+    run inside RequestContextMiddleware so the trace is stored under the
+    request id.
+    """
+
+    def __init__(self, app: Callable, tracer: Tracer):
+        """
+        Args:
+            app: Downstream ASGI application
+            tracer: Tracer collecting finished traces
+        """
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope.get("headers", []):
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        name = f"{scope['method']} {scope['path']}"
+        with self.tracer.start_trace(name, request_id=get_request_id(), traceparent=traceparent,
+                                     **{"http.method": scope["method"], "http.target": scope["path"]}) as root:
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+
+
+class ProfilingMiddleware:
+    """Profile a single request end to end when it sends X-Profile: 1
+
+    Only honoured together with a valid X-API-Key, and only when no other
+    profile is running. The collapsed-stack output is stored under the
+    request id (returned in X-Profile-Id) once the response has been sent.
+    Samples cover every thread of the worker while the request runs.
+    """
+
+    def __init__(self, app: Callable, store: RecentProfiles, authorize: Callable[[str], bool],
+                 interval: float = 0.005):
+        """
+        Args:
+            app: Downstream ASGI application
+            store: Where finished profiles are kept
+            authorize: Returns True for an API key allowed to request profiling
+            interval: Seconds between samples
+        """
+        self.app = app
+        self.store = store
+        self.authorize = authorize
+        self.interval = interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        requested = headers.get(b"x-profile", b"").strip() in (b"1", b"true")
+        if not requested or not self.authorize(headers.get(b"x-api-key", b"").decode("latin-1")):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            profiler = SamplingProfiler(self.interval).start()
+        except ProfilerBusyError:
+            await self.app(scope, receive, _with_header(send, b"x-profile", b"busy"))
+            return
+
+        request_id = get_request_id() or uuid.uuid4().hex
+        try:
+            await self.app(scope, receive, _with_header(send, b"x-profile-id", request_id.encode("latin-1")))
+        finally:
+            self.store.add(request_id, profiler.stop())
+
+
+def _with_header(send: Send, name: bytes, value: bytes) -> Send:
+    """Wrap send so the response start message carries an extra header"""
+    async def wrapped(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            message["headers"] = list(message.get("headers", [])) + [(name, value)]
+        await send(message)
+    return wrapped
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies larger than max_bytes with 413
+
+    A declared Content-Length over the limit is refused before the app runs.
+    Chunked bodies are counted as they are read, and the read fails with a
+    413 HTTPException once the limit is crossed, so an oversized body is
+    never buffered in full. Streaming endpoints that apply their own
+    per-item limit (exempt_paths) are passed through.
+    """
+
+    def __init__(self, app: Callable, max_bytes: int, exempt_paths: Collection[str] = ()):
+        """
+        Args:
+            app: Downstream ASGI application
+            max_bytes: Largest accepted request body
+            exempt_paths: Paths whose bodies are not limited
+        """
+        self.app = app
+        self.max_bytes = max_bytes
+        self.exempt_paths = frozenset(exempt_paths)
+        self.detail = f"Request body exceeds {max_bytes} bytes"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_bytes:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=self.detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send: Send) -> None:
+        body = ('{"detail":"%s"}' % self.detail).encode("utf-8")
+        await send({"type": "http.response.start", "status": 413, "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            (b"connection", b"close"),
+        ]})
+        await send({"type": "http.response.body", "body": body})
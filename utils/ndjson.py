@@ -0,0 +1,122 @@
+from typing import Any, AsyncIterator, BinaryIO, Iterator, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from utils import codec
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class NDJSONLineError(ValueError):
+    """Raised for an NDJSON line that is not a JSON object"""
+    pass
+
+
+def dumps_line(record: Any) -> bytes:
+    """Encode one record as a newline-terminated NDJSON line"""
+    return codec.dumps(record) + b"\n"
+
+
+def parse_line(line: bytes) -> Any:
+    """Decode one NDJSON line into a JSON object
+
+    Raises:
+        NDJSONLineError: If the line is oversized, not valid JSON or not an object
+    """
+    if not line:
+        raise NDJSONLineError("Line exceeds maximum size")
+    try:
+        value = codec.loads(line)
+    except codec.DECODE_ERRORS as e:
+        raise NDJSONLineError(f"Invalid JSON: {e}") from e
+    if not isinstance(value, dict):
+        raise NDJSONLineError("Each line must be a JSON object")
+    return value
+
+
+def iter_lines(stream: BinaryIO, max_line_bytes: int) -> Iterator[Tuple[int, bytes]]:
+    """Yield (index, line) for each non-blank line of a binary file
+
+    Lines are read one at a time, so memory use is bounded by max_line_bytes
+    regardless of file size. Lines longer than max_line_bytes are skipped and
+    yielded as b"" placeholders so their index is kept.
+    """
+    index = 0
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        if len(line) > max_line_bytes and not line.endswith(b"\n"):
+            # Discard the rest of an oversized line
+            while True:
+                rest = stream.readline(max_line_bytes)
+                if not rest or rest.endswith(b"\n"):
+                    break
+            yield index, b""
+            index += 1
+            continue
+        line = line.strip()
+        if line:
+            yield index, line
+            index += 1
+
+
+async def aiter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, bytes]]:
+    """Async counterpart of iter_lines over a stream of byte chunks
+
+    Only the current partial line is buffered. Lines longer than
+    max_line_bytes are yielded as b"" placeholders so their index is kept.
+    """
+    index = 0
+    buffer = bytearray()
+    overflow = False
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            end = len(chunk) if newline == -1 else newline
+            if not overflow:
+                buffer += chunk[start:end]
+                if len(buffer) > max_line_bytes:
+                    overflow = True
+                    buffer.clear()
+            if newline == -1:
+                break
+            start = newline + 1
+
+            line = bytes(buffer).strip()
+            if overflow or line:
+                yield index, b"" if overflow else line
+                index += 1
+            buffer.clear()
+            overflow = False
+
+    line = bytes(buffer).strip()
+    if overflow or line:
+        yield index, b"" if overflow else line
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streaming NDJSON response that leaves the request body unread
+
+    Starlette's StreamingResponse consumes receive() to watch for client
+    disconnects, which would swallow request body chunks that the response
+    generator is still reading. This variant only sends; a disconnect surfaces
+    as a send error that ends the stream.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            pass
+        finally:
+            close = getattr(self.body_iterator, "aclose", None)
+            if close is not None:
+                await close()
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,133 @@
+"""Low-overhead wall-clock sampling profiler
+
+A background thread snapshots every thread's stack with
+sys._current_frames() at a fixed interval and counts identical stacks. The
+output is the "collapsed stack" text format (one "frame;frame;frame count"
+line per stack) read by flamegraph.pl, speedscope and inferno.
+
+Sampling only reads frames, so the profiled code runs unmodified; cost is
+proportional to the number of threads times the sampling rate.
+"""
+import collections
+import os
+import sys
+import threading
+import time
+from typing import Counter, Deque, Dict, Optional, Tuple
+
+# Leaf frames of threads parked waiting for work (idle pool workers, the
+# event loop's selector); skipped so profiles show only busy time
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+# Only one profiler samples the process at a time
+_active_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when another profile is already running"""
+    pass
+
+
+class SamplingProfiler:
+    """Sample all thread stacks until stopped"""
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        """
+        Args:
+            interval: Seconds between samples
+            include_idle: Keep stacks of threads waiting for work
+        """
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples = 0
+        self._stacks: Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> "SamplingProfiler":
+        """Begin sampling in a background thread
+
+        Raises:
+            ProfilerBusyError: If another profiler is running
+        """
+        if not _active_lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running on this worker")
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed-stack output"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.duration = time.perf_counter() - self._started
+            _active_lock.release()
+        return self.collapsed()
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names: Dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = self._collapse(frame)
+                if stack is not None:
+                    self._stacks[f"{names.get(thread_id, thread_id)};{stack}"] += 1
+            self.samples += 1
+
+    def _collapse(self, frame) -> Optional[str]:
+        """Render one thread's stack root-first, or None if the thread is idle"""
+        parts = []
+        leaf: Optional[Tuple[str, str]] = None
+        while frame is not None:
+            code = frame.f_code
+            filename = os.path.basename(code.co_filename)
+            if leaf is None:
+                leaf = (filename, code.co_name)
+            parts.append(f"{code.co_name} ({filename})")
+            frame = frame.f_back
+        if not self.include_idle and leaf in _IDLE_LEAVES:
+            return None
+        return ";".join(reversed(parts))
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, most frequent first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+
+class RecentProfiles:
+    """Bounded store of per-request profiles keyed by request id"""
+
+    def __init__(self, capacity: int = 20):
+        self._profiles: Deque[Tuple[str, str]] = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def add(self, request_id: str, collapsed: str) -> None:
+        with self._lock:
+            self._profiles.append((request_id, collapsed))
+
+    def get(self, request_id: str) -> Optional[str]:
+        with self._lock:
+            for stored_id, collapsed in reversed(self._profiles):
+                if stored_id == request_id:
+                    return collapsed
+        return None
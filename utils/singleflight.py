@@ -0,0 +1,96 @@
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """One in-flight execution shared by all callers of a key"""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for it and receive a deep copy of its
+    result, or the same exception. Nothing is cached: once the call finishes
+    the next caller for that key starts a new execution.
+
+    Thread-based, so it works from sync endpoints and from async code via
+    run_in_threadpool. A caller that stops waiting (e.g. a cancelled
+    request) does not affect the leader or the other waiters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Identity of the work (e.g. an assessment hash)
+            fn: Zero-argument callable doing the work
+            timeout: Maximum seconds a waiting caller blocks (None = no limit)
+
+        Returns:
+            fn's result (a private deep copy whenever the call was shared)
+
+        Raises:
+            Whatever fn raised, in the leader and in every waiting caller;
+            TimeoutError if a waiting caller's timeout expires first
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f"Timed out waiting for in-flight call {key!r}")
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            # Includes cancellation-style exceptions, so waiters never hang
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                shared = call.waiters > 0
+            call.done.set()
+        # Waiters copy the shared result, so the leader must not hand out the original
+        return copy.deepcopy(call.result) if shared else call.result
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the metrics endpoint"""
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+                "waiting": sum(call.waiters for call in self._calls.values()),
+            }
@@ -0,0 +1,278 @@
+"""Lightweight request-scoped tracing
+
+Spans use W3C trace context identifiers (32-hex trace id, 16-hex span id)
+and OpenTelemetry's field names when exported, so traces can be loaded into
+OTel tooling, but nothing here needs a collector or the OTel SDK. Finished
+traces slower than a threshold are kept in memory for /debug/trace and can
+also be appended to a local JSONL file.
+
+Instrument code with the span() context manager or the @traced decorator;
+both are no-ops outside a traced request, or inside an untraced() block.
+A trace holds at most max_spans spans; later ones are dropped and counted
+in the root span's "dropped_spans" attribute.
+"""
+import collections
+import functools
+import json
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+class _SpanList(list):
+    """Spans of one trace, with its span cap and count of dropped spans"""
+
+    __slots__ = ("limit", "dropped")
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+        self.dropped = 0
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns",
+                 "attributes", "status", "_spans")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str,
+                 attributes: Dict[str, Any], spans: _SpanList):
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "OK"
+        self._spans = spans
+        spans.append(self)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span"""
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Span in OpenTelemetry (OTLP JSON) field names"""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "durationMs": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": {"code": self.status},
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded when no trace is active"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Time a block as a child of the current span
+
+    Args:
+        name: Span name
+        **attributes: Initial span attributes
+
+    Yields:
+        The Span (or a no-op stand-in outside a traced request)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield _NOOP
+        return
+    if len(parent._spans) >= parent._spans.limit:
+        # Over the cap: children of this block attach to (and are dropped under) the parent
+        parent._spans.dropped += 1
+        yield _NOOP
+        return
+    child = Span(parent.trace_id, parent.span_id, name, attributes, parent._spans)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.status = "ERROR"
+        child.attributes["exception"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        child.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+
+@contextmanager
+def untraced() -> Iterator[None]:
+    """Run a block (and the threads it hands work to) outside the current trace"""
+    token = _current_span.set(None)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator running a function inside a span named after it"""
+    def decorator(fn: F) -> F:
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return fn(*args, **kwargs)
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Dict[str, str]]:
+    """Parse a W3C traceparent header into trace_id/parent_id"""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if not match or match.group(1) == "0" * 32:
+        return None
+    return {"trace_id": match.group(1), "parent_id": match.group(2)}
+
+
+class Tracer:
+    """Collects finished traces, keeping slow ones in memory and exporting them
+
+    Exports are written by a background thread so finishing a trace never
+    blocks on disk.
+    """
+
+    def __init__(self, slow_threshold_ms: float = 1000.0, capacity: int = 100,
+                 export_path: Optional[str] = None, max_spans: int = 500):
+        """
+        Args:
+            slow_threshold_ms: Traces at least this long are kept (0 keeps all)
+            capacity: Maximum traces kept in memory (oldest evicted first)
+            export_path: JSONL file slow traces are appended to (None disables)
+            max_spans: Maximum spans per trace, root included (later spans are dropped)
+        """
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_spans = max_spans
+        self.export_path = export_path
+        self._traces: Deque[Dict[str, Any]] = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._export_queue: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        self._exporter: Optional[threading.Thread] = None
+
+    @contextmanager
+    def start_trace(self, name: str, request_id: Optional[str] = None,
+                    traceparent: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+        """Open the root span of a request
+
+        Args:
+            name: Root span name (e.g. "POST /zone")
+            request_id: Request id the trace is stored under
+            traceparent: Incoming W3C traceparent header, to join the caller's trace
+            **attributes: Root span attributes
+        """
+        parent = parse_traceparent(traceparent)
+        trace_id = parent["trace_id"] if parent else _new_id(16)
+        spans = _SpanList(self.max_spans)
+        root = Span(trace_id, parent["parent_id"] if parent else None, name, attributes, spans)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.status = "ERROR"
+            root.attributes["exception"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            root.end_ns = time.time_ns()
+            if spans.dropped:
+                root.attributes["dropped_spans"] = spans.dropped
+            _current_span.reset(token)
+            self._finish(request_id or trace_id, root, spans)
+
+    def _finish(self, request_id: str, root: Span, spans: _SpanList) -> None:
+        if root.duration_ms < self.slow_threshold_ms:
+            return
+        trace = {
+            "request_id": request_id,
+            "trace_id": root.trace_id,
+            "name": root.name,
+            "duration_ms": round(root.duration_ms, 3),
+            "spans": spans,
+        }
+        with self._lock:
+            self._traces.append(trace)
+        if self.export_path:
+            self._ensure_exporter()
+            self._export_queue.put(trace)
+
+    def _ensure_exporter(self) -> None:
+        if self._exporter is not None:
+            return
+        with self._lock:
+            if self._exporter is None:
+                self._exporter = threading.Thread(target=self._run_exporter, name="trace-exporter",
+                                                  daemon=True)
+                self._exporter.start()
+
+    def _run_exporter(self) -> None:
+        while True:
+            trace = self._export_queue.get()
+            try:
+                with open(self.export_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(self._render(trace), default=str) + "\n")
+            except OSError as e:
+                logger.warning("Failed to export trace %s: %s", trace["trace_id"], e)
+
+    @staticmethod
+    def _render(trace: Dict[str, Any]) -> Dict[str, Any]:
+        spans = sorted(trace["spans"], key=lambda s: s.start_ns)
+        return {**trace, "spans": [s.to_dict() for s in spans]}
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Summaries of kept traces, newest first"""
+        with self._lock:
+            traces = list(self._traces)
+        return [
+            {key: trace[key] for key in ("request_id", "trace_id", "name", "duration_ms")}
+            for trace in reversed(traces)
+        ]
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Full trace for a request id (or trace id), or None if not kept"""
+        with self._lock:
+            traces = list(self._traces)
+        for trace in reversed(traces):
+            if request_id in (trace["request_id"], trace["trace_id"]):
+                return self._render(trace)
+        return None